@@ -0,0 +1,218 @@
+# run_benchmarks.py
+# =================
+# - 엔진 성능 회귀 추적용 벤치마크 모음. 케이스마다 새 프로세스(spawn)에서 build → sim.run 을 실행해 측정
+#   * events_per_s    : 처리한 Sim 이벤트 / sim.run 벽시계 초
+#   * wall_per_sim_s  : sim 1초당 벽시계 초
+#   * peak_rss_mb     : 케이스 프로세스의 최대 RSS(프로세스 분리 → 케이스 간 고수위 오염 없음)
+#   * build_s, events(결정적; 값이 바뀌면 동작 변화로 표시)
+# - 케이스: shared_bus N=5/20/50/100/200(DC 루프), 비콘 on/off, DC 루프 on/off(SLAC 만), post-SLAC 트래픽 pps 단계,
+#           point-to-point. N 이 클수록 sim 시간을 줄여 케이스당 수 초(--scale 로 일괄 조정)
+# - 산출물 없이(artifacts=False 와 동일하게 트레이스 OFF; --trace 로 변경) 측정, 반복 중 sim.run 최단 시간 채택
+#
+# 사용
+#   python benchmarks/run_benchmarks.py run [--cases bus_N20 p2p ...] [--repeat 3] [--scale 1.0] [--out results.json]
+#   python benchmarks/run_benchmarks.py compare benchmarks/baseline.json results.json [--threshold 0.10] [--mem-threshold 0.20]
+#     → 케이스별 비교표, 회귀(속도 저하/메모리 증가가 임계 초과) 또는 events 수 변화가 있으면 종료 코드 1
+#       (의도한 동작 변화면 --allow-event-change 로 통과시키고 기준선을 다시 만든다)
+# - 기준선: benchmarks/baseline.json (저장소에 커밋된 참조 결과; meta 에 커밋/머신 기록)
+#   python benchmarks/run_benchmarks.py list
+
+import os, sys, json, time, argparse, platform, subprocess
+import multiprocessing as mp
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(ROOT)
+
+DEFAULT_CFG = os.path.join(ROOT, "config", "defaults.json")
+
+def _bus(n, sim_s, beacon=True, dc=True, pps=None):
+    return dict(topology="shared_bus", nodes=n, sim_time_s=sim_s, beacon=beacon, dc=dc, pps=pps)
+
+# 케이스 이름 → 설정 조각(sim_s 는 --scale 배)
+CASES = {
+    "bus_N5":           _bus(5, 10.0),
+    "bus_N20":          _bus(20, 5.0),
+    "bus_N50":          _bus(50, 2.0),
+    "bus_N100":         _bus(100, 1.0),
+    "bus_N200":         _bus(200, 0.5),
+    "bus_N20_nobeacon": _bus(20, 5.0, beacon=False),
+    "bus_N20_nodc":     _bus(20, 5.0, dc=False),           # SLAC 시나리오만
+    # post-SLAC 트래픽은 SLAC 성공 후에만 시작 → SLAC 가 성립하는 point-to-point 에서 pps 단계
+    "p2p":              dict(topology="cp_point_to_point", nodes=2, sim_time_s=10.0, beacon=True, dc=True, pps=None),
+    "p2p_pps10":        dict(topology="cp_point_to_point", nodes=2, sim_time_s=10.0, beacon=True, dc=True, pps=10),
+    "p2p_pps100":       dict(topology="cp_point_to_point", nodes=2, sim_time_s=10.0, beacon=True, dc=True, pps=100),
+    "p2p_pps500":       dict(topology="cp_point_to_point", nodes=2, sim_time_s=10.0, beacon=True, dc=True, pps=500),
+}
+
+# 비교 지표: (키, 클수록 좋은가)
+SPEED_KEYS = (("events_per_s", True), ("wall_per_sim_s", False))
+MEM_KEYS = (("peak_rss_mb", False),)
+
+def case_config(base, spec, scale=1.0, trace="OFF"):
+    cfg = json.loads(json.dumps(base))
+    cfg["topology"] = spec["topology"]
+    cfg["nodes"] = spec["nodes"]
+    cfg["sim_time_s"] = spec["sim_time_s"] * scale
+    cfg["trace"] = dict(level=trace)
+    cfg.setdefault("mac", {}).setdefault("timing", {})["beacon_enable"] = bool(spec["beacon"])
+    tr = cfg.setdefault("traffic", {})
+    dc = tr.setdefault("dc_loop", {})
+    dc["enabled"] = bool(spec["dc"])
+    # 공유 버스는 SLAC 가 거의 성립하지 않으므로 DC 케이스는 SLAC 생략(정상 상태 DC 루프 부하 측정)
+    dc["start_without_slac"] = bool(spec["dc"]) and spec["topology"] == "shared_bus"
+    if spec.get("pps"):
+        tr["post_slac"] = dict(rate_mean_pps=spec["pps"], bytes_min=300, bytes_max=1500)
+    else:
+        tr.pop("post_slac", None)
+    return cfg
+
+def _measure(cfg, seed, conn):
+    """자식 프로세스: build → sim.run 측정 결과를 파이프로 전달."""
+    try:
+        import tempfile
+        from hpgp_sim.sim import build
+        from hpgp_sim.memguard import peak_rss_mb
+        with tempfile.TemporaryDirectory() as out:
+            t0 = time.perf_counter()
+            w = build(cfg, out_dir=out, seed=seed)
+            t1 = time.perf_counter()
+            w["sim"].run(until=w["sim_time_us"])
+            t2 = time.perf_counter()
+            s = w["metrics"].summary(w["sim_time_us"])
+            conn.send(dict(build_s=t1 - t0, run_s=t2 - t1, events=w["sim"].events, peak_rss_mb=peak_rss_mb(),
+                           tx_ok=w["metrics"].tx_ok, dc_req=s["dc_req"]))
+    except Exception as e:
+        conn.send(dict(error=f"{type(e).__name__}: {e}"))
+    finally:
+        conn.close()
+
+def run_case(cfg, seed=1):
+    ctx = mp.get_context("spawn")
+    rx, tx = ctx.Pipe(duplex=False)
+    p = ctx.Process(target=_measure, args=(cfg, seed, tx))
+    p.start()
+    tx.close()
+    r = rx.recv()
+    p.join()
+    if "error" in r:
+        raise RuntimeError(r["error"])
+    return r
+
+def run_suite(names, repeat=3, scale=1.0, trace="OFF", seed=1, config=DEFAULT_CFG):
+    from hpgp_sim.sim import load_config
+    base = load_config(config)
+    out = {}
+    for name in names:
+        spec = CASES[name]
+        cfg = case_config(base, spec, scale, trace)
+        runs = [run_case(cfg, seed) for _ in range(max(1, repeat))]
+        best = min(runs, key=lambda r: r["run_s"])
+        sim_s = cfg["sim_time_s"]
+        walls = sorted(r["run_s"] for r in runs)
+        out[name] = dict(topology=spec["topology"], nodes=spec["nodes"], beacon=spec["beacon"], dc=spec["dc"],
+                         pps=spec["pps"] or 0, sim_time_s=sim_s, events=best["events"],
+                         build_s=round(best["build_s"], 4), wall_s=round(best["run_s"], 4),
+                         wall_median_s=round(walls[len(walls) // 2], 4),
+                         events_per_s=round(best["events"] / max(1e-9, best["run_s"])),
+                         wall_per_sim_s=round(best["run_s"] / max(1e-9, sim_s), 5),
+                         peak_rss_mb=round(max(r["peak_rss_mb"] for r in runs), 1),
+                         tx_ok=best["tx_ok"], dc_req=best["dc_req"])
+        r = out[name]
+        print(f"{name:18s} events={r['events']:9d}  ev/s={r['events_per_s']:9d}  wall/sim_s={r['wall_per_sim_s']:8.4f}"
+              f"  peak_rss={r['peak_rss_mb']:7.1f}MB", flush=True)
+    return out
+
+def _meta(repeat, scale, trace, seed):
+    try:
+        rev = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                             text=True, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        rev = None
+    return dict(created=time.strftime("%Y-%m-%dT%H:%M:%S"), git=rev, python=platform.python_version(),
+                machine=platform.machine(), system=platform.system(), cpus=os.cpu_count(),
+                repeat=repeat, scale=scale, trace=trace, seed=seed)
+
+def compare(base, cur, threshold=0.10, mem_threshold=0.20):
+    """
+    케이스별 (base → cur) 비교. 반환: (표 행 리스트, 회귀 수, events 변화 수)
+    - 속도: events_per_s 감소 또는 wall_per_sim_s 증가가 threshold 초과 → REGRESSION
+    - 메모리: peak_rss_mb 증가가 mem_threshold 초과 → REGRESSION
+    - events 수가 다르면 CHANGED(결정적 값이라 엔진 동작 변화; 속도 비교는 참고용)
+    """
+    rows, n_reg, n_changed = [], 0, 0
+    bc, cc = base.get("cases", {}), cur.get("cases", {})
+    for name in [k for k in bc if k in cc]:
+        b, c = bc[name], cc[name]
+        flags = []
+        for keys, thr in ((SPEED_KEYS, threshold), (MEM_KEYS, mem_threshold)):
+            for key, higher_better in keys:
+                if not b.get(key) or c.get(key) is None:
+                    continue
+                rel = (c[key] - b[key]) / b[key]
+                worse = -rel if higher_better else rel
+                rows.append(dict(case=name, metric=key, base=b[key], cur=c[key], change=rel,
+                                 status="REGRESSION" if worse > thr else ("improved" if worse < -thr else "ok")))
+                if worse > thr:
+                    flags.append(key)
+        if b.get("events") != c.get("events"):
+            rows.append(dict(case=name, metric="events", base=b.get("events"), cur=c.get("events"),
+                             change=None, status="CHANGED"))
+            n_changed += 1
+        n_reg += bool(flags)
+    for name in bc:
+        if name not in cc:
+            rows.append(dict(case=name, metric="-", base=None, cur=None, change=None, status="missing"))
+    return rows, n_reg, n_changed
+
+def _parse_args():
+    p = argparse.ArgumentParser(description="HPGP simulator engine benchmarks")
+    sub = p.add_subparsers(dest="cmd", required=True)
+    r = sub.add_parser("run", help="run benchmark cases and write JSON results")
+    r.add_argument("--cases", nargs="*", default=None, help=f"subset of: {' '.join(CASES)}")
+    r.add_argument("--repeat", type=int, default=3, help="runs per case (fastest sim.run kept)")
+    r.add_argument("--scale", type=float, default=1.0, help="multiply every case's sim_time_s")
+    r.add_argument("--trace", default="OFF", choices=("OFF", "SUMMARY", "EVENTS", "FULL"))
+    r.add_argument("--seed", type=int, default=1)
+    r.add_argument("--config", default=DEFAULT_CFG)
+    r.add_argument("--out", default=os.path.join(ROOT, "benchmarks", "results.json"))
+    c = sub.add_parser("compare", help="compare results against a stored baseline")
+    c.add_argument("baseline")
+    c.add_argument("results")
+    c.add_argument("--threshold", type=float, default=0.10, help="relative speed regression threshold")
+    c.add_argument("--mem-threshold", type=float, default=0.20, help="relative peak RSS regression threshold")
+    c.add_argument("--allow-event-change", action="store_true",
+                   help="do not fail on changed event counts (intended behaviour change; regenerate the baseline)")
+    sub.add_parser("list", help="list benchmark cases")
+    return p.parse_args()
+
+if __name__ == "__main__":
+    args = _parse_args()
+    if args.cmd == "list":
+        for name, spec in CASES.items():
+            print(f"{name:18s} {spec}")
+    elif args.cmd == "run":
+        names = args.cases or list(CASES)
+        bad = [n for n in names if n not in CASES]
+        if bad:
+            sys.exit(f"unknown case(s): {bad}")
+        cases = run_suite(names, args.repeat, args.scale, args.trace, args.seed, args.config)
+        os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+        with open(args.out, "w") as f:
+            json.dump(dict(meta=_meta(args.repeat, args.scale, args.trace, args.seed), cases=cases), f, indent=2)
+        print("Wrote:", args.out)
+    else:
+        with open(args.baseline) as f:
+            base = json.load(f)
+        with open(args.results) as f:
+            cur = json.load(f)
+        for key in ("scale", "trace", "seed"):
+            if base.get("meta", {}).get(key) != cur.get("meta", {}).get(key):
+                print(f"warning: meta.{key} differs (baseline={base['meta'].get(key)} results={cur['meta'].get(key)})")
+        rows, n_reg, n_changed = compare(base, cur, args.threshold, args.mem_threshold)
+        for r in rows:
+            ch = "" if r["change"] is None else f"{r['change'] * 100:+7.1f}%"
+            print(f"{r['case']:18s} {r['metric']:15s} {str(r['base']):>12s} -> {str(r['cur']):>12s} {ch:>9s}  {r['status']}")
+        print(f"{n_reg} case(s) regressed" if n_reg else "no regressions")
+        if n_changed:
+            print(f"{n_changed} case(s) changed event count (engine behaviour differs from the baseline)"
+                  + ("; allowed" if args.allow_event_change else ""))
+        sys.exit(1 if n_reg or (n_changed and not args.allow_event_change) else 0)
@@ -5,4 +5,4 @@ __init__.py
 - hpgp_sim 패키지의 공개 모듈을 정의한다.
 - 외부에서 from hpgp_sim import ... 형태로 임포트할 때 노출할 서브모듈 목록을 제공한다.
 """
-__all__ = ["sim","medium","channel","mac_hpgp","app_15118","metrics","utils"]
+__all__ = ["sim","medium","channel","mac_hpgp","app_15118","metrics","utils","parallel","optimizer","snapshot","vector_mac","warmup","batch_means","depot","rare","analytic","control_variate","surrogate","cosim","histogram","exporter","telemetry","memguard","fingerprint","flame","costmodel"]
@@ -0,0 +1,260 @@
+"""
+analytic.py
+===========
+역할
+- HomePlug 1.0/GP 백오프의 3차원 이산시간 마르코프 체인(BPC, DC, BC) 해석 모델 (Jung et al. 2005).
+  StudyForPrevPapers/MAC_Throughput_Analysis_of_HomePlug_1.0/calculate3dMarkovChainModelAboutHPGP.py 를 패키지로 이동.
+- 시뮬레이터와 같은 설정(mac.cw_table[CAP], mac.dc_init_per_bpc, max_bpc)을 읽어 체인을 구성한다
+  (mac_hpgp.cw_value / dc_init_value / bpc_limit 공유 → CW=8 이면 BC ∈ 0..7).
+- N 벡터에 대해 tau, p, pb, eta 를 한 번에 계산하고, (체인 파라미터, N) 단위로 결과를 캐시한다.
+
+구성
+- chain_params(mac_cfg, cap): 체인 파라미터 dict(W=[CW_i], M=[DC_i], bpc_max)
+- states(params): 상태 목록과 인덱스
+- build_transition_matrix(params, tau, p, pb): 전이행렬(CSR, 파라미터당 캐시된 COO 구조에 값만 벡터로 채움)
+- stationary(P): 정상분포 π (π = πP, Σπ = 1) — 직접 희소 해(spsolve)
+- stationary_closed(params, p, pb): 같은 π 의 단계별 닫힌 형태(이항분포 누적합; 행렬 불필요, CW=1024 도 ms 단위)
+- solve_tau(params, n, ...): 고정점 tau 해(할선법 가속 + 이분 보호) → dict(tau, p, pb, iters, pi, tau_history, p_history)
+- efficiency(tau, n, mac_cfg, frame_bits): 포화 효율(eta) 및 P_tr, P_s
+- analyze(cfg, Ns, cap, frame_bits, cache_path): N 벡터 → 컬럼형 dict(N, tau, p, pb, p_tr, p_s, eta, iters)
+  cache_path(JSON)를 주면 캐시를 파일로도 유지(스크립트 재실행 시 즉시 반환)
+
+확률 관계(원 스크립트와 동일)
+- p  = 1 - (1 - tau)^(n-1)  (충돌)
+- pb = 1 - (1 - tau)^n      (busy)
+- tau = Σ_{i,j} π(i, j, 0)
+
+효율(시뮬레이터 Metrics.efficiency_eta 와 같은 정의: 제어(PRS) 시간 제외 구간 대비 성공 airtime)
+- P_tr = 1 - (1-tau)^n,  P_s = n·tau·(1-tau)^(n-1) / P_tr
+- eta  = P_tr·P_s·T_air / ((1-P_tr)·sigma + P_tr·T_air)
+"""
+
+import json, math
+import numpy as np
+from scipy.sparse import coo_matrix, csr_matrix, identity, vstack
+from scipy.sparse.linalg import spsolve
+from scipy.stats import binom
+
+from .mac_hpgp import cw_value, dc_init_value, bpc_limit
+
+DEFAULT_FRAME_BITS = 300 * 8          # DC Req(300B), vector_mac.REQ_BITS 와 동일
+
+_CACHE = {}                            # (_cache_key, n) → solve_tau 결과(π 제외)
+
+def chain_params(mac_cfg, cap="CAP0"):
+    lim = bpc_limit(mac_cfg)
+    return dict(W=[cw_value(mac_cfg, cap, i) for i in range(lim + 1)],
+                M=[dc_init_value(mac_cfg, i) for i in range(lim + 1)],
+                bpc_max=lim)
+
+def _key(params):
+    return json.dumps([params["W"], params["M"], params["bpc_max"]])
+
+def _cache_key(params, method="closed", tol=1e-6, accel="secant", max_iter=50):
+    """체인 파라미터 + 해에 영향을 주는 풀이 설정(method/tol/accel/max_iter). tau0 는 warm start 라 제외."""
+    return json.dumps([params["W"], params["M"], params["bpc_max"], method, float(tol), accel, int(max_iter)])
+
+def states(params):
+    W, M = params["W"], params["M"]
+    st, index = [], {}
+    for i in range(params["bpc_max"] + 1):
+        for j in range(M[i] + 1):
+            for k in range(W[i]):
+                index[(i, j, k)] = len(st)
+                st.append((i, j, k))
+    return st, index
+
+def _offsets(params):
+    """단계 i 의 첫 상태 인덱스(states() 순서: i → j → k). idx(i,j,k) = off[i] + j·W_i + k."""
+    W, M = params["W"], params["M"]
+    sizes = [(M[i] + 1) * W[i] for i in range(params["bpc_max"] + 1)]
+    return np.concatenate(([0], np.cumsum(sizes))).astype(np.int64)
+
+_STRUCT = {}                           # params_key → (rows, cols, c0, c_p, c_pb, n)
+
+def _structure(params):
+    """
+    전이행렬의 희소 구조(COO)와 계수: 값 = c0 + c_p·p + c_pb·pb.
+    (p, pb) 와 무관하므로 체인 파라미터당 한 번만 만든다(중복 좌표는 CSR 변환에서 합산).
+    """
+    key = _key(params)
+    if key in _STRUCT:
+        return _STRUCT[key]
+    W, M, B = params["W"], params["M"], params["bpc_max"]
+    off = _offsets(params)
+    R, C, A0, AP, AB = [], [], [], [], []
+    def add(r, c, a0=0.0, ap=0.0, ab=0.0):
+        r, c = np.broadcast_arrays(r, c)
+        R.append(r.ravel()); C.append(c.ravel())
+        A0.append(np.full(r.size, a0)); AP.append(np.full(r.size, ap)); AB.append(np.full(r.size, ab))
+    for i in range(B + 1):
+        ni = min(B, i + 1)
+        fan_next = off[ni] + M[ni] * W[ni] + np.arange(W[ni])          # (ni, M_ni, ·)
+        fan_zero = off[0] + M[0] * W[0] + np.arange(W[0])              # (0, M_0, ·)
+        j = np.arange(M[i] + 1)[:, None]
+        k = np.arange(1, W[i])[None, :]
+        cur = off[i] + j * W[i] + k                                    # k > 0
+        add(cur, cur - 1, a0=1.0, ab=-1.0)                             # idle: BC-1
+        add(cur[1:], cur[1:] - W[i] - 1, ab=1.0)                       # busy, DC>0: DC-1, BC-1
+        add(cur[0][:, None], fan_next[None, :], ab=1.0 / W[ni])        # busy, DC=0: BPC 상승
+        tx = off[i] + np.arange(M[i] + 1) * W[i]                       # k = 0
+        add(tx[:, None], fan_zero[None, :], a0=1.0 / W[0], ap=-1.0 / W[0])   # 성공
+        add(tx[:, None], fan_next[None, :], ap=1.0 / W[ni])                  # 충돌
+    out = (np.concatenate(R), np.concatenate(C), np.concatenate(A0), np.concatenate(AP),
+           np.concatenate(AB), int(off[-1]))
+    _STRUCT[key] = out
+    return out
+
+def build_transition_matrix(params, tau, p, pb):
+    """벡터화 COO 조립 → CSR (tau 는 p, pb 를 통해서만 들어감; 원 스크립트와 같은 시그니처)."""
+    rows, cols, c0, cp, cb, n = _structure(params)
+    vals = c0 + cp * p + cb * pb
+    return coo_matrix((vals, (rows, cols)), shape=(n, n)).tocsr()
+
+def stationary(P):
+    """직접 희소 해: (Pᵀ - I)π = 0 의 마지막 식을 Σπ = 1 로 바꿔 spsolve."""
+    n = P.shape[0]
+    A = (P.T - identity(n, format="csr")).tocsr()
+    A = vstack([A[:-1], csr_matrix(np.ones((1, n)))]).tocsc()
+    b = np.zeros(n); b[-1] = 1.0
+    pi = spsolve(A, b)
+    return pi / np.sum(pi)
+
+def _stage_visits(W, M, pb):
+    """
+    단계 내부 방문 수(구조적 닫힌 형태).
+    진입은 (M, k0), k0 ~ U{0..W-1}. t 슬롯 뒤 BC = k0-t, DC = M - (busy 수) 이고
+    busy 가 M 번을 넘기 전까지 단계에 머문다 → (j, k) 방문 확률 = Σ_{k0≥k} Binom(k0-k; M-j, pb).
+    반환: cum[t, n] = Σ_{s≤t} Binom(s; n, pb) (t=0..W-1, n=0..M) → π_stage(j,k) ∝ cum[W-1-k, M-j] / W.
+    """
+    t = np.arange(W)[:, None]
+    nb = np.arange(M + 1)[None, :]
+    return np.cumsum(binom.pmf(nb, t, pb), axis=0)
+
+def stationary_closed(params, p, pb):
+    """
+    정상분포의 닫힌 형태(전이행렬 없이). 단계 i 진입률 x_i:
+      x_{i+1} = x_i·r_i (i+1 < B),  x_B = x_{B-1}·r_{B-1} / (1 - r_B),  r_i = 1 - q_i(1-p)
+    q_i = 단계 i 에서 BC=0(송신)에 도달할 확률. π = x_i·방문수 를 Σπ=1 로 정규화.
+    """
+    W, M, B = params["W"], params["M"], params["bpc_max"]
+    cums = [_stage_visits(W[i], M[i], pb) for i in range(B + 1)]
+    q = [float(c[-1].sum()) / W[i] for i, c in enumerate(cums)]
+    x = [1.0]
+    for i in range(B):
+        r = 1.0 - q[i] * (1.0 - p)
+        if i + 1 == B:
+            rb = q[B] * (1.0 - p)         # 1 - r_B
+            x.append(x[-1] * r / rb if rb > 0 else 0.0)
+        else:
+            x.append(x[-1] * r)
+    blocks = [x[i] / W[i] * cums[i][::-1, ::-1].T for i in range(B + 1)]   # [j, k]
+    pi = np.concatenate([b.ravel() for b in blocks])
+    return pi / pi.sum()
+
+def _tau_map(params, n, tau, k0, method):
+    """g(tau): (p, pb) → π → Σπ(i,j,0)."""
+    p = 1 - (1 - tau) ** (n - 1)
+    pb = 1 - (1 - tau) ** n
+    if method == "sparse":
+        pi = stationary(build_transition_matrix(params, tau, p, pb))
+    else:
+        pi = stationary_closed(params, p, pb)
+    return float(pi[k0].sum()), p, pi
+
+def solve_tau(params, n, max_iter=50, tol=1e-6, tau0=0.1, method="closed", accel="secant"):
+    """
+    고정점 tau = g(tau) (p, pb 는 tau 의 함수). 반환 dict(tau, p, pb, iters, pi, tau_history, p_history).
+    - method: "closed"(단계별 닫힌 형태, 기본) | "sparse"(COO 조립 + 직접 희소 해)
+    - accel : "secant"(스칼라 Anderson(m=1) = 할선법, f=g(tau)-tau 의 부호 구간으로 이분 보호) | "none"(단순 반복)
+    tau0 에 이웃 N 의 해를 주면 warm start.
+    """
+    off = _offsets(params)
+    k0 = np.concatenate([off[i] + np.arange(params["M"][i] + 1) * params["W"][i]
+                         for i in range(params["bpc_max"] + 1)])          # BC=0 상태 인덱스
+    tau = min(max(float(tau0), 1e-9), 1 - 1e-9)
+    tau_history, p_history = [], []
+    lo, hi = 0.0, 1.0                     # f(lo) > 0 > f(hi) 를 유지하는 구간
+    prev = None                           # (tau, f)
+    pi = None
+    it = 0
+    for it in range(1, max_iter + 1):
+        g, p, pi = _tau_map(params, n, tau, k0, method)
+        tau_history.append(g); p_history.append(p)
+        f = g - tau
+        if abs(f) < tol:
+            tau = g
+            break
+        if accel != "secant":
+            tau = g
+            continue
+        if f > 0:
+            lo = max(lo, tau)
+        else:
+            hi = min(hi, tau)
+        nxt = g
+        if prev is not None and f != prev[1]:
+            nxt = tau - f * (tau - prev[0]) / (f - prev[1])
+        if not (lo < nxt < hi):           # 구간 밖이면 이분
+            nxt = 0.5 * (lo + hi)
+        prev = (tau, f)
+        tau = nxt
+    return dict(tau=tau, p=1 - (1 - tau) ** (n - 1), pb=1 - (1 - tau) ** n, iters=it, pi=pi,
+                tau_history=tau_history, p_history=p_history)
+
+def efficiency(tau, n, mac_cfg, frame_bits=DEFAULT_FRAME_BITS):
+    sigma = float(mac_cfg.get("sigma_us", 20))
+    air = math.ceil(frame_bits / (int(mac_cfg.get("phy_bps", 10_000_000)) / 1e6))
+    p_tr = 1 - (1 - tau) ** n
+    p_s = (n * tau * (1 - tau) ** (n - 1) / p_tr) if p_tr > 0 else 0.0
+    eta = p_tr * p_s * air / ((1 - p_tr) * sigma + p_tr * air) if p_tr > 0 else 0.0
+    return dict(eta=eta, p_tr=p_tr, p_s=p_s)
+
+def _load_cache(path):
+    try:
+        with open(path, "r") as f:
+            for k, r in json.load(f).items():
+                key, n = k.rsplit("|", 1)
+                _CACHE.setdefault((key, int(n)), r)
+    except (OSError, ValueError):
+        pass
+
+def _save_cache(path):
+    with open(path, "w") as f:
+        json.dump({f"{k}|{n}": r for (k, n), r in _CACHE.items()}, f)
+
+def analyze(cfg, Ns, cap="CAP0", frame_bits=DEFAULT_FRAME_BITS, cache_path=None, **solve_kw):
+    """
+    N 벡터에 대한 해석 결과(컬럼형 dict of np.ndarray, 입력 순서 유지). cfg 는 전체 설정 또는 mac 섹션.
+    같은 체인 파라미터/풀이 설정/N 은 모듈 캐시(및 cache_path 파일)에서 재사용한다.
+    캐시에 없는 N 은 오름차순으로 풀며 직전(이웃) N 의 tau 로 warm start 한다.
+    """
+    mac = cfg.get("mac", cfg)
+    params = chain_params(mac, cap)
+    tau_prev = solve_kw.pop("tau0", 0.1)
+    key = _cache_key(params, **solve_kw)
+    if cache_path:
+        _load_cache(cache_path)
+    miss = False
+    for n in sorted({int(n) for n in Ns}):
+        r = _CACHE.get((key, n))
+        if r is None:
+            r = solve_tau(params, n, tau0=tau_prev, **solve_kw)
+            r = {k: r[k] for k in ("tau", "p", "pb", "iters")}
+            _CACHE[(key, n)] = r
+            miss = True
+        tau_prev = r["tau"]
+    cols = {k: [] for k in ("N", "tau", "p", "pb", "p_tr", "p_s", "eta", "iters")}
+    for n in Ns:
+        n = int(n)
+        r = _CACHE[(key, n)]
+        e = efficiency(r["tau"], n, mac, frame_bits)
+        for k, v in (("N", n), ("tau", r["tau"]), ("p", r["p"]), ("pb", r["pb"]), ("p_tr", e["p_tr"]),
+                     ("p_s", e["p_s"]), ("eta", e["eta"]), ("iters", r["iters"])):
+            cols[k].append(v)
+    if cache_path and miss:
+        _save_cache(cache_path)
+    return {k: np.array(v) for k, v in cols.items()}
+
+def clear_cache():
+    _CACHE.clear()
@@ -4,6 +4,9 @@ app_15118.py
 - SLAC 상세 시퀀스 (CAP3)
 - SLAC 완료 이후: DC 루프(Req, 100ms 주기 등) + EVSE 응답자(Res)
 - DC 주기 위반/응답지연/타임아웃 로깅은 metrics.debug(...)로 남긴다.
+  (세션/DC 집계에 쓰이지 않는 태그는 metrics.tracing(tag) 로 먼저 걸러 트레이스 OFF 시 kwargs 생성 비용 없음)
+- DC 왕복: Req 전달(on_success) → EVSE 응답 준비, Rsp 전달(on_success) → DC_RSP(rtt_us) + 워치독 해제
+  (지연/타임아웃이 매체 경합을 반영)
 """
 
 from .mac_hpgp import Priority, Frame
@@ -34,6 +37,7 @@ class App15118:
         self._retry_count = 0
         self._proc_timer_armed = False
         self._slac_rx = set()       # (NEW) 실제 성공 전파된 응답 kind 집합
+        self._retry_pending = False # 재시도 예약 중 여부(slac_settled 판단용)
 
         # --- SLAC 상세 파라미터 ---
         self.N_start_atten   = 3
@@ -102,6 +106,19 @@ class App15118:
             self._slac_sequence()
         self.sim.at(start_us, _go)
 
+    def start_dc_loop(self, start_us=0):
+        """SLAC 없이 DC 루프를 바로 시작(정상상태 DC 구간 연구/엔진 검증용). EV만 해당."""
+        if self.role != "EV" or not self.dc_loop_enabled:
+            return
+        self.sim.at(start_us, self._start_dc_loop)
+
+    def start_post_slac_traffic(self, start_us=0):
+        """SLAC 없이 post-SLAC 랜덤 트래픽 시작(start_without_slac: 매칭된 것으로 간주). EV만 해당."""
+        cfg = self.post_slac_cfg
+        if self.role != "EV" or not cfg or cfg["rate_mean_pps"] <= 0:
+            return
+        self.sim.at(start_us + cfg["start_delay_us"], self._start_random_traffic)
+
     # -------- 공통 헬퍼 --------
     def _enqueue(self, bits, prio, kind, ddl_us=None):
         fr = Frame(src=self.mac.id, dst="peer", bits=bits,
@@ -121,7 +138,7 @@ class App15118:
             self._on_slac_rsp_delivered(k)
 
         def _dropped(k=kind):
-            if hasattr(self.metrics, "debug"):
+            if self.metrics.tracing("SLAC_RSP_DROPPED"):
                 self.metrics.debug("SLAC_RSP_DROPPED", node=self.mac.id, kind=k)
 
         fr.on_success = _delivered
@@ -137,7 +154,7 @@ class App15118:
             if self._slac_done:
                 return
             if self._awaiting == kind:
-                if hasattr(self.metrics, "debug"):
+                if self.metrics.tracing("SLAC_TIMEOUT_MSG"):
                     self.metrics.debug("SLAC_TIMEOUT_MSG", node=self.mac.id, expect=kind)
                 self._fail_and_maybe_retry(reason=f"msg:{kind}")
         self.sim.at(timeout_us, _check)
@@ -147,9 +164,9 @@ class App15118:
         self._slac_rx.add(str(kind).upper())
         if self._awaiting == kind:
             self._awaiting = None
-            if hasattr(self.metrics, "debug"):
+            if self.metrics.tracing("SLAC_MSG_OK"):
                 self.metrics.debug("SLAC_MSG_OK", node=self.mac.id, kind=kind)
-        if hasattr(self.metrics, "debug"):
+        if self.metrics.tracing("SLAC_RX"):
             self.metrics.debug("SLAC_RX", node=self.mac.id, kind=kind)
 
     def _arm_process_timeout(self):
@@ -159,7 +176,7 @@ class App15118:
         def _check():
             if self._slac_done:
                 return
-            if hasattr(self.metrics, "debug"):
+            if self.metrics.tracing("SLAC_TIMEOUT_PROC"):
                 self.metrics.debug("SLAC_TIMEOUT_PROC", node=self.mac.id)
             self._fail_and_maybe_retry(reason="process")
         self.sim.at(self.proc_to_us, _check)
@@ -179,15 +196,21 @@ class App15118:
         if self._retry_count < self.max_retries:
             cnt = self._retry_count + 1
             backoff = self.retry_backoff_us
-            if hasattr(self.metrics, "debug"):
+            if self.metrics.tracing("SLAC_RETRY"):
                 self.metrics.debug("SLAC_RETRY", node=self.mac.id, count=cnt, delay_us=backoff)
+            self._retry_pending = True
             def _again():
+                self._retry_pending = False
                 self._reset_for_retry()
                 self._retry_count = cnt
                 self._slac_sequence()
             self.sim.at(backoff, _again)
         # else give up (no DC)
 
+    def slac_settled(self):
+        """SLAC 단계가 끝났는가? (DC 진입했거나, 재시도 없이 종료됨)"""
+        return self._dc_started or (self._slac_done and not self._retry_pending)
+
     # -------- whole SLAC sequence --------
     def _slac_sequence(self):
         # 1) Parm
@@ -267,50 +290,68 @@ class App15118:
                 gap_violation = 1
             self._last_req_us = now_req
 
-            # Req 전송 (CAP0 가정)
+            # Req 전송 (CAP0 가정) — EVSE 는 Req 가 MAC 으로 실제 전달된 시점에 응답을 준비
             kind_req = f"DC_CUR_DEM_REQ_{seq}"
-            self._enqueue(bits=300*8, prio=Priority.CAP0, kind=kind_req, ddl_us=None)
+            fr = Frame(src=self.mac.id, dst="peer", bits=300*8, prio=Priority.CAP0, deadline_us=None,
+                       kind=kind_req, app_id=self.app_id)
+            fr.on_success = self._dc_req_delivered_cb(seq, now_req)
+            self.mac.enqueue(fr)
 
             if hasattr(self.metrics, "debug"):
                 self.metrics.debug("DC_REQ", node=self.mac.id, seq=seq, t_us=now_req, gap_violation=gap_violation)
 
-            # 워치독 (Rsp 타임아웃 여부)
+            # 워치독 (Rsp 가 deadline 안에 EV 로 전달되지 않으면 타임아웃)
             deadline_t = now_req + self.dc_deadline_us
             self._pending_rsp[seq] = (now_req, deadline_t)
             def watchdog(s=seq, due=deadline_t, req_t=now_req):
-                # 만약 아직 응답이 안찍혔다면 타임아웃 기록
+                # 만약 아직 응답이 전달되지 않았다면 타임아웃 기록
                 if s in self._pending_rsp:
                     self._pending_rsp.pop(s, None)
                     if hasattr(self.metrics, "debug"):
                         self.metrics.debug("DC_TIMEOUT", node=self.mac.id, seq=s, req_us=req_t, due_us=due)
             self.sim.at(self.dc_deadline_us, watchdog)
 
-            # EVSE 응답자 스케줄
-            if self._peer and self._peer.role == "EVSE":
-                delay = self.dc_rsp_delay_us
-                if self.dc_rsp_jitter_us > 0:
-                    # 간단한 균등 지터
-                    jitter = self.sim.rng.randrange(-self.dc_rsp_jitter_us, self.dc_rsp_jitter_us+1)
-                    delay = max(0, delay + jitter)
-                def do_rsp(s=seq, req_node=self.mac.id):
-                    # RSP 전송
-                    kind_rsp = f"DC_CUR_DEM_RSP_{s}"
-                    fr = Frame(src=self._peer.mac.id, dst="peer", bits=200*8,
-                               prio=Priority.CAP0, deadline_us=None, kind=kind_rsp, app_id=self._peer.app_id)
-                    self._peer.mac.enqueue(fr)
-                    # 로깅
-                    if hasattr(self.metrics, "debug"):
-                        self.metrics.debug("DC_RSP", node=req_node, seq=s, t_us=self.sim.now())
-                    # 타임아웃 해제
-                    self._pending_rsp.pop(s, None)
-                self.sim.at(delay, do_rsp)
-
             # 다음 주기
             self.sim.at(self.dc_period_us, tick)
 
         # 첫 틱 즉시 시작
         tick()
 
+    def _dc_req_delivered_cb(self, seq, req_t):
+        """Req 프레임 on_success: EVSE 처리지연(+지터) 후 Rsp 를 EVSE MAC 큐에 넣는다."""
+        done = []
+        def delivered():
+            if done or not (self._peer and self._peer.role == "EVSE"):   # 충돌 경로의 중복 성공 보고 무시
+                return
+            done.append(1)
+            dlv_t = self.sim.now()
+            delay = self.dc_rsp_delay_us
+            if self.dc_rsp_jitter_us > 0:
+                # 간단한 균등 지터
+                jitter = self.sim.rng.randrange(-self.dc_rsp_jitter_us, self.dc_rsp_jitter_us+1)
+                delay = max(0, delay + jitter)
+            def do_rsp():
+                fr = Frame(src=self._peer.mac.id, dst=self.mac.id, bits=200*8, prio=Priority.CAP0,
+                           deadline_us=None, kind=f"DC_CUR_DEM_RSP_{seq}", app_id=self._peer.app_id)
+                fr.on_success = self._dc_rsp_delivered_cb(seq, req_t, dlv_t)
+                self._peer.mac.enqueue(fr)
+            self.sim.at(delay, do_rsp)
+        return delivered
+
+    def _dc_rsp_delivered_cb(self, seq, req_t, req_dlv_t):
+        """Rsp 프레임 on_success: EV 수신 시점 — RTT(Req 생성 → Rsp 전달) 기록 + 워치독 해제."""
+        done = []
+        def delivered():
+            if done:
+                return
+            done.append(1)
+            late = int(self._pending_rsp.pop(seq, None) is None)   # 이미 DC_TIMEOUT 처리된 주기
+            if hasattr(self.metrics, "debug"):
+                now = self.sim.now()
+                self.metrics.debug("DC_RSP", node=self.mac.id, seq=seq, t_us=now, req_us=req_t,
+                                   req_dlv_us=req_dlv_t, rtt_us=now - req_t, late=late)
+        return delivered
+
     # -------- random traffic generator (optional) --------
     def _start_random_traffic(self):
         cfg = self.post_slac_cfg
@@ -0,0 +1,127 @@
+"""
+batch_means.py
+==============
+역할
+- 독립 반복(replication) 대신 '긴 단일 실행' 하나로 신뢰구간을 추정한다(배치 평균법).
+  SLAC 워밍업 비용을 한 번만 지불하므로 반복마다 과도 구간을 버리는 것보다 싸다.
+- 워밍업(MSER-5, warmup.py) 이후의 Metrics.series bin 들을 배치로 묶고,
+  배치 평균들의 lag-1 자기상관이 충분히 작아질 때까지 배치 크기를 2배씩 키운다.
+- 지표는 비율 추정량(분자/분모 합)으로 계산: 배치 값 = Σnum / Σden (배치 내).
+
+구성
+- lag1(x): lag-1 표본 자기상관
+- t95(df): 양측 95% Student t 분위수(작은 df 표 + 정규 근사)
+- batch_ratio(num, den, m): 크기 m bin 배치별 비율 값
+- batch_means(num, den, ...): 배치 크기 결정 + 점추정/95% 반폭
+- estimate(metrics, t1_us, warmup_us, ...): eta / collision_ratio / dc_latency_us / deadline_miss_ratio
+- run_long(cfg, seed, out_dir, ...): 빌드→실행→워밍업 탐지→추정 결과(dict) 반환
+
+지표 정의(bin 시계열 기준)
+- efficiency_eta   = Σsucc / Σ(bin_us - ctrl)
+- collision_ratio  = Σcoll / Σ(succ + coll)
+- dc_latency_us    = Σdc_lat / Σdc_rsp  (DC_REQ → DC_RSP)
+- deadline_miss_ratio = Σdc_to / Σdc_req
+"""
+
+import math
+
+from .warmup import detect_warmup_us
+
+# 양측 95% t 분위수(df=1..30), 그 이상은 보간 없이 근사
+_T95 = [12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+        2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+        2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042]
+
+def t95(df):
+    if df < 1:
+        return float("inf")
+    if df <= len(_T95):
+        return _T95[df - 1]
+    return 1.96 + 2.4 / df     # df>30: 1.96 + O(1/df) 근사(오차 < 0.002)
+
+def lag1(x):
+    n = len(x)
+    if n < 3:
+        return 0.0
+    mu = sum(x) / n
+    var = sum((v - mu) ** 2 for v in x)
+    if var <= 0:
+        return 0.0
+    return sum((x[i] - mu) * (x[i + 1] - mu) for i in range(n - 1)) / var
+
+def batch_ratio(num, den, m):
+    """크기 m 인 연속 배치들의 Σnum/Σden (분모 0 인 배치는 제외). 남는 꼬리 bin 은 버린다."""
+    out = []
+    for b in range(len(num) // m):
+        d = sum(den[b*m:(b+1)*m])
+        if d > 0:
+            out.append(sum(num[b*m:(b+1)*m]) / d)
+    return out
+
+def batch_means(num, den, m0=1, min_batches=10, max_lag1=0.1):
+    """
+    배치 크기 m 을 m0 부터 2배씩 키우며 |lag1| <= max_lag1 인 첫 m 을 선택.
+    배치 수가 min_batches 미만이 되기 직전에 멈춘다(그때는 independent=False 로 표시).
+    반환: dict(mean, ci95, batch_bins, n_batches, lag1, independent)
+    """
+    m = max(1, int(m0))
+    tot_den = sum(den)
+    mean = (sum(num) / tot_den) if tot_den > 0 else 0.0
+    best = None
+    while True:
+        ys = batch_ratio(num, den, m)
+        if len(ys) < max(2, min_batches):
+            break
+        r1 = lag1(ys)
+        best = (m, ys, r1)
+        if abs(r1) <= max_lag1:
+            break
+        m *= 2
+    if best is None:
+        return dict(mean=mean, ci95=float("nan"), batch_bins=m, n_batches=0, lag1=float("nan"), independent=False)
+    m, ys, r1 = best
+    k = len(ys)
+    mu = sum(ys) / k
+    sd = math.sqrt(sum((y - mu) ** 2 for y in ys) / (k - 1))
+    return dict(mean=mean, ci95=t95(k - 1) * sd / math.sqrt(k), batch_bins=m, n_batches=k,
+                lag1=r1, independent=abs(r1) <= max_lag1)
+
+def estimate(metrics, t1_us, warmup_us=None, batch=5, min_batches=10, max_lag1=0.1):
+    """
+    [warmup_us, t1_us) 정상상태 구간에 배치 평균법 적용. warmup_us=None 이면 MSER-5 로 탐지.
+    반환: dict(warmup_us, steady_us, bin_us, metrics={name: batch_means 결과})
+    """
+    if warmup_us is None:
+        warmup_us = detect_warmup_us(metrics, t1_us, batch)
+    B = metrics.bin_us
+    ser = metrics.binned(t1_us)
+    k0 = int(warmup_us) // B
+    tail = {k: v[k0:] for k, v in ser.items()}
+    n = len(tail["succ"])
+    pairs = dict(
+        efficiency_eta=(tail["succ"], [max(1, B - c) for c in tail["ctrl"]]),
+        collision_ratio=(tail["coll"], [s + c for s, c in zip(tail["succ"], tail["coll"])]),
+        dc_latency_us=(tail["dc_lat"], tail["dc_rsp"]),
+        deadline_miss_ratio=(tail["dc_to"], tail["dc_req"]),
+    )
+    res = {}
+    for name, (num, den) in pairs.items():
+        if sum(den) <= 0:
+            continue
+        res[name] = batch_means(num, den, min_batches=min_batches, max_lag1=max_lag1)
+    return dict(warmup_us=k0 * B, steady_us=n * B, bin_us=B, metrics=res)
+
+def run_long(cfg, seed=1, out_dir="/mnt/data/out", sim_time_s=None, bin_ms=None, **kw):
+    """한 번의 긴 실행 후 estimate() 결과 반환(+ 같은 실행의 steady summary)."""
+    from .sim import load_config, build
+    cfg = load_config(cfg)
+    if sim_time_s is not None:
+        cfg["sim_time_s"] = float(sim_time_s)
+    world = build(cfg, out_dir=out_dir, seed=seed)
+    metrics = world["metrics"]
+    if bin_ms is not None:
+        metrics.set_bin_us(int(float(bin_ms) * 1000))
+    world["sim"].run(until=world["sim_time_us"])
+    est = estimate(metrics, world["sim_time_us"], **kw)
+    est["summary"] = metrics.steady_summary(world["sim_time_us"], est["warmup_us"])
+    return est
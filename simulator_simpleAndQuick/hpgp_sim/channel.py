@@ -12,6 +12,11 @@ channel.py
 - per_good/per_bad: 상태별 프레임 오류 확률
 - step_us: 상태 업데이트 시간 해상도(us)
 - periodic: {"freq_hz":f, "amp":A, "bias":B} → PER = base * (1 + bias + A*sin(2π f t))
+
+크로스토크(옵션, depot 결합 모드)
+- add_interference(t0_us, dur_us): 이웃 버스 전송으로 인한 간섭 구간 등록
+- per(..., start_us=프레임 시작) 호출 시 [start_us, now)와 겹치는 간섭 k개마다
+  PER = 1 - (1-PER)·(1-xtalk_per)^k 로 가중(순서 무관)
 """
 
 import math  # 삼각함수, 파이
@@ -26,6 +31,9 @@ class GEChannel:
         self.step_us = step_us                   # 상태 업데이트 해상도
         self.bad = False                         # 현재 채널 상태 플래그(False=good, True=bad)
         self.periodic = periodic or {"freq_hz":0, "amp":0.0, "bias":0.0}  # 주기성 잡음 파라미터
+        self.xtalk = []                          # 이웃 버스 간섭 구간 [(t0, t1)]
+        self.xtalk_per = 0.0                     # 간섭 1건당 추가 오류 확률
+        self.xtalk_hits = 0                      # 간섭과 겹친 프레임 수(진단용)
         # on_tick 훅은 등록만(여기선 per() 호출 때 상태 전진)
 
     def _advance_state(self, steps, rng):
@@ -38,10 +46,15 @@ class GEChannel:
                 # good에서 bad로 진입 여부 결정
                 self.bad = rng.random() < self.p_bg
 
-    def per(self, last_t, rng):
+    def add_interference(self, t0_us, dur_us):
+        """간섭 구간 [t0, t0+dur) 등록(결합 모드에서 배리어마다 전달됨)."""
+        self.xtalk.append((int(t0_us), int(t0_us) + int(dur_us)))
+
+    def per(self, last_t, rng, start_us=None):
         """
         마지막 질의 시각 last_t 이후 경과한 시간만큼 상태를 전진시키고,
         현재 상태와 주기성 잡음을 반영한 PER를 반환한다.
+        start_us(프레임 시작)가 주어지면 [start_us, now)와 겹치는 크로스토크 간섭을 반영.
         """
         dt = max(0, self.sim.now() - last_t)             # 경과 시간(us)
         steps = dt // self.step_us if self.step_us>0 else 0  # 전진할 스텝 수
@@ -55,4 +68,12 @@ class GEChannel:
         if f>0 and amp!=0.0:
             t_sec = self.sim.now() * 1e-6               # 현재 시각(초)
             base = base * max(0.0, 1.0 + bias + amp*math.sin(2*math.pi*f*t_sec))
+        if self.xtalk and start_us is not None:
+            # 이미 끝난 간섭은 버림(같은 버스의 프레임 시작 시각은 단조 증가)
+            self.xtalk = [w for w in self.xtalk if w[1] > start_us]
+            now = self.sim.now()
+            k = sum(1 for t0, t1 in self.xtalk if t0 < now)
+            if k and self.xtalk_per > 0:
+                self.xtalk_hits += 1
+                base = 1.0 - (1.0 - min(1.0, base)) * (1.0 - self.xtalk_per) ** k
         return min(1.0, max(0.0, base))                 # 0~1로 클램핑
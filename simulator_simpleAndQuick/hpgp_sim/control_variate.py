@@ -0,0 +1,130 @@
+"""
+control_variate.py
+==================
+역할
+- 독립 반복(replication)들의 시뮬레이션 효율(eta)에 **제어변량(control variate)** 보정을 적용한다.
+  제어변수 = 반복별 관측 접근 확률(attempt_prob = 송신 수 / 백오프 슬롯 수)과
+  충돌 확률(collision_prob = 충돌 송신 수 / 송신 수).
+- 제어변수 기댓값 μ:
+  · pilot > 0 (기본): 본 반복과 독립인 파일럿 반복 K 개의 평균 μ̂ 로 보정(같은 모델이므로 E[C] 와 일치)
+  · pilot = 0      : 같은 설정의 해석 모델(analytic.py) tau, p — 포화 가정이라 현재 MAC 과는 대개 불일치
+- 보정 추정량: y 를 [1, C - μ] 에 최소제곱 회귀한 절편
+    eta_cv = ȳ - β·(C̄ - μ),  Var(eta_cv) = s_e² · [(XᵀX)⁻¹]₀₀ + βᵀ Cov(μ̂) β
+  (s_e² 는 잔차분산, 자유도 n-q-1. 둘째 항은 파일럿 μ̂ 의 추정오차, 해석 μ 이면 0)
+- 분산 감소 계수 VRF = Var(ȳ) / Var(eta_cv) → 같은 CI 에 필요한 반복 수는 약 1/VRF 배.
+
+주의
+- 제어변수마다 C̄ - μ 와 95% 반폭(파일럿 분산 포함)을 보고하고, 반폭을 넘으면 control_bias=1 로 표시한다.
+  이때 eta_cv/ci95_cv/vrf 는 편향되므로 None 으로 내보내지 않는다(단순 평균 eta ± ci95 사용).
+- 현재 MAC 은 '새로 샘플한 BC 가 0 일 때만' 송신하고 busy 틱마다 DC 를 줄이므로 관측 tau 가 체인 모델보다
+  훨씬 작다 → 해석 μ(pilot=0)는 거의 항상 control_bias=1 이 된다. 해석값은 참고로 analytic 에 남긴다.
+- 반복 간 분산이 0 인 제어변수(예: N=1 의 충돌 확률)는 자동 제외.
+
+구성
+- controlled_mean(y, controls, means, pilot): 일반 다중 제어변량 추정 → dict(eta, ci95, eta_cv, ci95_cv, vrf, beta, ...)
+- analytic_controls(cfg, cap): 해석 모델 μ = dict(attempt_prob=tau, collision_prob=p) (+ eta_analytic)
+- run_replications(cfg, seeds, workers, cap, out_dir, pilot): parallel.run_jobs 로 반복 실행 → (result, rows)
+- summary_fields(cfg, seed): 설정 "control_variate" 섹션 → build_and_run summary 에 붙일 열(선택 기능)
+"""
+
+import math
+import numpy as np
+
+from .batch_means import t95
+from .parallel import run_jobs
+from .analytic import analyze
+
+CONTROL_KEYS = ("attempt_prob", "collision_prob")
+
+def controlled_mean(y, controls, means=None, pilot=None):
+    """
+    y: 반복별 관측값 목록, controls: {이름: 반복별 값 목록}.
+    means: {이름: 알려진 기댓값} 또는 pilot: {이름: 독립 파일럿 반복별 값 목록}(μ̂ = 평균, 추정오차를 CI 에 반영).
+    반환 dict(eta, ci95, eta_cv, ci95_cv, vrf, beta, used, bias, control_bias, n).
+    control_bias=1 이면 eta_cv/ci95_cv/vrf 는 None.
+    """
+    y = np.asarray(y, dtype=float)
+    n = y.size
+    var_y = float(y.var(ddof=1)) if n > 1 else 0.0
+    ci = t95(n - 1) * math.sqrt(var_y / n) if n > 1 else float("inf")
+    m = 0
+    if pilot is not None:
+        P = {k: np.asarray(v, dtype=float) for k, v in pilot.items()}
+        m = min(p.size for p in P.values()) if P else 0
+        means = {k: float(p.mean()) for k, p in P.items()}
+    used, bias, flag = [], {}, 0
+    for k, v in controls.items():
+        c = np.asarray(v, dtype=float)
+        if n > 1 and c.var(ddof=1) > 0:
+            used.append(k)
+            d = float(c.mean() - means[k])
+            h = t95(n - 1) * math.sqrt(c.var(ddof=1) / n + (P[k].var(ddof=1) / m if m > 1 else 0.0))
+            bias[k] = dict(diff=d, ci95=h)
+            flag |= int(abs(d) > h)
+    q = len(used)
+    out = dict(n=n, eta=float(y.mean()) if n else float("nan"), ci95=ci, used=used, bias=bias,
+               control_bias=flag, beta={}, eta_cv=float(y.mean()) if n else float("nan"), ci95_cv=ci, vrf=1.0)
+    if flag:
+        out.update(eta_cv=None, ci95_cv=None, vrf=None)
+        return out
+    if q == 0 or n - q - 1 < 2:
+        return out
+    X = np.column_stack([np.ones(n)] + [np.asarray(controls[k], dtype=float) - means[k] for k in used])
+    coef, *_ = np.linalg.lstsq(X, y, rcond=None)
+    resid = y - X @ coef
+    s2 = float(resid @ resid) / (n - q - 1)
+    var_cv = s2 * float(np.linalg.inv(X.T @ X)[0, 0])
+    if m > 1:                             # 파일럿 μ̂ 추정오차: βᵀ Cov(μ̂) β
+        b = coef[1:]
+        S = np.atleast_2d(np.cov(np.vstack([P[k] for k in used]), ddof=1)) / m
+        var_cv += float(b @ S @ b)
+    out.update(eta_cv=float(coef[0]), ci95_cv=t95(n - q - 1) * math.sqrt(max(0.0, var_cv)),
+               beta={k: float(b) for k, b in zip(used, coef[1:])},
+               vrf=(var_y / n) / var_cv if var_cv > 0 else float("inf"))
+    return out
+
+def _contenders(cfg):
+    return int(cfg.get("nodes", 2)) if cfg.get("topology", "shared_bus") == "shared_bus" else 2
+
+def analytic_controls(cfg, cap="CAP0", cache_path=None):
+    """설정의 경쟁 노드 수에 대한 해석 모델 tau/p/eta."""
+    n = _contenders(cfg)
+    a = analyze(cfg, [n], cap=cap, cache_path=cache_path)
+    return dict(attempt_prob=float(a["tau"][0]), collision_prob=float(a["p"][0]), eta_analytic=float(a["eta"][0]))
+
+def run_replications(cfg, seeds, workers=None, cap="CAP0", out_dir=None, cache_path=None, pilot=10):
+    """
+    seeds 마다 독립 실행(parallel.run_jobs) → 반복별 eta/제어변수 → controlled_mean.
+    pilot > 0 이면 max(seeds)+1 부터 pilot 개 시드로 파일럿 반복을 함께 돌려 μ 로 쓴다(0 이면 해석 모델 μ).
+    반환: (result dict, rows[list of dict(seed, efficiency_eta, attempt_prob, collision_prob, pilot)])
+    """
+    seeds = [int(sd) for sd in seeds]
+    pseeds = list(range(max(seeds) + 1, max(seeds) + 1 + int(pilot))) if pilot and seeds else []
+    jobs = [dict(cfg=cfg, seed=sd, job_id=sd, artifacts=False,
+                 out_dir=(f"{out_dir}/rep_{sd}" if out_dir else None)) for sd in seeds + pseeds]
+    res = run_jobs(jobs, workers=workers)
+    rows = [dict(seed=r["job_id"], efficiency_eta=r["summary"]["efficiency_eta"],
+                 **{k: r["summary"][k] for k in CONTROL_KEYS}, pilot=int(i >= len(seeds))) for i, r in enumerate(res)]
+    main, prow = rows[:len(seeds)], rows[len(seeds):]
+    mu = analytic_controls(cfg, cap=cap, cache_path=cache_path)
+    out = controlled_mean([r["efficiency_eta"] for r in main], {k: [r[k] for r in main] for k in CONTROL_KEYS},
+                          means=None if prow else mu,
+                          pilot={k: [r[k] for r in prow] for k in CONTROL_KEYS} if prow else None)
+    out.update(analytic=mu, contenders=_contenders(cfg), pilot=len(prow),
+               mu_source="pilot" if prow else "analytic")
+    return out, rows
+
+def summary_fields(cfg, seed=1):
+    """
+    설정 "control_variate": {"reps": 20, "pilot": 10, "workers": null, "cap": "CAP0"} → summary 열.
+    반복은 seed..seed+reps-1 (산출물·라이브·프로파일 없이), 편향 점검 실패 시 eta_cv 열은 넣지 않는다.
+    """
+    cv = cfg.get("control_variate") or {}
+    rcfg = {k: v for k, v in cfg.items() if k not in ("control_variate", "live", "telemetry", "profile")}
+    r, _ = run_replications(rcfg, range(int(seed), int(seed) + int(cv.get("reps", 20))),
+                            workers=cv.get("workers"), cap=cv.get("cap", "CAP0"), pilot=int(cv.get("pilot", 10)))
+    s = dict(cv_reps=r["n"], cv_pilot=r["pilot"], eta_reps=r["eta"], ci95_reps=r["ci95"],
+             cv_control_bias=r["control_bias"])
+    if r["eta_cv"] is not None:
+        s.update(eta_cv=r["eta_cv"], ci95_cv=r["ci95_cv"], vrf_cv=r["vrf"])
+    return s
@@ -0,0 +1,172 @@
+"""
+cosim.py
+========
+역할
+- 실제 SLAC/ISO 15118 스택(또는 로컬 대역 프로세스)과의 소프트 실시간 연동용 실행 모드.
+- PacedRunner: asyncio 이벤트 루프 안에서 Sim 시각을 벽시계에 맞춰(speed 배) step_us 단위로 전진.
+  각 step 사이에 await 로 양보하므로 같은 루프의 소켓 브리지가 프레임을 주고받을 수 있다.
+- DatagramBridge: localhost UDP 또는 Unix datagram 소켓으로
+  * 외부 프레임(JSON) → 지정 노드의 MAC 큐에 주입(현재 sim 시각의 이벤트로 enqueue)
+  * 주입 프레임의 MAC 전송 성공 → {"ev":"sent"} 응답,  다른 노드가 이 노드로 보낸 프레임 성공 → {"ev":"rx"}
+- 측정(히스토그램, us)
+  * pacing lag  : step 처리 직후 (벽시계가 가리키는 sim 시각 - 실제 도달 sim 시각). 양수가 크면 실시간을 못 따라감
+  * bridge latency: 데이터그램 수신(벽시계) → 해당 프레임 "sent" 송신(벽시계)
+
+메시지 형식(UTF-8 JSON 한 데이터그램)
+- 입력: {"id": any, "kind": "DC_REQ", "bytes": 300, "dst": "N0", "cap": "CAP0"}   (dst/cap/kind 생략 가능)
+- 출력: {"ev":"sent", "id", "kind", "t_us", "mac_delay_us"} / {"ev":"rx", "src", "kind", "bits", "t_us"}
+
+구성
+- 히스토그램은 histogram.LogHistogram(병합 가능, 고정 메모리); 보고는 n/mean/p50/p95/p99/p999/max
+- PacedRunner(world, speed, step_us).run(until_us)  (코루틴)
+- DatagramBridge(world, node_id, runner).start(addr)  addr = "udp://127.0.0.1:9000" | "unix:///tmp/hpgp.sock"
+- run_paced(world, addr, node_id, until_us, speed, step_us): 둘을 묶어 실행 → 보고 dict
+"""
+
+import os, json, socket, asyncio
+
+from .mac_hpgp import Frame, Priority
+from .histogram import LogHistogram, QUANTILES
+
+def _report(h):
+    """LogHistogram → 보고용 dict(n, mean, p50, p95, p99, p999, max)."""
+    return dict(n=h.n, mean=h.mean(), max=h.vmax, **{name: h.quantile(q) for name, q in QUANTILES})
+
+class PacedRunner:
+    """
+    Sim 시각 = sim0 + (벽시계 경과)·speed. step_us 마다 따라잡기 실행 후 양보.
+    뒤처지면 한 번에 최대 max_chunk_us 만 실행하고 양보(브리지 응답성 유지; 지연은 lag 로 누적).
+    """
+    def __init__(self, world, speed=1.0, step_us=1000, max_chunk_us=None):
+        self.world = world
+        self.sim = world["sim"]
+        self.speed = float(speed)
+        self.step_us = max(1, int(step_us))
+        self.max_chunk_us = int(max_chunk_us or 10 * self.step_us)
+        self.cursor = self.sim.now()     # 처리 완료된 sim 시각(이 시각까지의 이벤트는 모두 실행됨)
+        self.lag = LogHistogram()
+        self.behind_steps = 0            # lag > step_us 인 step 수
+        self.steps = 0
+        self._stop = False
+
+    def stop(self):
+        self._stop = True
+
+    def schedule_now(self, fn):
+        """현재 cursor 시각의 이벤트로 fn 실행(브리지 주입용; 다음 step 에서 처리)."""
+        self.sim.call_later_abs(max(self.sim.now(), self.cursor), fn)
+
+    async def run(self, until_us):
+        loop = asyncio.get_running_loop()
+        w0, s0 = loop.time(), self.cursor
+        until_us = int(until_us)
+        while self.cursor < until_us and not self._stop:
+            target = min(until_us, s0 + int((loop.time() - w0) * 1e6 * self.speed), self.cursor + self.max_chunk_us)
+            if target > self.cursor:
+                self.sim.run(until=target)
+                self.cursor = target
+            lag = (loop.time() - w0) * 1e6 * self.speed - (self.cursor - s0)
+            self.lag.add(lag)
+            self.steps += 1
+            self.behind_steps += int(lag > self.step_us)
+            nxt = self.cursor + self.step_us - s0
+            await asyncio.sleep(max(0.0, nxt / (1e6 * self.speed) - (loop.time() - w0)))
+
+class _Proto(asyncio.DatagramProtocol):
+    def __init__(self, bridge):
+        self.bridge = bridge
+
+    def connection_made(self, transport):
+        self.bridge.transport = transport
+
+    def datagram_received(self, data, addr):
+        self.bridge.on_datagram(data, addr)
+
+class DatagramBridge:
+    """외부 프레임 ↔ 노드 node_id 의 MAC 큐."""
+    def __init__(self, world, node_id, runner, default_dst=None):
+        self.world = world
+        self.sim = world["sim"]
+        self.runner = runner
+        macs = {m.id: m for m in world["macs"]}
+        if node_id not in macs:
+            raise ValueError(f"unknown node {node_id!r} (have {sorted(macs)})")
+        self.node = node_id
+        self.mac = macs[node_id]
+        self.default_dst = default_dst or next(n for n in macs if n != node_id)
+        self.transport = None
+        self.peer = None                 # 마지막 송신자 주소(응답 대상)
+        self.latency = LogHistogram()
+        self.n_in = self.n_sent = self.n_rx = self.n_bad = 0
+        world["metrics"].tx_listeners.append(self._on_tx)
+
+    async def start(self, addr):
+        loop = asyncio.get_running_loop()
+        if addr.startswith("unix://"):
+            path = addr[len("unix://"):]
+            if os.path.exists(path):
+                os.unlink(path)
+            await loop.create_datagram_endpoint(lambda: _Proto(self), local_addr=path, family=socket.AF_UNIX)
+        else:
+            host, port = addr[len("udp://"):].rsplit(":", 1)
+            await loop.create_datagram_endpoint(lambda: _Proto(self), local_addr=(host, int(port)))
+
+    def close(self):
+        if self.transport is not None:
+            self.transport.close()
+
+    def _send(self, msg):
+        if self.transport is not None and self.peer is not None:
+            self.transport.sendto(json.dumps(msg).encode(), self.peer)
+
+    def on_datagram(self, data, addr):
+        t_wall = asyncio.get_running_loop().time()
+        self.peer = addr
+        try:
+            m = json.loads(data.decode())
+            bits = int(m.get("bits", int(m.get("bytes", 300)) * 8))
+            prio = Priority[m.get("cap", "CAP0")]
+        except (ValueError, KeyError, TypeError):
+            self.n_bad += 1
+            return
+        self.n_in += 1
+        fid, kind = m.get("id"), str(m.get("kind", "EXT"))
+        fr = Frame(src=self.node, dst=str(m.get("dst", self.default_dst)), bits=bits, prio=prio, kind=kind,
+                   app_id="cosim")
+        done = []
+        def sent():
+            if done:                      # 충돌 경로에서 같은 프레임 성공이 중복 보고될 수 있음
+                return
+            done.append(1)
+            lat = (asyncio.get_running_loop().time() - t_wall) * 1e6
+            self.latency.add(lat)
+            self.n_sent += 1
+            self._send(dict(ev="sent", id=fid, kind=kind, t_us=self.sim.now(),
+                            mac_delay_us=self.sim.now() - fr.born_t))
+        fr.on_success = sent
+        self.runner.schedule_now(lambda: self.mac.enqueue(fr))
+
+    def _on_tx(self, frame, success, start_us, end_us, node):
+        if success and frame.dst == self.node and node != self.node:
+            self.n_rx += 1
+            self._send(dict(ev="rx", src=frame.src, kind=frame.kind, bits=frame.bits, t_us=end_us))
+
+    def report(self):
+        return dict(node=self.node, frames_in=self.n_in, frames_sent=self.n_sent, frames_rx=self.n_rx,
+                    bad_datagrams=self.n_bad, bridge_latency_us=_report(self.latency))
+
+async def _run_paced(world, addr, node_id, until_us, speed, step_us):
+    runner = PacedRunner(world, speed=speed, step_us=step_us)
+    bridge = DatagramBridge(world, node_id, runner)
+    await bridge.start(addr)
+    try:
+        await runner.run(until_us)
+    finally:
+        bridge.close()
+    return dict(speed=speed, step_us=runner.step_us, steps=runner.steps, behind_steps=runner.behind_steps,
+                behind_ratio=runner.behind_steps / max(1, runner.steps), pacing_lag_us=_report(runner.lag),
+                sim_until_us=runner.cursor, **bridge.report())
+
+def run_paced(world, addr, node_id, until_us, speed=1.0, step_us=1000):
+    """월드를 벽시계 페이스로 until_us 까지 실행하며 addr 에서 브리지 제공. 반환: 보고 dict."""
+    return asyncio.run(_run_paced(world, addr, node_id, until_us, speed, step_us))
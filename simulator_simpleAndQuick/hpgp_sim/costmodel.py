@@ -0,0 +1,97 @@
+"""
+costmodel.py
+============
+역할
+- 실행별 자원 기록(작업 벽시계, 처리 이벤트 수, events/s, 최대 RSS)을 JSONL 이력에 쌓고
+  설정 특징으로 새 작업의 비용(벽시계 초)을 예측한다.
+- parallel.run_jobs 가 예측 비용 내림차순(longest-first)으로 작업을 제출 → 큰 N 실행 하나가 마지막에
+  혼자 도는 꼬리(나머지 코어 유휴)를 없앤다. 결과는 입력 순서로 돌려주므로 내용은 동일.
+
+예측
+- 범주 키(topology, DC 루프, SLAC 생략, post-SLAC 트래픽 유무)가 같은 기록으로 wall ≈ a + b·N·sim_time_s 최소제곱 적합
+  (MAC 마다 슬롯 틱 → 이벤트 수가 N·sim_time 에 비례, a = 빌드/산출물 고정비용). 점이 하나뿐이면 원점 비례.
+- 기록이 없으면 휴리스틱 b·N·sim_time: 순서만 맞으면 충분하다.
+
+구성
+- features(cfg) → dict(topology, nodes, sim_time_s, dc, skip_slac, pps)
+- CostModel(path=None): add(feat, job_wall_s, events, peak_rss_mb) → path 가 있으면 JSONL 에 바로 추가
+  (job_wall_s = 작업 전체 벽시계(산출물 포함). summary 의 wall_s 는 산출물 제외라 이름을 구분)
+                        predict(cfg 또는 features) → 예상 벽시계 초
+"""
+
+import os, json
+
+HEURISTIC_S_PER_NODE_SIM_S = 0.3     # 기록이 없을 때: sim 1초·노드 1개당 벽시계 초(대략, 순서용)
+
+def features(cfg):
+    """비용에 영향을 주는 설정 특징(dict). cfg 는 경로 또는 dict."""
+    if not isinstance(cfg, dict):
+        with open(cfg, "r") as f:
+            cfg = json.load(f)
+    tr = cfg.get("traffic", {})
+    dc = tr.get("dc_loop", {})
+    topo = cfg.get("topology", "shared_bus")
+    nodes = int(cfg.get("nodes", 2)) if topo == "shared_bus" else 2
+    if topo == "depot":
+        d = cfg.get("depot", {})
+        nodes = int(d.get("buses", 4)) * int(d.get("nodes_per_bus", cfg.get("nodes", 2)))
+    return dict(topology=topo, nodes=nodes, sim_time_s=float(os.environ.get("SIM_TIME_S", cfg.get("sim_time_s", 10.0))),
+                dc=bool(dc.get("enabled", True)), skip_slac=bool(dc.get("start_without_slac", False)),
+                pps=float((tr.get("post_slac") or {}).get("rate_mean_pps", 0) or 0))
+
+def _key(f):
+    return (f["topology"], f["dc"], f["skip_slac"], f["pps"] > 0)
+
+class CostModel:
+    def __init__(self, path=None):
+        self.path = path
+        self.records = []
+        if path and os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as fh:
+                for line in fh:
+                    try:
+                        self.records.append(json.loads(line))
+                    except ValueError:
+                        continue                # 중단된 쓰기 등 깨진 줄은 무시
+        self._coef = None
+
+    def add(self, feat, job_wall_s, events=None, peak_rss_mb=None):
+        rec = dict(features=feat, job_wall_s=float(job_wall_s), events=events, peak_rss_mb=peak_rss_mb)
+        self.records.append(rec)
+        self._coef = None
+        if self.path:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as fh:
+                fh.write(json.dumps(rec) + "\n")
+        return rec
+
+    def _fit(self):
+        """범주 키 → (a, b): wall ≈ a + b·N·sim_time_s (최소제곱, a,b ≥ 0)."""
+        by = {}
+        for r in self.records:
+            f = r.get("features") or {}
+            if not f or r.get("job_wall_s", 0) <= 0:
+                continue
+            by.setdefault(_key(f), []).append((max(1, int(f["nodes"])) * float(f["sim_time_s"]), float(r["job_wall_s"])))
+        self._coef = {}
+        for k, pts in by.items():
+            n = len(pts)
+            mx, my = sum(x for x, _ in pts) / n, sum(y for _, y in pts) / n
+            sxx = sum((x - mx) ** 2 for x, _ in pts)
+            if sxx <= 1e-12 * max(1.0, mx * mx):
+                self._coef[k] = (0.0, my / max(1e-9, mx))            # x 가 하나뿐: 원점 비례
+                continue
+            b = max(0.0, sum((x - mx) * (y - my) for x, y in pts) / sxx)
+            a = my - b * mx
+            if a < 0:                                               # 음의 고정비용 → 원점 통과 비례로 재적합
+                a, b = 0.0, sum(x * y for x, y in pts) / sum(x * x for x, _ in pts)
+            self._coef[k] = (a, b)
+
+    def predict(self, cfg_or_feat):
+        """예상 작업 벽시계(초)."""
+        f = cfg_or_feat if isinstance(cfg_or_feat, dict) and "skip_slac" in cfg_or_feat else features(cfg_or_feat)
+        if self._coef is None:
+            self._fit()
+        x = max(1, int(f["nodes"])) * float(f["sim_time_s"])
+        a, b = self._coef.get(_key(f), (0.0, HEURISTIC_S_PER_NODE_SIM_S))
+        return a + b * x
@@ -0,0 +1,326 @@
+"""
+depot.py
+========
+역할
+- 충전 데포(depot) 토폴로지: M개의 CP/PLC 버스가 각자 Medium/EVSE/EV들을 가진다.
+  크로스토크가 없으면 버스끼리 완전히 독립이므로 버스들을 워커 프로세스에 나눠(shard) 실행한다.
+- 버스별 Metrics 원시 누적값(totals)을 합쳐 사이트 전체 summary와 버스별 내역(bus_summary.csv)을 만든다.
+
+구성
+- bus_config(cfg, b): 버스 b 용 shared_bus 설정(노드 수 = depot.nodes_per_bus 또는 cfg.nodes)
+- bus_seed(seed, b): 버스별 결정적 시드(워커 수/샤딩과 무관)
+- run_bus_shard(job): 워커 진입점. job=dict(cfg, seed, buses, out_dir, bus_artifacts) → 버스별 레코드 리스트
+- site_summary(records, sim_time_us): 버스 레코드 병합 → Metrics.summary()와 같은 키 + buses/nodes
+- run_depot(cfg, out_dir, seed, artifacts, workers): 샤딩 실행 + 병합 + summary.csv/bus_summary.csv/report.md
+- (크로스토크) neighbors/lookahead_us/earliest_tx_us, CoupledGroup(프로세스당 버스 묶음),
+  run_coupled(윈도 배리어 보수적 병렬 DES; 윈도 끝 = 모든 버스의 최조 송신 가능 시각(EOT) + L - 1)
+
+설정(cfg["depot"])
+- buses(기본 4), nodes_per_bus(기본 cfg.nodes; N0=EVSE), workers(기본 CPU 수), bus_artifacts(bool; 버스별 전체 산출물)
+- crosstalk: {enable, layout("line"|"ring"), per_add(간섭 1건당 추가 PER, 기본 0.05), lookahead_us(기본 min(슬롯, PRS))}
+  버스의 모든 매체 점유(start_tx)가 이웃 버스 채널에 L 지연 후 같은 길이의 간섭 구간으로 전달된다.
+
+사이트 지표 정의(버스 M개, 구간 T)
+- throughput_mbps = Σbits_ok / T (사이트 합계)
+- efficiency_eta  = Σt_success / Σ(T - t_control_b)
+- utilization     = Σ(t_success + t_collision) / (M·T)
+- collision_ratio = Σt_collision / Σ(t_success + t_collision)
+- access/drop 지연 분위수 = 버스별 LogHistogram 병합본의 분위수(버스 레코드의 delay_hist)
+"""
+
+import os, csv
+
+from .parallel import run_jobs, default_workers
+from .metrics import delay_quantiles
+from .histogram import merge_all
+from .memguard import peak_rss_mb
+
+BUS_COLS = ["bus", "seed", "nodes", "throughput_mbps", "efficiency_eta", "utilization", "collision_ratio",
+            "drops", "session_total", "session_success", "session_timeouts",
+            "dc_req", "dc_timeouts", "deadline_miss_ratio", "dc_gap_violation_ratio",
+            "access_delay_p50_us", "access_delay_p99_us", "xtalk_hits"]
+
+def bus_config(cfg, b):
+    d = cfg.get("depot", {})
+    bcfg = dict(cfg)
+    bcfg["topology"] = "shared_bus"
+    bcfg["nodes"] = int(d.get("nodes_per_bus", cfg.get("nodes", 2)))
+    return bcfg
+
+def bus_seed(seed, b):
+    return int(seed) * 1000 + int(b)
+
+def _bus_record(b, seed, nodes, sim_time_us, s, tot):
+    rec = dict(bus=b, seed=seed, nodes=nodes, sim_time_us=sim_time_us)
+    rec.update(s)
+    rec["totals"] = tot
+    return rec
+
+def _build_bus(cfg, b, seed, out_dir, art):
+    from .sim import build
+    bus_dir = os.path.join(out_dir, f"bus_{b:02d}") if art else out_dir
+    world = build(bus_config(cfg, b), out_dir=bus_dir, seed=bus_seed(seed, b))
+    world["bus"], world["bus_seed"], world["bus_art"] = b, bus_seed(seed, b), art
+    if not art and "trace" not in cfg:
+        world["metrics"].set_trace("OFF")
+    return world
+
+def _finish_bus(world):
+    from .sim import _write_all_reports, _dc_trace_cycles
+    metrics, T = world["metrics"], world["sim_time_us"]
+    if world["bus_art"]:
+        s = _write_all_reports(metrics, T, world["out_dir"], trace_cycles=_dc_trace_cycles(world["cfg"]))
+    else:
+        s = metrics.summary(T)
+    rec = _bus_record(world["bus"], world["bus_seed"], world["nodes"], T, s, metrics.totals())
+    rec["xtalk_hits"] = world["channel"].xtalk_hits
+    rec["delay_hist"] = metrics.delay_histograms()
+    rec["events"] = world["sim"].events
+    rec["peak_rss_mb"] = round(peak_rss_mb(), 1)       # 이 버스를 돌린 프로세스의 고수위(site 는 최대값)
+    return rec
+
+def run_bus_shard(job):
+    """버스 목록(job["buses"])을 현재 프로세스에서 차례로 실행. 각 버스는 독립 Sim."""
+    from .sim import load_config
+    cfg = load_config(job["cfg"])
+    out = []
+    for b in job["buses"]:
+        world = _build_bus(cfg, b, job.get("seed", 1), job["out_dir"], bool(job.get("bus_artifacts", False)))
+        world["sim"].run(until=world["sim_time_us"])
+        out.append(_finish_bus(world))
+    return out
+
+def site_summary(records, sim_time_us):
+    M = max(1, len(records))
+    T = max(1, sim_time_us)
+    tot = {}
+    for r in records:
+        for k, v in r["totals"].items():
+            tot[k] = tot.get(k, 0) + v
+    busy = tot["t_success"] + tot["t_collision"]
+    return dict(
+        throughput_mbps=(tot["bits_ok"]/T)*1e6/1e6,
+        efficiency_eta=tot["t_success"] / max(1, M*T - tot["t_control"]),
+        utilization=busy / (M*T),
+        collision_ratio=tot["t_collision"] / max(1, busy),
+        drops=tot["drops"],
+        timeouts=tot["timeouts"],
+        session_total=tot["session_total"],
+        session_success=tot["session_success"],
+        session_timeouts=tot["session_timeouts"],
+        dc_req=tot["dc_req"],
+        dc_timeouts=tot["dc_timeouts"],
+        deadline_miss_ratio=tot["dc_timeouts"] / max(1, tot["dc_req"]),
+        dc_gap_violation_ratio=tot["dc_gap_violations"] / max(1, tot["dc_req"]),
+        attempt_prob=(tot["tx_ok"] + tot["tx_err"]) / max(1, tot["bo_slots"]),
+        collision_prob=tot["coll_tx"] / max(1, tot["tx_ok"] + tot["tx_err"]),
+        **delay_quantiles(*(r.get("delay_hist", {}) for r in records)),
+        dc_rtt_censored_ratio=tot["dc_timeouts"] / max(1, merge_all(
+            h for r in records for k, h in r.get("delay_hist", {}).items() if k.startswith("dc_rtt|")).n),
+        buses=len(records),
+        nodes=sum(r["nodes"] for r in records),
+    )
+
+def _shards(buses, workers):
+    """라운드로빈 샤딩(버스 부하가 비슷하므로 단순 분배)."""
+    return [[b for b in range(buses) if b % workers == w] for w in range(workers)]
+
+def write_depot_reports(records, s, out_dir):
+    os.makedirs(out_dir, exist_ok=True)
+    with open(os.path.join(out_dir, "summary.csv"), "w", newline="") as f:
+        w = csv.writer(f); w.writerow(list(s.keys())); w.writerow(list(s.values()))
+    with open(os.path.join(out_dir, "bus_summary.csv"), "w", newline="") as f:
+        w = csv.DictWriter(f, fieldnames=BUS_COLS, extrasaction="ignore"); w.writeheader()
+        for r in records:
+            w.writerow(r)
+    with open(os.path.join(out_dir, "report.md"), "w", encoding="utf-8") as f:
+        f.write("# Depot Report\n\n## Site summary\n\n")
+        for k, v in s.items():
+            f.write(f"- **{k}**: {v}\n")
+        f.write("\n## Per bus\n\n| " + " | ".join(BUS_COLS) + " |\n|" + "---|" * len(BUS_COLS) + "\n")
+        for r in records:
+            f.write("| " + " | ".join(str(r.get(k, "")) for k in BUS_COLS) + " |\n")
+
+def run_depot(cfg, out_dir="/mnt/data/out", seed=1, artifacts=True, workers=None):
+    """
+    M개 버스를 workers개 프로세스에 나눠 실행하고 사이트 summary를 반환.
+    버스 시드가 워커 수와 무관하므로 결과는 workers 값에 관계없이 동일하다.
+    depot.crosstalk.enable 이면 보수적 병렬 DES(run_coupled)로 실행.
+    반환: (site_summary, records)
+    """
+    d = cfg.get("depot", {})
+    buses = int(d.get("buses", 4))
+    workers = d.get("workers") if workers is None else workers
+    workers = max(1, min(buses, int(workers or default_workers())))
+    if d.get("crosstalk", {}).get("enable", False):
+        records = run_coupled(cfg, out_dir=out_dir, seed=seed, workers=workers)
+    else:
+        jobs = [dict(cfg=cfg, seed=seed, buses=sh, out_dir=out_dir, bus_artifacts=bool(d.get("bus_artifacts", False)))
+                for sh in _shards(buses, workers) if sh]
+        records = sorted((r for part in run_jobs(jobs, workers=workers, fn=run_bus_shard) for r in part),
+                         key=lambda r: r["bus"])
+    s = site_summary(records, records[0]["sim_time_us"])
+    if artifacts:
+        write_depot_reports(records, s, out_dir)
+    return s, records
+
+# ---- 크로스토크 결합: 보수적(conservative) 병렬 DES ----
+def neighbors(b, buses, layout="line"):
+    """버스 b 의 이웃(line: b±1, ring: 양끝 연결)."""
+    if buses < 2:
+        return []
+    if layout == "ring" and buses > 2:
+        return [(b - 1) % buses, (b + 1) % buses]
+    return [n for n in (b - 1, b + 1) if 0 <= n < buses]
+
+def lookahead_us(cfg):
+    """
+    룩어헤드 = min(슬롯 시간, PRS 길이). 버스 A의 전송 시작(t)은 이웃에서 t+L 부터 간섭으로 나타난다고
+    모델링하므로, EOT 이후 L 미만 폭의 윈도 안에서 생긴 메시지는 항상 다음 윈도 이후에 효력이 생긴다.
+    """
+    x = cfg.get("depot", {}).get("crosstalk", {})
+    if x.get("lookahead_us") is not None:
+        return max(1, int(x["lookahead_us"]))
+    mac = cfg["mac"]
+    prs = mac.get("timing", {}).get("prs", {"symbols": 2, "symbol_us": 36})
+    return max(1, min(int(mac.get("sigma_us", 20)), int(prs.get("symbols", 2)) * int(prs.get("symbol_us", 36))))
+
+def earliest_tx_us(world, done_us):
+    """
+    done_us 까지 처리한 버스가 다음에 매체 점유(start_tx: 프레임/PRS/비콘)를 시작할 수 있는 가장 이른 시각의 하한(EOT).
+    - MAC 슬롯 틱이 아닌 이벤트(전송 종료, 앱 Req/Rsp, 비콘 등)는 그 시각에 바로 점유를 만들 수 있다.
+    - 매체 유휴 시 큐가 있는 MAC 은 다음 틱 + BC 슬롯 전에는 BC==0 에 닿지 않는다(빈 큐의 틱은 재예약만 함).
+    - 매체 점유 중엔 틱이 점유를 시작하지 못하므로 점유를 끝내는 이벤트(틱 아님)가 하한이 된다.
+    """
+    from .mac_hpgp import HPGPMac
+    tick, idle = HPGPMac._tick, world["medium"].is_idle()
+    eot, ticks = None, {}
+    for ev in world["sim"].q:
+        if getattr(ev.fn, "__func__", None) is tick:
+            m = ev.fn.__self__
+            ticks[m] = min(ev.t, ticks.get(m, ev.t))
+        elif eot is None or ev.t < eot:
+            eot = ev.t
+    if idle:
+        for m, t in ticks.items():
+            if m.tx_queue:
+                t += m.BC * m.slot_time()
+                eot = t if eot is None else min(eot, t)
+    return done_us + 1 if eot is None else max(done_us + 1, eot)
+
+class CoupledGroup:
+    """
+    한 프로세스가 담당하는 버스 묶음. 윈도마다 advance(t_end) → 외부로 나갈 간섭 메시지 반환,
+    deliver(msgs) 로 이웃 버스에서 온 메시지를 채널에 등록한다.
+    메시지 = (t_eff, src_bus, seq, dst_bus, dur_us)
+    """
+    def __init__(self, cfg, seed, buses, out_dir, art=False):
+        x = cfg["depot"].get("crosstalk", {})
+        M = int(cfg["depot"].get("buses", 4))
+        L = lookahead_us(cfg)
+        self.worlds = {}
+        self.outbox = []
+        for b in buses:
+            w = _build_bus(cfg, b, seed, out_dir, art)
+            w["channel"].xtalk_per = float(x.get("per_add", 0.05))
+            nb = neighbors(b, M, x.get("layout", "line"))
+            seq = [0]
+            def on_tx(owner, t, dur, b=b, nb=nb, seq=seq):
+                seq[0] += 1
+                for n in nb:
+                    self.outbox.append((t + L, b, seq[0], n, dur))
+            w["medium"].tx_listeners.append(on_tx)
+            self.worlds[b] = w
+
+    def deliver(self, msgs):
+        for t_eff, src, seq, dst, dur in msgs:
+            self.worlds[dst]["channel"].add_interference(t_eff, dur)
+
+    def advance(self, until_us):
+        """until_us 까지 실행 → (외부로 나갈 메시지, 그룹 안 버스들의 최소 EOT)."""
+        for b in sorted(self.worlds):
+            self.worlds[b]["sim"].run(until=until_us)
+        out, self.outbox = self.outbox, []
+        return out, min(earliest_tx_us(w, until_us) for w in self.worlds.values())
+
+    def finish(self, windows=0):
+        recs = [_finish_bus(self.worlds[b]) for b in sorted(self.worlds)]
+        for r in recs:
+            r["xtalk_windows"] = windows
+        return recs
+
+def _group_worker(conn, cfg, seed, buses, out_dir, art):
+    """워커 프로세스: ("run", until, inbound) → (outbound, eot), ("finish", windows) → records."""
+    g = CoupledGroup(cfg, seed, buses, out_dir, art)
+    while True:
+        msg = conn.recv()
+        if msg[0] == "run":
+            g.deliver(msg[2])
+            conn.send(g.advance(msg[1]))
+        else:
+            conn.send(g.finish(msg[1]))
+            conn.close()
+            return
+
+def run_coupled(cfg, out_dir="/mnt/data/out", seed=1, workers=1):
+    """
+    윈도 배리어 방식의 보수적 병렬 실행(earliest-output-time 룩어헤드).
+      1) 모든 그룹이 (done, until] 구간 이벤트 처리 후 버스별 EOT(earliest_tx_us)의 최솟값 보고
+      2) 코디네이터가 발생한 메시지를 (t_eff, src, seq, dst) 순으로 정렬해 목적지 그룹에 전달
+      3) 다음 until = min(T, min EOT + L - 1): 버스 b 의 다음 메시지는 t ≥ EOT_b 에서 나와 t+L 에 효력이
+         생기므로 그 전까지는 아무 버스도 새 간섭을 받지 않는다(최소 L, 모든 버스가 유휴면 다음 앱 이벤트까지 건너뜀).
+    workers=1 이면 같은 절차를 한 프로세스에서 수행하므로 병렬 결과와 정확히 일치한다.
+    반환: 버스 레코드 리스트(버스 순; xtalk_windows = 배리어 왕복 수)
+    """
+    import multiprocessing as mp
+    from .sim import load_config
+    cfg = load_config(cfg)
+    d = cfg["depot"]
+    M = int(d.get("buses", 4))
+    art = bool(d.get("bus_artifacts", False))
+    L = lookahead_us(cfg)
+    groups = [sh for sh in _shards(M, max(1, min(M, int(workers)))) if sh]
+    owner = {b: gi for gi, sh in enumerate(groups) for b in sh}
+    T = int(float(cfg["sim_time_s"]) * 1e6)
+    if os.environ.get("SIM_TIME_S") is not None:
+        T = int(float(os.environ["SIM_TIME_S"]) * 1e6)
+
+    if len(groups) == 1:
+        g = CoupledGroup(cfg, seed, groups[0], out_dir, art)
+        def step(until, inbound):
+            g.deliver(inbound[0])
+            return [g.advance(until)]
+        finish = g.finish
+    else:
+        ctx = mp.get_context("fork") if "fork" in mp.get_all_start_methods() else mp.get_context()
+        conns, procs = [], []
+        for sh in groups:
+            a, b = ctx.Pipe()
+            p = ctx.Process(target=_group_worker, args=(b, cfg, seed, sh, out_dir, art), daemon=True)
+            p.start(); b.close()
+            conns.append(a); procs.append(p)
+        def step(until, inbound):
+            for c, inb in zip(conns, inbound):
+                c.send(("run", until, inb))
+            return [c.recv() for c in conns]
+        def finish(windows):
+            for c in conns:
+                c.send(("finish", windows))
+            recs = [r for c in conns for r in c.recv()]
+            for p in procs:
+                p.join()
+            return recs
+
+    inbound = [[] for _ in groups]
+    done, eot, windows = -1, 0, 0
+    while done < T:
+        until = min(eot + L - 1, T)
+        outs = step(until, inbound)
+        windows += 1
+        msgs = sorted(m for out, _ in outs for m in out)
+        eot = min(e for _, e in outs)
+        inbound = [[] for _ in groups]
+        for m in msgs:
+            inbound[owner[m[3]]].append(m)
+        done = until
+    return sorted(finish(windows), key=lambda r: r["bus"])
@@ -0,0 +1,158 @@
+"""
+exporter.py
+===========
+역할
+- 긴 실행(수 시간 sim, N=100 등) 중 진행 상태를 밖에서 볼 수 있게 하는 선택(opt-in) 라이브 지표 내보내기.
+- every_s(sim 초)마다 Metrics 카운터 스냅샷을 떠서
+  * localhost HTTP 엔드포인트(GET /metrics)에 Prometheus 텍스트 형식으로 제공
+  * JSON-lines 파일에 한 줄씩 추가
+- 이벤트 루프를 막지 않는다: sim 쪽은 스냅샷 dict 를 만들어 참조 교체 + 큐에 넣기만 하고,
+  HTTP 응답과 파일 쓰기는 데몬 스레드가 처리한다. 스냅샷은 상태를 읽기만 하므로 결과(이벤트 순서)는 동일.
+
+지표(스냅샷 키)
+- Metrics.snapshot(): util/eta/collision_ratio/throughput, dc_req/dc_timeouts/DMR, sessions_active/done
+- control_ratio(제어시간/경과), collision_prob, queue_total/queue_max + 노드별 queue_depth
+- events(처리한 Sim 이벤트 누적), events_per_s(직전 스냅샷 이후 벽시계 기준), sim_speed(sim 초/벽시계 초)
+
+구성
+- LiveExporter(world, every_s, port=None, jsonl=None, host="127.0.0.1", run="")
+  * install(): Sim on_tick 훅으로 every_s 마다 sample()   (또는 run_iter(snapshot=exp.sample) 에 직접 연결)
+  * sample(): 스냅샷 dict 반환 + 게시,  prometheus(): 마지막 스냅샷의 텍스트,  close(): 마지막 스냅샷 후 스레드 정리
+- from_config(world, live_cfg): cfg["live"] = {"enable", "every_s", "port", "jsonl"} → 설치된 LiveExporter 또는 None
+"""
+
+import os, json, time, queue, threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+PREFIX = "hpgp_"
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/metrics", "/"):
+            self.send_error(404)
+            return
+        body = self.server.exporter.prometheus().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, fmt, *args):
+        pass
+
+class LiveExporter:
+    def __init__(self, world, every_s=1.0, port=None, jsonl=None, host="127.0.0.1", run=""):
+        self.world = world
+        self.sim = world["sim"]
+        self.metrics = world["metrics"]
+        self.every_us = max(1, int(float(every_s) * 1e6))
+        self.run = str(run)
+        self._next_us = self.sim.now() + self.every_us
+        self._last = None                 # 마지막 스냅샷(dict; 통째로 교체 → HTTP 스레드는 잠금 없이 읽음)
+        self._w0 = self._wl = time.perf_counter()
+        self._ev_last = self.sim.events
+        self._t_last = self.sim.now()
+        self._installed = False
+
+        self.server = None
+        self.port = None
+        if port is not None:
+            self.server = ThreadingHTTPServer((host, int(port)), _Handler)
+            self.server.daemon_threads = True
+            self.server.exporter = self
+            self.port = self.server.server_address[1]
+            threading.Thread(target=self.server.serve_forever, name="hpgp-live-http", daemon=True).start()
+
+        self._q = None
+        if jsonl:
+            os.makedirs(os.path.dirname(os.path.abspath(jsonl)), exist_ok=True)
+            self._q = queue.SimpleQueue()
+            self._writer = threading.Thread(target=self._write_loop, args=(jsonl,), name="hpgp-live-jsonl", daemon=True)
+            self._writer.start()
+
+    # ---- sim 쪽 ----
+    def install(self):
+        """on_tick 훅 등록(이벤트당 비교 1회; 체크포인트를 넘긴 첫 이벤트 직전에 스냅샷)."""
+        if not self._installed:
+            self.sim.hooks["on_tick"].append(self._on_tick)
+            self._installed = True
+        return self
+
+    def _on_tick(self, sim):
+        if sim.t >= self._next_us:
+            self._next_us += ((sim.t - self._next_us) // self.every_us + 1) * self.every_us
+            self.sample()
+
+    def sample(self):
+        now_w = time.perf_counter()
+        t = self.sim.now()
+        ev = self.sim.events
+        macs = self.world.get("macs", [])
+        qd = {m.id: len(m.tx_queue) for m in macs}
+        m = self.metrics
+        s = m.snapshot()
+        dw = max(1e-9, now_w - self._wl)
+        s.update(run=self.run, wall_s=round(now_w - self._w0, 3),
+                 control_ratio=m.t_control / max(1, t),
+                 collision_prob=m.coll_tx / max(1, m.tx_ok + m.tx_err),
+                 queue_total=sum(qd.values()), queue_max=max(qd.values(), default=0), queue_depth=qd,
+                 events=ev, events_per_s=(ev - self._ev_last) / dw, sim_speed=(t - self._t_last) / 1e6 / dw)
+        self._wl, self._ev_last, self._t_last = now_w, ev, t
+        self._last = s
+        if self._q is not None:
+            self._q.put(s)
+        return s
+
+    # ---- 내보내기 ----
+    def prometheus(self):
+        s = self._last
+        if s is None:
+            return ""
+        run = f'run="{self.run}"'
+        out = []
+        for k, v in s.items():
+            if k in ("run", "queue_depth") or not isinstance(v, (int, float)):
+                continue
+            kind = "counter" if k in ("tx_ok", "tx_err", "drops", "dc_req", "dc_timeouts", "events") else "gauge"
+            out.append(f"# TYPE {PREFIX}{k} {kind}")
+            out.append(f"{PREFIX}{k}{{{run}}} {v}")
+        out.append(f"# TYPE {PREFIX}queue_depth gauge")
+        for node, q in s["queue_depth"].items():
+            out.append(f'{PREFIX}queue_depth{{{run},node="{node}"}} {q}')
+        return "\n".join(out) + "\n"
+
+    def _write_loop(self, path):
+        with open(path, "a", encoding="utf-8") as f:
+            while True:
+                s = self._q.get()
+                if s is None:
+                    return
+                f.write(json.dumps(s) + "\n")
+                f.flush()
+
+    def close(self, final=True):
+        """실행 종료 시: 마지막 스냅샷(선택) → JSONL 비우고 HTTP 서버 종료."""
+        if final:
+            self.sample()
+        if self._installed:
+            self.sim.hooks["on_tick"].remove(self._on_tick)
+            self._installed = False
+        if self._q is not None:
+            self._q.put(None)
+            self._writer.join(timeout=5)
+            self._q = None
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+def from_config(world, live_cfg, run=""):
+    """cfg["live"] 설정으로 LiveExporter 를 만들어 설치(비활성화면 None). jsonl 상대경로는 out_dir 기준."""
+    if not live_cfg or not live_cfg.get("enable", False):
+        return None
+    jsonl = live_cfg.get("jsonl", "live_metrics.jsonl")
+    if jsonl and not os.path.isabs(jsonl):
+        jsonl = os.path.join(world["out_dir"], jsonl)
+    return LiveExporter(world, every_s=live_cfg.get("every_s", 1.0), port=live_cfg.get("port", None),
+                        jsonl=jsonl or None, host=live_cfg.get("host", "127.0.0.1"), run=run).install()
@@ -0,0 +1,176 @@
+"""
+fingerprint.py
+==============
+역할
+- 엔진 최적화(웨이크업, 슬롯 커널, 스케줄러 백엔드 등)가 결과를 바꾸지 않았는지 확인하는 결정적 지문(fingerprint).
+- 관측 가능한 사건 스트림을 순서대로 해시: (시각, 사건 종류, 노드, 결과)
+  * MAC 전송 결과(Metrics.tx_listeners): ("TX:<frame kind>", 송신 노드, "ok|err:<air us>>dst")
+  * 앱/집계 사건(Metrics.debug_listeners, 기본 ESSENTIAL_TAGS): (태그, node, 나머지 kv 정렬 문자열)
+  Sim 힙 이벤트 자체(클로저)는 해시하지 않는다 — 슬롯 점프 같은 최적화는 내부 이벤트 수를 바꾸는 것이 정상이므로.
+- 최종 summary(dict)도 정규화(실수는 12 유효숫자)해 해시 → fingerprint = H(stream ‖ summary)
+- 분기 지점 찾기: block 사건마다 누적 해시 체크포인트를 남긴다(메모리 O(사건/block)).
+  두 실행의 체크포인트를 비교해 첫 불일치 block 을 찾고, 그 구간만 capture 로 재실행해 첫 분기 사건과 앞 문맥을 보고.
+
+구성
+- EventFingerprint(world, tags=ESSENTIAL_TAGS, block=1000, capture=None): install() / finish(summary) → dict / close()
+  * tags="all" 이면 모든 debug 태그 포함(관찰자가 생기면 tracing() 이 참이 되어 느려지지만 결과는 불변)
+- BACKENDS: 이름 → fn(world, until_us) (같은 결과를 내야 하는 실행 방식; 새 엔진 백엔드는 여기에 등록)
+  * heap(sim.run), stepped(run_iter 1 ms 체크포인트), chunked(max_events 997 단위 재개), heap_full_trace(트레이스 FULL)
+- run_fingerprint(cfg, seed, backend, ...) → 지문 dict,  first_divergence(cfg, seed, ref, other, a, b) → 분기 보고
+- compare_backends(cfg, seeds, backends) → 시드별 보고 리스트
+- from_config(world, fp_cfg): cfg["fingerprint"] = {"enable", "tags", "block"} → build_and_run summary 에 fingerprint 열
+"""
+
+import json, hashlib, tempfile
+
+from .metrics import ESSENTIAL_TAGS
+
+def _canon(v):
+    """해시용 정규화: 실수 12 유효숫자, numpy 스칼라 → 파이썬 값, dict 키 정렬."""
+    if isinstance(v, dict):
+        return {str(k): _canon(x) for k, x in sorted(v.items(), key=lambda kv: str(kv[0]))}
+    if isinstance(v, (list, tuple)):
+        return [_canon(x) for x in v]
+    if hasattr(v, "item") and not isinstance(v, (str, bytes)):
+        v = v.item()
+    if isinstance(v, float):
+        return float(f"{v:.12g}")
+    return v
+
+def _digest(data):
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+class EventFingerprint:
+    def __init__(self, world, tags=ESSENTIAL_TAGS, block=1000, capture=None):
+        self.sim, self.metrics = world["sim"], world["metrics"]
+        self.tags = None if tags == "all" else frozenset(tags)
+        self.block = max(1, int(block))
+        self.capture = capture                 # (lo, hi): 이 사건 인덱스 구간의 사건 튜플 보관
+        self.captured = []                     # [(index, (t_us, etype, node, outcome))]
+        self.checkpoints = []                  # [(index, t_us, 누적 해시)] — block 사건마다
+        self.n = 0
+        self._h = hashlib.blake2b(digest_size=16)
+        self._installed = False
+
+    def install(self):
+        if not self._installed:
+            self.metrics.tx_listeners.append(self._on_tx)
+            self.metrics.debug_listeners.append(self._on_debug)
+            self._installed = True
+        return self
+
+    def close(self):
+        if self._installed:
+            self.metrics.tx_listeners.remove(self._on_tx)
+            self.metrics.debug_listeners.remove(self._on_debug)
+            self._installed = False
+
+    # ---- 사건 수집 ----
+    def _add(self, t_us, etype, node, outcome):
+        ev = (int(t_us), etype, str(node), outcome)
+        self._h.update(("%d|%s|%s|%s\n" % ev).encode())
+        if self.capture is not None and self.capture[0] <= self.n < self.capture[1]:
+            self.captured.append((self.n, ev))
+        self.n += 1
+        if self.n % self.block == 0:
+            self.checkpoints.append((self.n, ev[0], self._h.copy().hexdigest()))
+
+    def _on_tx(self, frame, success, start_us, end_us, node):
+        self._add(start_us, "TX:" + str(getattr(frame, "kind", "DATA")), node,
+                  "%s:%d>%s" % ("ok" if success else "err", end_us - start_us, frame.dst))
+
+    def _on_debug(self, t, tag, kv):
+        if self.tags is not None and tag not in self.tags:
+            return
+        rest = ",".join(f"{k}={_canon(kv[k])}" for k in sorted(kv) if k != "node")
+        self._add(t, tag, kv.get("node"), rest)
+
+    # ---- 결과 ----
+    def finish(self, summary):
+        """스트림 해시 + summary 해시 → 지문 dict(fingerprint, stream_hash, summary_hash, events, checkpoints)."""
+        stream = self._h.hexdigest()
+        summ = _digest(json.dumps(_canon(summary), sort_keys=True, default=str).encode())
+        return dict(fingerprint=_digest(f"{stream}|{summ}".encode()), stream_hash=stream, summary_hash=summ,
+                    events=self.n, checkpoints=[list(c) for c in self.checkpoints])
+
+# ---- 실행 방식(백엔드): 모두 같은 지문을 내야 한다 ----
+def _run_heap(world, until_us):
+    world["sim"].run(until=until_us)
+
+def _run_stepped(world, until_us, step_us=1000):
+    for _ in world["sim"].run_iter(step_us, until=until_us):
+        pass
+
+def _run_chunked(world, until_us, chunk=997):
+    sim = world["sim"]
+    while sim.q and sim.q[0].t <= until_us:
+        sim.run(until=until_us, max_events=chunk)
+
+def _run_full_trace(world, until_us):
+    world["metrics"].set_trace("FULL")
+    world["sim"].run(until=until_us)
+
+BACKENDS = {"heap": _run_heap, "stepped": _run_stepped, "chunked": _run_chunked, "heap_full_trace": _run_full_trace}
+
+def run_fingerprint(cfg, seed=1, backend="heap", tags=ESSENTIAL_TAGS, block=1000, capture=None, keep=False):
+    """cfg/seed 를 backend 로 실행한 지문. keep=True 면 수집기(EventFingerprint)도 함께 반환."""
+    from .sim import build
+    with tempfile.TemporaryDirectory() as out:
+        w = build(dict(cfg, trace=cfg.get("trace", dict(level="OFF"))), out_dir=out, seed=seed)
+        fp = EventFingerprint(w, tags=tags, block=block, capture=capture).install()
+        BACKENDS[backend](w, w["sim_time_us"])
+        res = fp.finish(w["metrics"].summary(w["sim_time_us"]))
+        fp.close()
+    res.update(backend=backend, seed=seed)
+    return (res, fp) if keep else res
+
+def first_divergent_block(a, b):
+    """두 지문의 체크포인트 비교 → 첫 불일치 사건 구간 (lo, hi); 스트림이 같으면 None."""
+    if a["stream_hash"] == b["stream_hash"]:
+        return None
+    lo = 0
+    for ca, cb in zip(a["checkpoints"], b["checkpoints"]):
+        if ca[2] != cb[2]:
+            return (lo, ca[0])
+        lo = ca[0]
+    return (lo, max(a["events"], b["events"]))
+
+def first_divergence(cfg, seed, backend_a, backend_b, a, b, context=5, tags=ESSENTIAL_TAGS, block=1000):
+    """
+    지문 a/b 가 다를 때 첫 분기 사건을 찾는다: 불일치 block 구간(+앞 문맥)만 capture 로 두 백엔드를 재실행.
+    반환 dict(index, t_us, a, b, context=[앞 사건들]) 또는 summary 만 다르면 dict(index=None, summary_only=True).
+    """
+    rng = first_divergent_block(a, b)
+    if rng is None:
+        return dict(index=None, summary_only=True)
+    cap = (max(0, rng[0] - context), rng[1])
+    _, fa = run_fingerprint(cfg, seed, backend_a, tags, block, capture=cap, keep=True)
+    _, fb = run_fingerprint(cfg, seed, backend_b, tags, block, capture=cap, keep=True)
+    ea, eb = dict(fa.captured), dict(fb.captured)
+    for i in range(cap[0], cap[1]):
+        if ea.get(i) != eb.get(i):
+            return dict(index=i, t_us=(ea.get(i) or eb.get(i))[0], a=ea.get(i), b=eb.get(i),
+                        context=[ea[j] for j in range(max(cap[0], i - context), i) if j in ea])
+    return dict(index=None, block=rng)
+
+def compare_backends(cfg, seeds=(1,), backends=("heap", "stepped", "chunked"), tags=ESSENTIAL_TAGS,
+                     block=1000, context=5):
+    """시드마다 backends[0] 을 기준으로 나머지 백엔드 지문 비교. 반환: [dict(seed, backend, ref, match, ...)]"""
+    out = []
+    for seed in seeds:
+        ref = run_fingerprint(cfg, seed, backends[0], tags, block)
+        for be in backends[1:]:
+            r = run_fingerprint(cfg, seed, be, tags, block)
+            row = dict(seed=seed, backend=be, ref=backends[0], match=r["fingerprint"] == ref["fingerprint"],
+                       fingerprint=r["fingerprint"], ref_fingerprint=ref["fingerprint"],
+                       events=r["events"], ref_events=ref["events"])
+            if not row["match"]:
+                row["divergence"] = first_divergence(cfg, seed, backends[0], be, ref, r, context, tags, block)
+            out.append(row)
+    return out
+
+def from_config(world, fp_cfg):
+    """cfg["fingerprint"] 로 EventFingerprint 설치(비활성화면 None)."""
+    if not fp_cfg or not fp_cfg.get("enable", False):
+        return None
+    return EventFingerprint(world, tags=fp_cfg.get("tags", ESSENTIAL_TAGS), block=fp_cfg.get("block", 1000)).install()
@@ -0,0 +1,253 @@
+"""
+flame.py
+========
+역할
+- Sim.run 벽시계 시간을 "노드 → 계층(app/mac/medium/channel/metrics) → 콜백" 스택에 귀속해
+  collapsed-stack 형식(speedscope / flamegraph.pl / inferno 입력)으로 쓴다.
+  평면 per-callback 프로파일과 달리 같은 콜백이라도 노드별로 갈라진다(예: N0 의 EVSE 응답 큐 vs EV 들).
+- 루트 프레임(이벤트): 이벤트 함수의 소유 객체로 노드/계층 결정
+  * 바운드 메서드 → __self__,  클로저/람다 → 자유변수 self (없으면 모듈 이름으로 계층만)
+  * HPGPMac → 노드=id, App15118 → 노드=mac.id, Medium/Beacon/PRS → "[medium]", on_tick 훅 → "[sim];hooks"
+- 중첩 프레임(선택, nested=True): 이벤트 안에서 불리는 주요 메서드를 인스턴스 속성으로 감싸 자식 프레임으로 분리
+  channel.per(채널 상태 전진), medium.request_tx_shared/prs.run(PRS 중재), mac.enqueue/_on_tx_done, metrics.on_tx/debug
+  → 예: N3;mac;HPGPMac._transmit_head.<locals>.end_tx;channel;GEChannel.per
+  다른 노드 객체로 들어가면 계층 이름에 노드를 붙인다(mac@N0: EV 콜백이 N0 큐에 응답을 넣는 경우).
+- 시간은 self-time(자식 구간 제외, ns)으로 누적 → 스택 합 = 프로파일 구간 벽시계.
+  이벤트 밖(힙 pop/루프) 시간은 "[sim];engine;loop", 루트 판정·스택 정리 비용은 "[sim];profiler;overhead".
+  시계 읽기 밖에 남는 enter/leave/_push 호출·반환 비용은 구간(두 프로파일러 호출 사이)마다 한 번씩 끼므로,
+  begin() 에서 빈 이벤트로 구간당 값을 재고(calibrate) end() 에서 스택별 구간 수만큼 빼 오버헤드로 옮긴다
+  (루프 몫 ≈ 프로파일 없는 실행의 루프 몫; 스택 합 = 벽시계는 유지).
+  결과(이벤트 순서/난수)는 바뀌지 않는다(지문 동일).
+
+구성
+- FlameProfiler(world, nested=True): attach() / detach() / stacks() → {"a;b;c": ns} / layer_totals()
+  write_collapsed(path, node_map=None)   # node_map(node)→이름: 예) EV 노드 묶기
+- ev_group(node): EV 노드를 "EV*" 하나로 묶는 node_map (N 이 클 때 루트 수 축소)
+- from_config(world, prof_cfg): cfg["profile"] = {"enable", "nested", "file", "group_evs"} → 부착된 프로파일러 또는 None
+"""
+
+import os, time, functools
+
+LAYER_OF_CLASS = {"App15118": "app", "HPGPMac": "mac", "Medium": "medium", "BeaconScheduler": "medium",
+                  "PRSManager": "medium", "GEChannel": "channel", "Metrics": "metrics"}
+
+# (월드에서 객체 꺼내기, 감쌀 메서드들)
+NESTED = ((lambda w: [w["channel"]], ("per",)),
+          (lambda w: [w["medium"]], ("request_tx_shared",)),
+          (lambda w: [w["medium"].prs] if getattr(w["medium"], "prs", None) else [], ("run",)),
+          (lambda w: list(w["macs"]), ("enqueue", "_on_tx_done")),
+          (lambda w: [w["metrics"]], ("on_tx", "debug")))
+
+LOOP = ("[sim]", "engine", "loop")      # 이벤트/훅 밖(힙 pop, 루프) 시간
+OVERHEAD = ("[sim]", "profiler", "overhead")
+
+def _node_layer(own, fn):
+    if own is None:
+        mod = (getattr(fn, "__module__", None) or "?").rsplit(".", 1)[-1]
+        return None, mod
+    layer = LAYER_OF_CLASS.get(type(own).__name__, type(own).__module__.rsplit(".", 1)[-1])
+    if layer == "mac":
+        return own.id, layer
+    if layer == "app":
+        return own.mac.id, layer
+    return None, layer
+
+def _noop():
+    pass
+
+def _name(fn):
+    return getattr(fn, "__qualname__", None) or type(fn).__name__
+
+class FlameProfiler:
+    def __init__(self, world, nested=True):
+        self.world = world
+        self.sim = world["sim"]
+        self.nested = bool(nested)
+        self.acc = {}                 # 스택 튜플 → self-time ns
+        self._stack = []              # 현재 열린 프레임 스택(튜플 조각들)
+        self._depth = []              # 각 enter 가 쌓은 조각 수
+        self._mark = 0
+        self._cache = {}              # (code/func, id(owner), hook) → 루트 프레임
+        self._selfidx = {}            # code → 자유변수 self 의 위치(-1: 없음)
+        self._wrapped = []            # [(obj, 메서드 이름)]
+        self.wall_ns = 0
+        self._t0 = None
+        self._nseg = {}               # 스택 튜플 → 이번 구간의 시간 조각 수(보정용)
+        self.leak_ns = 0.0            # 조각당 시계 밖 호출·반환 비용(calibrate)
+
+    # ---- 부착 ----
+    def attach(self):
+        self.sim.profiler = self
+        if self.nested and not self._wrapped:
+            for get, names in NESTED:
+                for obj in get(self.world):
+                    for nm in names:
+                        self._wrap(obj, nm)
+        return self
+
+    def detach(self):
+        if self.sim.profiler is self:
+            self.sim.profiler = None
+        for obj, nm in self._wrapped:
+            try:
+                delattr(obj, nm)          # 인스턴스 속성 제거 → 클래스 메서드로 복귀
+            except AttributeError:
+                pass
+        self._wrapped = []
+
+    def _wrap(self, obj, nm):
+        bound = getattr(obj, nm, None)
+        if bound is None:
+            return
+        node, layer = _node_layer(obj, bound)
+        name = _name(bound)
+        prof = self
+        def wrapper(*a, **kw):
+            prof._push(layer, node, name)
+            try:
+                return bound(*a, **kw)
+            finally:
+                prof.leave()
+        setattr(obj, nm, wrapper)
+        self._wrapped.append((obj, nm))
+
+    def _root(self, fn, hook):
+        """이벤트/훅 함수 → 루트 프레임 (노드, 계층, 콜백). (코드, 소유 객체) 별 캐시."""
+        f = fn
+        while isinstance(f, functools.partial):
+            f = f.func
+        own = getattr(f, "__self__", None)
+        if own is not None:
+            key = (getattr(f, "__func__", f), id(own), hook)
+        else:
+            code = getattr(f, "__code__", None)
+            idx = self._selfidx.get(code)
+            if idx is None:
+                fv = getattr(code, "co_freevars", ())
+                idx = self._selfidx[code] = fv.index("self") if "self" in fv else -1
+            if idx >= 0:
+                try:
+                    own = f.__closure__[idx].cell_contents
+                except ValueError:
+                    own = None
+            key = (code if code is not None else f, id(own), hook)
+        root = self._cache.get(key)
+        if root is None:
+            node, layer = _node_layer(own, f)
+            if hook:
+                root = ("[sim]", "hooks", f"{layer}:{_name(f)}")
+            elif node is None:
+                root = ("[medium]" if layer in ("medium", "channel") else f"[{layer}]", layer, _name(f))
+            else:
+                root = (node, layer, _name(f))
+            self._cache[key] = root
+        return root
+
+    def calibrate(self, k=2000):
+        """빈 이벤트 k 개를 enter/leave 로 감싸 돌려, 시계 읽기 밖에서 조각(루프/이벤트)마다 새는 비용(ns)을 잰다."""
+        saved = self.acc, self._stack, self._depth
+        bare = time.perf_counter_ns()
+        for _ in range(k):
+            _noop()
+        bare = time.perf_counter_ns() - bare           # 감싸지 않은 루프+호출 비용(실제 몫이므로 빼지 않음)
+        self.acc, self._stack, self._depth = {}, [], []
+        self._mark = time.perf_counter_ns()
+        for _ in range(k):
+            self.enter_event(_noop)
+            _noop()
+            self.leave()
+        self._flush(time.perf_counter_ns(), LOOP)
+        leak = sum(ns for key, ns in self.acc.items() if key != OVERHEAD) - bare
+        self.leak_ns = max(0.0, leak / (2 * k))         # 빈 이벤트당 루프 조각 1 + 이벤트 조각 1
+        self.acc, self._stack, self._depth = saved
+        return self.leak_ns
+
+    # ---- Sim.run 이 부르는 구간 API ----
+    def begin(self):
+        if not self.leak_ns:
+            self.calibrate()
+        self._t0 = self._mark = time.perf_counter_ns()
+        self._stack, self._depth = [], []
+        self._nseg = {}
+
+    def end(self):
+        now = time.perf_counter_ns()
+        self._flush(now, LOOP)
+        self._stack, self._depth = [], []
+        self.wall_ns += now - self._t0
+        # 조각 수 × 보정값을 각 스택 → 오버헤드로 이동(합 = 벽시계 유지)
+        for key, n in self._nseg.items():
+            mv = min(self.acc.get(key, 0), int(n * self.leak_ns))
+            if mv > 0:
+                self.acc[key] -= mv
+                self.acc[OVERHEAD] = self.acc.get(OVERHEAD, 0) + mv
+        self._nseg = {}
+
+    def enter_event(self, fn, hook=False):
+        self._flush(time.perf_counter_ns(), LOOP)
+        root = self._root(fn, hook)
+        self._stack.extend(root)
+        self._depth.append(len(root))
+        self._flush(time.perf_counter_ns(), OVERHEAD)     # 루트 판정 비용은 따로(루프 시간 부풀림 방지)
+
+    def _push(self, layer, node, name):
+        self._flush(time.perf_counter_ns(), tuple(self._stack) if self._stack else LOOP)
+        # 루트와 같은 노드면 계층만, 다른 노드 객체면 계층@노드
+        lab = layer if node is None or (self._stack and node == self._stack[0]) else f"{layer}@{node}"
+        self._stack.extend((lab, name))
+        self._depth.append(2)
+        self._flush(time.perf_counter_ns(), OVERHEAD)
+
+    def leave(self):
+        self._flush(time.perf_counter_ns(), tuple(self._stack))
+        for _ in range(self._depth.pop() if self._depth else 0):
+            self._stack.pop()
+        self._flush(time.perf_counter_ns(), OVERHEAD)     # 스택 정리 비용도 루프/부모가 아닌 오버헤드로
+
+    def _flush(self, now, key):
+        dt = now - self._mark
+        if dt > 0 and key:
+            self.acc[key] = self.acc.get(key, 0) + dt
+            if key is not OVERHEAD:
+                self._nseg[key] = self._nseg.get(key, 0) + 1
+        self._mark = now
+
+    # ---- 결과 ----
+    def stacks(self, node_map=None):
+        out = {}
+        for key, ns in self.acc.items():
+            if node_map is not None and not key[0].startswith("["):
+                key = (node_map(key[0]),) + key[1:]
+            s = ";".join(k.replace(";", ":").replace(" ", "_") for k in key)
+            out[s] = out.get(s, 0) + ns
+        return out
+
+    def layer_totals(self):
+        """계층별 self-time 합(ns): 스택의 가장 깊은 계층 프레임 기준(중첩 프레임이 부모 계층에서 빠진다)."""
+        tot = {}
+        for key, ns in self.acc.items():
+            layer = key[1]
+            for part in key[3:]:
+                base = part.split("@", 1)[0]
+                if base in ("app", "mac", "medium", "channel", "metrics"):
+                    layer = base
+            tot[layer] = tot.get(layer, 0) + ns
+        return dict(sorted(tot.items(), key=lambda kv: -kv[1]))
+
+    def write_collapsed(self, path, node_map=None):
+        """한 줄에 "frame;frame;frame <ns>" (self-time 나노초) — speedscope / flamegraph.pl 입력."""
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            for s, ns in sorted(self.stacks(node_map).items()):
+                f.write(f"{s} {ns}\n")
+        return path
+
+def ev_group(node):
+    """node_map 예: EVSE(N0/EVSE)는 그대로, EV 노드들은 "EV*" 하나로."""
+    return node if node in ("N0", "EVSE") else "EV*"
+
+def from_config(world, prof_cfg):
+    """cfg["profile"] 로 FlameProfiler 부착(비활성화면 None)."""
+    if not prof_cfg or not prof_cfg.get("enable", False):
+        return None
+    return FlameProfiler(world, nested=prof_cfg.get("nested", True)).attach()
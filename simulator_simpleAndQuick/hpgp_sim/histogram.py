@@ -0,0 +1,101 @@
+"""
+histogram.py
+============
+역할
+- HDR 히스토그램 방식의 로그 버킷 히스토그램(지연 분포용). 값(us, 정수)을 상대오차 2^-sig_bits 이내 버킷에 카운트한다.
+  * v < 2·2^sig 는 정확(버킷 폭 1), 그 위로는 2의 거듭제곱 구간마다 2^sig 개 하위 버킷
+  * 버킷 수 상한 = (64 - sig)·2^sig → 표본 수와 무관한 고정 메모리(사용한 버킷만 dict 로 보관)
+- 같은 sig_bits 끼리 merge() 로 합칠 수 있고 to_dict()/from_dict() 로 직렬화(JSON/피클) → 반복·워커·버스 간 병합.
+
+구성
+- LogHistogram(sig_bits=5): add(v, n=1), merge(other), quantile(q), quantiles(prefix), to_dict(), from_dict(d)
+- merge_all(hists): 여러 히스토그램(또는 직렬화 dict) 병합본
+- QUANTILES: 보고 분위수 (이름 접미사, q) — p50/p95/p99/p999
+"""
+
+QUANTILES = (("p50", 0.50), ("p95", 0.95), ("p99", 0.99), ("p999", 0.999))
+
+class LogHistogram:
+    __slots__ = ("sig", "sub", "counts", "n", "total", "vmin", "vmax")
+
+    def __init__(self, sig_bits=5):
+        self.sig = int(sig_bits)
+        self.sub = 1 << self.sig
+        self.counts = {}
+        self.n = 0
+        self.total = 0
+        self.vmin = None
+        self.vmax = 0
+
+    def _index(self, v):
+        if v < 2 * self.sub:
+            return v
+        e = v.bit_length() - self.sig - 1
+        return e * self.sub + (v >> e)
+
+    def _value(self, idx):
+        """버킷 대표값(구간 중앙)."""
+        if idx < 2 * self.sub:
+            return idx
+        e = idx // self.sub - 1
+        m = idx - e * self.sub
+        return ((m << e) + ((m + 1) << e) - 1) // 2
+
+    def add(self, v, n=1):
+        v = max(0, int(v))
+        i = self._index(v)
+        self.counts[i] = self.counts.get(i, 0) + n
+        self.n += n
+        self.total += v * n
+        self.vmin = v if self.vmin is None or v < self.vmin else self.vmin
+        if v > self.vmax:
+            self.vmax = v
+
+    def merge(self, other):
+        if isinstance(other, dict):
+            other = LogHistogram.from_dict(other)
+        if other.sig != self.sig:
+            raise ValueError("cannot merge histograms with different sig_bits")
+        for i, c in other.counts.items():
+            self.counts[i] = self.counts.get(i, 0) + c
+        self.n += other.n
+        self.total += other.total
+        if other.vmin is not None:
+            self.vmin = other.vmin if self.vmin is None else min(self.vmin, other.vmin)
+        self.vmax = max(self.vmax, other.vmax)
+        return self
+
+    def quantile(self, q):
+        if self.n == 0:
+            return 0
+        k = q * self.n
+        c = 0
+        for i in sorted(self.counts):
+            c += self.counts[i]
+            if c >= k:
+                return min(self.vmax, max(self.vmin, self._value(i)))
+        return self.vmax
+
+    def mean(self):
+        return self.total / self.n if self.n else 0.0
+
+    def quantiles(self, prefix):
+        """{prefix_p50_us: .., ..., prefix_p999_us: ..} (빈 히스토그램이면 0)."""
+        return {f"{prefix}_{name}_us": self.quantile(q) for name, q in QUANTILES}
+
+    def to_dict(self):
+        return dict(sig=self.sig, n=self.n, total=self.total, min=self.vmin, max=self.vmax,
+                    counts={str(i): c for i, c in self.counts.items()})
+
+    @classmethod
+    def from_dict(cls, d):
+        h = cls(d.get("sig", 5))
+        h.counts = {int(i): int(c) for i, c in d.get("counts", {}).items()}
+        h.n, h.total, h.vmin, h.vmax = int(d["n"]), int(d["total"]), d.get("min"), int(d.get("max", 0))
+        return h
+
+def merge_all(hists, sig_bits=5):
+    out = LogHistogram(sig_bits)
+    for h in hists:
+        out.merge(h)
+    return out
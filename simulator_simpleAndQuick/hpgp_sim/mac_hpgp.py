@@ -41,6 +41,32 @@ class Frame:
     on_success: Optional[Callable[[], None]] = None
     on_drop: Optional[Callable[[], None]] = None
 
+# ---- CW/DC 테이블 규칙 (이벤트 엔진 HPGPMac 과 벡터 엔진 vector_mac 이 공유) ----
+def cw_value(params:dict, cap:str, bpc:int) -> int:
+    """
+    CAP별 CW 테이블에서 BPC 단계의 CW를 선택.
+    - 테이블 길이를 넘어서는 BPC는 마지막 원소를 사용(>=마지막 단계 버킷).
+    - 테이블 미지정 시 일반화 CW(802.11식 근사): W0 * 2^BPC, 상한 CWmax
+      (HPGP와 완전 동일하진 않음. 연구 편의용 백업 경로)
+    """
+    tbl = params.get("cw_table", None)
+    arr = tbl.get(cap, None) if tbl else None
+    if arr:
+        return int(arr[min(bpc, len(arr)-1)])
+    W0 = int(params.get("W0", 16))
+    CWmax = int(params.get("CWmax", 1024))
+    return min(W0 * (2 ** bpc), CWmax)
+
+def dc_init_value(params:dict, bpc:int) -> int:
+    """BPC 단계별 DC 초기값. 테이블 길이를 넘으면 마지막 값을 사용."""
+    arr = params.get("dc_init_per_bpc", None) or [0,1,3,15]
+    idx = min(max(bpc, 0), len(arr)-1)
+    return int(arr[idx])
+
+def bpc_limit(params:dict) -> int:
+    """최대 BPC 단계 인덱스(0 기반). max_bpc=4이면 0..3."""
+    return max(0, int(params.get("max_bpc", 4)) - 1)
+
 class HPGPMac:
     def __init__(self, sim:Sim, medium:Medium, channel:GEChannel, node_id:str, params:dict, metrics):
         self.sim, self.medium, self.ch = sim, medium, channel
@@ -92,45 +118,17 @@ class HPGPMac:
         tbl = self.p.get("ifs_us", {"CAP0":0,"CAP1":0,"CAP2":0,"CAP3":0})
         return int(tbl.get(self.head_prio().name, 0))
 
-    def _cw_from_table(self) -> int:
-        """
-        CAP별 CW 테이블에서 현재 BPC에 해당하는 CW를 선택.
-        - 테이블 길이를 넘어서는 BPC는 마지막 원소를 사용(>=마지막 단계 버킷).
-        - 테이블이 없으면 None 반환.
-        """
-        if not self.cw_table:
-            return None
-        prio = self.head_prio().name  # "CAP0".."CAP3"
-        arr = self.cw_table.get(prio, None)
-        if not arr:
-            return None
-        idx = min(self.BPC, len(arr)-1)
-        return int(arr[idx])
-
-    def _cw_fallback(self) -> int:
-        """
-        테이블 미지정 시의 일반화 CW (802.11식 근사): W0 * 2^BPC, 상한 CWmax
-        - HPGP와 완전 동일하진 않음. 연구 편의용 백업 경로.
-        """
-        W0 = int(self.p.get("W0", 16))
-        CWmax = int(self.p.get("CWmax", 1024))
-        cw = W0 * (2 ** self.BPC)
-        return min(cw, CWmax)
-
     def CW(self) -> int:
         """현재 사용 CW 크기 산출(테이블 우선, 없으면 폴백)."""
-        cw = self._cw_from_table()
-        return cw if cw is not None else self._cw_fallback()
+        return cw_value(self.p, self.head_prio().name, self.BPC)
 
     def _dc_init_value(self, bpc:int) -> int:
         """BPC 단계별 DC 초기값을 반환. 테이블 길이를 넘으면 마지막 값을 사용."""
-        arr = self.dc_init_table or [0,1,3,15]
-        idx = min(max(bpc, 0), len(arr)-1)
-        return int(arr[idx])
+        return dc_init_value(self.p, bpc)
 
     def _cap_bpc_limit(self) -> int:
         """최대 BPC 단계 인덱스(0 기반). max_bpc=4이면 0..3."""
-        return max(0, int(self.p.get("max_bpc", 4)) - 1)
+        return bpc_limit(self.p)
 
     # ---- 외부 API ----
     def enqueue(self, fr:Frame):
@@ -164,7 +162,8 @@ class HPGPMac:
             self.sim.at(self.slot_time(), self._tick)
             return
 
-        # 3) 유휴면 BC 샘플/카운트다운
+        # 3) 유휴면 BC 샘플/카운트다운 (큐가 있는 유휴 슬롯 = 백오프 슬롯 1개)
+        self.metrics.on_backoff_slot()
         if self.BC == 0:
             self.BC = int(self.sim.rng.randrange(0, self.CW()))
         if self.BC > 0:
@@ -207,6 +206,7 @@ class HPGPMac:
                         # 충돌 airtime은 1회만 회계
                         if getattr(self.metrics, 'add_collision_time', None):
                             self.metrics.add_collision_time(air_time)
+                            self.metrics.on_collision(len(cands))
                         def end_coll():
                             self.medium.end_tx()
                             for (m, fr, a) in cands:
@@ -241,6 +241,7 @@ class HPGPMac:
                         return
                     if getattr(self.metrics, 'add_collision_time', None):
                         self.metrics.add_collision_time(air_time)
+                        self.metrics.on_collision(len(cands))
                     def end_coll():
                         self.medium.end_tx()
                         for (m, fr, a) in cands:
@@ -273,7 +274,7 @@ class HPGPMac:
         def end_tx():
             self.medium.end_tx()
             # 채널 PER 평가(프레임 오류)
-            per = self.ch.per(self.last_per_t, self.sim.rng)
+            per = self.ch.per(self.last_per_t, self.sim.rng, start_us=start_t)
             self.last_per_t = self.sim.now()
             success = (self.sim.rng.random() > per)
             self._on_tx_done(success, f, start_t, air_time)
@@ -10,6 +10,7 @@ medium.py
 - Medium: 매체 상태, 구독 MAC 목록, 승자 결정(request_tx_shared)
 - BeaconScheduler: 주기적 비콘으로 매체 점유(제어 오버헤드로 기록)
 - PRSManager: PRS 심볼 시간만큼 매체 점유 후 승자 결정
+  (outcome_listeners: fn(t_us, contenders, winner_mac|None, losers) — 경합 텔레메트리용 관찰자)
 """
 
 from typing import List, Tuple, Optional
@@ -23,6 +24,7 @@ class Medium:
         self.last_end_t = 0                # 마지막 전송 종료 시각(us)
         self.listeners: List = []          # 등록된 MAC 객체들
         self.metrics = None                # Metrics 핸들(선택)
+        self.tx_listeners: List = []       # start_tx 알림 fn(owner_id, t_us, duration_us) (크로스토크 결합용)
 
         # Stage-2 구성요소(심볼릭; sim.py에서 주입)
         self.beacon = None                 # BeaconScheduler
@@ -43,6 +45,8 @@ class Medium:
             raise RuntimeError("Medium busy")
         self.tx_owner = owner_id
         self.ongoing.append((owner_id, self.sim.now(), int(duration_us)))
+        for fn in self.tx_listeners:
+            fn(owner_id, self.sim.now(), int(duration_us))
 
     def end_tx(self):
         """매체 점유 종료."""
@@ -126,6 +130,7 @@ class PRSManager:
         self.prs_symbols = int(prs_symbols)
         self.symbol_us = int(symbol_us)
         self.in_progress = False
+        self.outcome_listeners = []        # PRS 결과 관찰자(승자 None = 동순위 충돌)
 
     def run(self, contenders, choose_fn):
         """
@@ -150,6 +155,8 @@ class PRSManager:
             self.in_progress = False
             # 승자/패자 판정
             winner, losers = self.medium.request_tx_shared(contenders)
+            for fn in self.outcome_listeners:
+                fn(self.sim.now(), contenders, winner, losers)
             choose_fn(winner, losers)
 
         self.sim.at(duration, end_prs)
@@ -0,0 +1,155 @@
+"""
+memguard.py
+===========
+역할
+- 실행별 메모리 회계와 가드레일. 스윕 장비 용량 계획을 데이터로 하기 위해 summary.csv 에 열을 추가한다
+  (build_and_run 은 cfg["memory"] 가 있을 때만 아래 열 전체, 없으면 peak_rss_mb 만).
+  * peak_rss_mb  : 실행 중 최대 RSS(VmHWM; build_and_run 시작 때 reset_peak_rss 로 고수위 초기화 → 풀 워커도 실행별),
+                   rss_end_mb: 종료 시 RSS
+  * 구조 카운트 최대값(check_s 마다 표본): heap_events_peak(이벤트 힙 길이), mac_queue_peak(전체 MAC 큐 프레임),
+    metrics_rows_peak(tx_rows + debug_rows)
+  * (선택) tracemalloc 하위시스템별 MB: 할당 위치 파일로 분류
+      heap=utils.py(Event), mac=mac_hpgp/medium/channel(큐·PRS 클로저), metrics=metrics/histogram(행·스케치),
+      app=app_15118(프레임·앱 클로저), other
+- 소프트 한도: RSS(soft_rss_mb) 또는 저장 행 수(soft_rows)를 넘으면 OOM 대신 트레이스 레벨을 한 단계씩 낮춘다
+  FULL/EVENTS → SUMMARY(프레임·비집계 행 폐기) → OFF(모든 행 폐기). 요약 지표(카운터/세션/스케치)는 영향 없음.
+
+설정(cfg["memory"])
+- check_s(기본 1.0), soft_rss_mb(None), soft_rows(None), tracemalloc(false)
+  한도/ tracemalloc 이 없으면 훅을 달지 않고 종료 시 1회만 측정(기본 실행 비용 0).
+
+구성
+- rss_mb(), peak_rss_mb(), reset_peak_rss(): /proc/self/clear_refs 에 5 → 고수위 초기화(불가하면 False)
+- start_tracemalloc(mem_cfg): build() 전에 호출(월드 할당까지 추적) → 이 호출이 시작했는지 여부
+- MemoryGuard(world, mem_cfg, owns_tracemalloc): install() / report() → summary 에 합칠 dict / close()
+"""
+
+import os, resource, tracemalloc
+
+from .metrics import TRACE_LEVELS, ESSENTIAL_TAGS
+
+SUBSYSTEMS = (("heap", ("utils.py",)), ("mac", ("mac_hpgp.py", "medium.py", "channel.py")),
+              ("metrics", ("metrics.py", "histogram.py")), ("app", ("app_15118.py",)))
+
+def rss_mb():
+    """현재 RSS(MB). /proc 이 없으면 최대 RSS 로 대체."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError, IndexError):
+        return peak_rss_mb()
+
+def peak_rss_mb():
+    """프로세스 최대 RSS(MB). /proc VmHWM 우선(exec 시 초기화), 없으면 ru_maxrss(KB; fork/exec 부모 고수위 승계)."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def reset_peak_rss():
+    """VmHWM 을 현재 RSS 로 초기화(Linux ≥ 4.0). 성공 여부 반환."""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+def start_tracemalloc(mem_cfg):
+    if (mem_cfg or {}).get("tracemalloc", False) and not tracemalloc.is_tracing():
+        tracemalloc.start()
+        return True
+    return False
+
+def _subsystem(filename):
+    base = os.path.basename(filename)
+    for name, files in SUBSYSTEMS:
+        if base in files:
+            return name
+    return "other"
+
+class MemoryGuard:
+    def __init__(self, world, mem_cfg=None, owns_tracemalloc=False):
+        mem_cfg = mem_cfg or {}
+        self.world = world
+        self.sim, self.metrics = world["sim"], world["metrics"]
+        self.check_us = max(1, int(float(mem_cfg.get("check_s", 1.0)) * 1e6))
+        self.soft_rss_mb = mem_cfg.get("soft_rss_mb", None)
+        self.soft_rows = mem_cfg.get("soft_rows", None)
+        self.use_tm = bool(mem_cfg.get("tracemalloc", False))
+        self.peak = dict(heap_events=0, mac_queue=0, metrics_rows=0)
+        self.downgrades = []            # [(t_us, 새 레벨, 사유)]
+        self._next_us = self.check_us
+        self._tm_started = bool(owns_tracemalloc)
+        self._installed = False
+
+    def install(self):
+        if (self.soft_rss_mb is not None or self.soft_rows is not None or self.use_tm) and not self._installed:
+            self.sim.hooks["on_tick"].append(self._on_tick)
+            self._installed = True
+        return self
+
+    def _counts(self):
+        m = self.metrics
+        c = dict(heap_events=len(self.sim.q), mac_queue=sum(len(x.tx_queue) for x in self.world["macs"]),
+                 metrics_rows=len(m.tx_rows) + len(m.debug_rows))
+        for k, v in c.items():
+            if v > self.peak[k]:
+                self.peak[k] = v
+        return c
+
+    def _on_tick(self, sim):
+        if sim.t < self._next_us:
+            return
+        self._next_us = sim.t + self.check_us
+        c = self._counts()
+        if self.soft_rows is not None and c["metrics_rows"] > int(self.soft_rows):
+            self._downgrade(f"rows>{self.soft_rows}")
+        elif self.soft_rss_mb is not None and rss_mb() > float(self.soft_rss_mb):
+            self._downgrade(f"rss>{self.soft_rss_mb}MB")
+
+    def _downgrade(self, reason):
+        """트레이스 레벨 한 단계 하향 + 더는 유지하지 않는 행 폐기."""
+        m = self.metrics
+        if m.trace_level > TRACE_LEVELS["SUMMARY"]:
+            m.set_trace("SUMMARY", m.trace_tags, m.trace_k)
+            m.tx_rows = []
+            m.debug_rows = [r for r in m.debug_rows if r[1] in ESSENTIAL_TAGS]
+        elif m.trace_level > TRACE_LEVELS["OFF"]:
+            m.set_trace("OFF")
+            m.debug_rows = []
+        else:
+            return
+        lv = next(k for k, v in TRACE_LEVELS.items() if v == m.trace_level)
+        self.downgrades.append((self.sim.now(), lv, reason))
+        if m.tracing("MEM_DOWNGRADE"):
+            m.debug("MEM_DOWNGRADE", level=lv, reason=reason)
+
+    def report(self):
+        """summary 에 합칠 메모리 열(dict)."""
+        self._counts()
+        lv = next(k for k, v in TRACE_LEVELS.items() if v == self.metrics.trace_level)
+        out = dict(peak_rss_mb=round(peak_rss_mb(), 1), rss_end_mb=round(rss_mb(), 1),
+                   heap_events_peak=self.peak["heap_events"], mac_queue_peak=self.peak["mac_queue"],
+                   metrics_rows_peak=self.peak["metrics_rows"], trace_level=lv, mem_downgrades=len(self.downgrades),
+                   mem_downgrade_t_s=(round(self.downgrades[0][0] / 1e6, 3) if self.downgrades else None))
+        if self.use_tm and tracemalloc.is_tracing():
+            by = {name: 0 for name, _ in SUBSYSTEMS}
+            by["other"] = 0
+            for st in tracemalloc.take_snapshot().statistics("filename"):
+                by[_subsystem(st.traceback[0].filename)] += st.size
+            out.update({f"tm_{k}_mb": round(v / 2**20, 3) for k, v in by.items()})
+            out["tm_peak_mb"] = round(tracemalloc.get_traced_memory()[1] / 2**20, 3)
+        return out
+
+    def close(self):
+        if self._installed:
+            self.sim.hooks["on_tick"].remove(self._on_tick)
+            self._installed = False
+        if self._tm_started:
+            tracemalloc.stop()
+            self._tm_started = False
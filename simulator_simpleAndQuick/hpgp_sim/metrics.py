@@ -4,15 +4,37 @@ metrics.py
 - 기본 TX/충돌/제어/유휴 회계
 - debug(tag, **kv) 로 모든 SLAC/DC 이벤트를 기록 (CSV로 덤프)
 - write_plots(): 효율/시간, (필요시) 다른 PNG 생성
+- 접근 지연 히스토그램(histogram.LogHistogram): enqueue→성공 / enqueue→드롭, (노드, CAP)별 고정 메모리
+  → summary()/node_summary.csv 에 p50/p95/p99/p99.9, delay_histograms() 로 직렬화(반복/워커 간 병합)
+- DC 왕복 지연(DC_RSP 의 rtt_us: Req 생성 → Rsp MAC 전달)도 같은 구조의 ("dc_rtt", EV 노드, CAP0) 스케치로 누적
+  * 타임아웃된 Req 는 마감값(due_us - req_us)으로 우측 중도절단(censored) 기록, 늦은 Rsp 는 중복 기록하지 않음
+    → 분위수가 마감값이면 '마감 이상'을 뜻한다. 절단 비율은 summary 의 dc_rtt_censored_ratio
+- 트레이스 레벨(set_trace): 행(row) 저장만 줄이고 카운터/세션/스케치 집계는 모든 레벨에서 동일
+  * OFF     : 행 저장 없음(summary/CSV 요약만)
+  * SUMMARY : 집계용 태그(ESSENTIAL_TAGS) 행만 → dc_cycles/dc_timeline/sessions 산출 가능
+  * EVENTS  : + 나머지 debug 태그 행(tags 목록으로 제한 가능, 1-in-k 표본)
+  * FULL    : + 프레임별 tx_rows(tx_log.csv, 효율 PNG, SLAC 타임라인) — 기본값
+  호출측은 비집계 태그에 대해 `if metrics.tracing(tag): metrics.debug(tag, ...)` 로 kwargs 생성 전에 거른다.
 """
 
 import os, csv, math
 
+from .histogram import LogHistogram, merge_all, QUANTILES
+
 # Headless matplotlib
 import matplotlib
 matplotlib.use("Agg")
 import matplotlib.pyplot as plt
 
+SERIES_KEYS = ("succ", "coll", "ctrl", "bits", "drops", "dc_req", "dc_to", "dc_rsp", "dc_lat", "dc_gap",
+               "bo", "tx", "coll_tx")
+# 지연 스케치 분위수 키(전체 실행 누적이라 bin 으로 자를 수 없음 → steady_summary 에서 제외)
+DELAY_KEY_PREFIXES = ("access_delay_", "drop_delay_", "dc_rtt_")
+
+TRACE_LEVELS = {"OFF": 0, "SUMMARY": 1, "EVENTS": 2, "FULL": 3}
+# 세션 추적/DC 카운터를 구동하는 태그: 레벨과 무관하게 debug() 가 항상 처리(행 저장은 SUMMARY 이상)
+ESSENTIAL_TAGS = frozenset(("SLAC_SEQ_START", "SLAC_DONE", "DC_START", "DC_REQ", "DC_TIMEOUT", "DC_RSP"))
+
 class Metrics:
     def __init__(self, sim, out_dir):
         self.sim = sim
@@ -29,8 +51,16 @@ class Metrics:
         self.drops = 0
         self.timeouts = 0
 
+        # 관측 접근/충돌 확률(해석 모델 대조·제어변량용)
+        # bo_slots: 큐가 있는 노드의 유휴 백오프 슬롯 수, coll_tx: 충돌로 실패한 송신 수
+        self.bo_slots = 0
+        self.coll_tx = 0
+
         self.per_node = {}
 
+        # (kind, node, CAP) → LogHistogram, kind ∈ {"succ", "drop", "dc_rtt"}
+        self.delay_hist = {}
+
         self.tx_rows = []        # [start_us, end_us, node, prio, bits, kind, success]
         self.debug_rows = []     # [t_us, tag, kv]
         # (이 버전에선 per-frame deadline 미사용; 세션/주기 타임아웃은 debug로 기록)
@@ -40,38 +70,126 @@ class Metrics:
         self.sessions_active = {}
         self.sessions_log = []
 
+        # DC 루프 집계(DC_REQ/DC_TIMEOUT debug 태그에서 카운트)
+        self.dc_req = 0
+        self.dc_timeouts = 0
+        self.dc_gap_violations = 0
+        self.dc_started = set()  # DC_START를 보고한 노드 집합(스냅샷 시점 판단용)
+        self.window_t0 = 0       # 측정 구간 시작(reset_window): 이전 Req 의 타임아웃/응답은 세지 않는다
+
+        # 외부 관찰자(희귀사건 추적 등): fn(frame, success, start_us, end_us, node) / fn(t_us, tag, kv)
+        self.tx_listeners = []
+        self.debug_listeners = []
+
+        # 시간 구간(bin)별 누적 시계열: 워밍업 탐지/정상상태 통계용(bin 당 상수 메모리)
+        self.bin_us = 100_000
+        self.series = {k: [] for k in SERIES_KEYS}
+
+        # 트레이스 레벨/태그 필터/표본(set_trace)
+        self.set_trace("FULL")
+
     # ---- 외부에서 세션 타임아웃(us) 설정 가능 ----
     def set_session_timeout_us(self, us):
         self.tt_session_us = int(us)
 
+    def set_trace(self, level="FULL", tags=None, sample_k=1):
+        """
+        level: OFF/SUMMARY/EVENTS/FULL (또는 0..3), tags: EVENTS 이상에서 저장할 비집계 태그 목록(None=전체),
+        sample_k: 비집계 태그 행과 tx_rows 를 태그별 1-in-k 로 저장(카운터 기반 → 난수/결과 불변).
+        """
+        lv = TRACE_LEVELS[level.upper()] if isinstance(level, str) else int(level)
+        self.trace_level = lv
+        self.trace_tags = None if tags is None else frozenset(tags)
+        self.trace_k = max(1, int(sample_k))
+        self._trace_n = {}
+        self._keep_ess = lv >= TRACE_LEVELS["SUMMARY"]
+        self._keep_ev = lv >= TRACE_LEVELS["EVENTS"]
+        self._keep_tx = lv >= TRACE_LEVELS["FULL"]
+
+    def tracing(self, tag):
+        """이 태그로 debug() 를 부를 가치가 있는가(집계 태그, 저장 대상, 관찰자 존재)."""
+        return (tag in ESSENTIAL_TAGS or bool(self.debug_listeners)
+                or (self._keep_ev and (self.trace_tags is None or tag in self.trace_tags)))
+
+    def _sampled(self, key):
+        if self.trace_k == 1:
+            return True
+        c = self._trace_n.get(key, 0)
+        self._trace_n[key] = c + 1
+        return c % self.trace_k == 0
+
+    def set_bin_us(self, us):
+        """시계열 bin 폭(us) 설정. 기록 시작 전에 호출."""
+        self.bin_us = max(1, int(us))
+
+    def _sbin(self, t_us):
+        """t_us가 속한 bin 인덱스(필요 시 시계열 확장)."""
+        k = int(t_us) // self.bin_us
+        ser = self.series
+        if k >= len(ser["succ"]):
+            grow = k + 1 - len(ser["succ"])
+            for key in SERIES_KEYS:
+                ser[key].extend([0] * grow)
+        return k
+
     def _node_get(self, node):
         if node not in self.per_node:
             self.per_node[node] = dict(tx_ok=0, tx_err=0, bits_ok=0, drops=0)
         return self.per_node[node]
 
+    def _hist_add(self, key, v):
+        h = self.delay_hist.get(key)
+        if h is None:
+            h = self.delay_hist[key] = LogHistogram()
+        h.add(v)
+
+    def _delay(self, kind, node, frame, t_us):
+        self._hist_add((kind, node, getattr(frame.prio, "name", str(frame.prio))), t_us - frame.born_t)
+
     def on_tx(self, frame, success, start_us, end_us, node, medium):
         air = max(0, end_us - start_us)
+        k = self._sbin(start_us)
+        self.series["tx"][k] += 1
         if success:
+            self._delay("succ", node, frame, end_us)
             self.t_success += air
             self.tx_ok += 1
             n = self._node_get(node)
             n["tx_ok"] += 1
             n["bits_ok"] += frame.bits
+            self.series["succ"][k] += air
+            self.series["bits"][k] += frame.bits
         else:
             self.t_collision += air
+            self.series["coll"][k] += air
             self.tx_err += 1
             n = self._node_get(node)
             n["tx_err"] += 1
 
-        self.tx_rows.append([start_us, end_us, node, getattr(frame.prio, "name", str(frame.prio)),
-                             frame.bits, getattr(frame, "kind", "DATA"), int(success)])
+        if self._keep_tx and self._sampled(None):
+            self.tx_rows.append([start_us, end_us, node, getattr(frame.prio, "name", str(frame.prio)),
+                                 frame.bits, getattr(frame, "kind", "DATA"), int(success)])
+        for fn in self.tx_listeners:
+            fn(frame, success, start_us, end_us, node)
 
     def on_drop(self, node, frame, attempts):
         self.drops += 1
+        self.series["drops"][self._sbin(self.sim.now())] += 1
+        self._delay("drop", node, frame, self.sim.now())
         self._node_get(node)["drops"] += 1
 
+    def on_backoff_slot(self):
+        self.bo_slots += 1
+        self.series["bo"][self._sbin(self.sim.now())] += 1
+
+    def on_collision(self, n_tx):
+        """동시 송신 n_tx 개가 충돌(각각 on_tx(success=False)로도 기록됨)."""
+        self.coll_tx += int(n_tx)
+        self.series["coll_tx"][self._sbin(self.sim.now())] += int(n_tx)
+
     def add_collision_time(self, us):
         self.t_collision += max(0, int(us))
+        self.series["coll"][self._sbin(self.sim.now())] += max(0, int(us))
 
     # PRS/BEACON에서 ("PRS", duration) 형태로 호출하는 케이스를 허용
     def add_control_time(self, *args):
@@ -83,13 +201,22 @@ class Metrics:
         except Exception:
             return
         self.t_control += max(0, us)
+        self.series["ctrl"][self._sbin(self.sim.now())] += max(0, us)
 
     def add_idle_time(self, us):
         self.t_idle += max(0, int(us))
 
     def debug(self, tag, **kv):
         t = self.sim.now()
-        self.debug_rows.append([t, tag, dict(kv)])
+        if tag in ESSENTIAL_TAGS:
+            keep = self._keep_ess
+        else:
+            keep = (self._keep_ev and (self.trace_tags is None or tag in self.trace_tags)
+                    and self._sampled(tag))
+        if keep:
+            self.debug_rows.append([t, tag, kv])
+        for fn in self.debug_listeners:
+            fn(t, tag, kv)
 
         # SLAC 세션 추적 (선택)
         if tag == "SLAC_SEQ_START":
@@ -110,7 +237,54 @@ class Metrics:
             else:
                 self.sessions_log.append(dict(node=node, start_us=t, end_us=t, duration_us=0, ok=ok, timeout=0))
 
-    def summary(self, sim_time_us):
+        # DC 루프 카운트 (DMR = DC_TIMEOUT / DC_REQ)
+        elif tag == "DC_START":
+            self.dc_started.add(kv.get("node"))
+
+        elif tag == "DC_REQ":
+            self.dc_req += 1
+            k = self._sbin(t)
+            self.series["dc_req"][k] += 1
+            self.series["dc_gap"][k] += int(kv.get("gap_violation", 0))
+            self.dc_gap_violations += int(kv.get("gap_violation", 0))
+
+        elif tag == "DC_TIMEOUT":
+            if int(kv.get("req_us", t)) >= self.window_t0:     # reset_window 이전 Req 의 워치독 제외
+                self.dc_timeouts += 1
+                self.series["dc_to"][self._sbin(t)] += 1
+                # RTT 스케치에는 마감값으로 중도절단 기록(전달된 Rsp 만 보면 높은 DMR 에서 분위수가 과소)
+                if "req_us" in kv:
+                    self._hist_add(("dc_rtt", kv.get("node"), kv.get("cap", "CAP0")),
+                                   int(kv.get("due_us", t)) - int(kv["req_us"]))
+
+        elif tag == "DC_RSP":
+            # 요청 시각이 있으면 Req→Rsp 지연을 응답 bin에 누적(합/개수) + 노드별 RTT 스케치
+            if "req_us" in kv and int(kv["req_us"]) >= self.window_t0:
+                k = self._sbin(t)
+                lat = int(kv.get("rtt_us", t - int(kv["req_us"])))
+                self.series["dc_rsp"][k] += 1
+                self.series["dc_lat"][k] += lat
+                if not int(kv.get("late", 0)):           # 늦은 Rsp 는 DC_TIMEOUT 에서 이미 절단 기록됨
+                    self._hist_add(("dc_rtt", kv.get("node"), kv.get("cap", "CAP0")), lat)
+
+    def reset_window(self):
+        """
+        누적 회계/로그를 비워 현재 시각부터 새 측정 구간을 시작(스냅샷 포크 후 DC 구간 전용 통계).
+        진행 중 SLAC 세션과 DC_START 집합은 유지한다.
+        리셋 전에 나간 DC Req 의 워치독/응답은 새 구간에서 세지 않는다(그 Req 는 새 구간 DC_REQ 에 없으므로).
+        """
+        self.t_success = self.t_collision = self.t_control = self.t_idle = 0
+        self.tx_ok = self.tx_err = self.drops = self.timeouts = 0
+        self.bo_slots = self.coll_tx = 0
+        self.per_node = {}
+        self.delay_hist = {}
+        self.tx_rows = []
+        self.debug_rows = []
+        self.sessions_log = []
+        self.dc_req = self.dc_timeouts = self.dc_gap_violations = 0
+        self.window_t0 = self.sim.now()
+
+    def summary(self, sim_time_us, t0_us=0):
         # 미완료 세션 닫기
         to_close = list(self.sessions_active.items())
         for node, st in to_close:
@@ -118,7 +292,7 @@ class Metrics:
             self.sessions_log.append(dict(node=node, start_us=st, end_us=sim_time_us, duration_us=dur, ok=0, timeout=1))
             self.sessions_active.pop(node, None)
 
-        T = max(1, sim_time_us)
+        T = max(1, sim_time_us - t0_us)   # 측정 구간 길이(t0_us 이후)
         util = (self.t_success + self.t_collision) / T
         coll_ratio = self.t_collision / max(1, (self.t_success + self.t_collision))
 
@@ -126,6 +300,7 @@ class Metrics:
         s_ok = sum(1 for s in self.sessions_log if s["ok"] and not s["timeout"])
         s_to = sum(1 for s in self.sessions_log if s["timeout"])
 
+        rtt = self.merged_delay("dc_rtt")
         return dict(
             throughput_mbps=(self._bits_ok_total()/T)*1e6/1e6,
             efficiency_eta=(self.t_success / max(1, (T - self.t_control))),
@@ -136,9 +311,103 @@ class Metrics:
             session_total=s_total,
             session_success=s_ok,
             session_timeouts=s_to,
-            tt_session_us=self.tt_session_us
+            tt_session_us=self.tt_session_us,
+            dc_req=self.dc_req,
+            dc_timeouts=self.dc_timeouts,
+            deadline_miss_ratio=self.dc_timeouts / max(1, self.dc_req),
+            dc_gap_violation_ratio=self.dc_gap_violations / max(1, self.dc_req),
+            attempt_prob=(self.tx_ok + self.tx_err) / max(1, self.bo_slots),
+            collision_prob=self.coll_tx / max(1, self.tx_ok + self.tx_err),
+            **self.merged_delay("succ").quantiles("access_delay"),
+            **self.merged_delay("drop").quantiles("drop_delay"),
+            **rtt.quantiles("dc_rtt"),
+            dc_rtt_censored_ratio=self.dc_timeouts / max(1, rtt.n),
         )
 
+    def snapshot(self):
+        """
+        실행 중 관찰용 가벼운 현재 상태(dict). 상태를 바꾸지 않는다(세션 닫기 없음).
+        비율은 0 ~ 현재 시각 누적 기준.
+        """
+        t = self.sim.now()
+        T = max(1, t)
+        busy = self.t_success + self.t_collision
+        return dict(t_us=t, tx_ok=self.tx_ok, tx_err=self.tx_err, drops=self.drops,
+                    throughput_mbps=self._bits_ok_total() / T,
+                    efficiency_eta=self.t_success / max(1, T - self.t_control),
+                    utilization=busy / T, collision_ratio=self.t_collision / max(1, busy),
+                    dc_req=self.dc_req, dc_timeouts=self.dc_timeouts,
+                    deadline_miss_ratio=self.dc_timeouts / max(1, self.dc_req),
+                    sessions_active=len(self.sessions_active), sessions_done=len(self.sessions_log))
+
+    def totals(self):
+        """
+        병합 가능한 원시 누적값(여러 버스/프로세스의 summary 합산용). summary() 호출 후 사용(세션 닫힘 반영).
+        """
+        s_ok = sum(1 for s in self.sessions_log if s["ok"] and not s["timeout"])
+        s_to = sum(1 for s in self.sessions_log if s["timeout"])
+        return dict(t_success=self.t_success, t_collision=self.t_collision, t_control=self.t_control,
+                    bits_ok=self._bits_ok_total(), tx_ok=self.tx_ok, tx_err=self.tx_err,
+                    drops=self.drops, timeouts=self.timeouts,
+                    session_total=len(self.sessions_log), session_success=s_ok, session_timeouts=s_to,
+                    dc_req=self.dc_req, dc_timeouts=self.dc_timeouts, dc_gap_violations=self.dc_gap_violations,
+                    bo_slots=self.bo_slots, coll_tx=self.coll_tx)
+
+    def merged_delay(self, kind, node=None, cap=None):
+        """kind("succ"/"drop"/"dc_rtt") 히스토그램을 node/cap 조건으로 병합."""
+        return merge_all(h for (k, n, c), h in self.delay_hist.items()
+                         if k == kind and (node is None or n == node) and (cap is None or c == cap))
+
+    def delay_histograms(self):
+        """직렬화된 지연 히스토그램 {"kind|node|CAP": dict} (병합용; histogram.LogHistogram.from_dict)."""
+        return {f"{k}|{n}|{c}": h.to_dict() for (k, n, c), h in self.delay_hist.items()}
+
+    def binned(self, t1_us):
+        """[0, t1_us) 구간을 완전히 덮는 bin 들의 시계열 사본(dict of list; 모자라면 0으로 채움)."""
+        n = max(0, int(t1_us) // self.bin_us)
+        return {k: (v[:n] + [0] * max(0, n - len(v))) for k, v in self.series.items()}
+
+    def steady_summary(self, sim_time_us, warmup_us):
+        """
+        워밍업(warmup_us, bin 경계로 내림) 이후 [t0, sim_time_us) 구간만으로 summary()와 같은 지표를 계산.
+        sim_time_us 가 걸친 bin 은 그 bin 에서 기록된 시간 중 구간 안 비율만큼만 더하고, 이후 bin 은 버린다
+        (조기 종료처럼 실행이 sim_time_us 를 넘긴 경우의 상향 편향 방지). 세션 통계는 전체 구간 기준.
+        지연 분위수(access_delay_*/drop_delay_*/dc_rtt_*, dc_rtt_censored_ratio)는 워밍업 절단점이 실행 후에야
+        정해져 스케치를 그 시점에서 다시 시작할 수 없으므로 포함하지 않는다.
+        """
+        s = self.summary(sim_time_us)
+        B = self.bin_us
+        k0 = max(0, int(warmup_us) // B)
+        t0 = k0 * B
+        T = max(1, sim_time_us - t0)
+        k1 = int(sim_time_us) // B                      # sim_time_us 가 속한(부분) bin
+        b0 = k1 * B
+        covered = min(b0 + B, max(int(sim_time_us), self.sim.now())) - b0
+        frac = (sim_time_us - b0) / covered if covered > 0 else 0.0
+        tot = {}
+        for k, v in self.series.items():
+            part = v[k1] if k1 < len(v) and k1 >= k0 else 0
+            tot[k] = sum(v[k0:k1]) + (part if frac >= 1 else part * frac)
+        succ, coll, ctrl = tot["succ"], tot["coll"], tot["ctrl"]
+        s.update(
+            throughput_mbps=(tot["bits"]/T)*1e6/1e6,
+            efficiency_eta=(succ / max(1, (T - ctrl))),
+            utilization=(succ + coll) / T,
+            collision_ratio=coll / max(1, (succ + coll)),
+            drops=tot["drops"],
+            dc_req=tot["dc_req"],
+            dc_timeouts=tot["dc_to"],
+            deadline_miss_ratio=tot["dc_to"] / max(1, tot["dc_req"]),
+            dc_gap_violation_ratio=tot["dc_gap"] / max(1, tot["dc_req"]),
+            attempt_prob=tot["tx"] / max(1, tot["bo"]),
+            collision_prob=tot["coll_tx"] / max(1, tot["tx"]),
+            warmup_us=t0,
+            steady_us=sim_time_us - t0,
+        )
+        for k in [k for k in s if k.startswith(DELAY_KEY_PREFIXES)]:
+            del s[k]
+        return s
+
     def _bits_ok_total(self):
         return sum(v["bits_ok"] for v in self.per_node.values())
 
@@ -156,10 +425,19 @@ class Metrics:
             for s in self.sessions_log: w.writerow(s)
 
     def dump_per_node(self, sim_time_us):
+        qs = [f"{p}_{name}_us" for p in ("access_delay", "drop_delay", "dc_rtt") for name, _ in QUANTILES]
         with open(os.path.join(self.out_dir, "node_summary.csv"), "w", newline="") as f:
-            w = csv.writer(f); w.writerow(["node","tx_ok","tx_err","bits_ok","drops"])
+            w = csv.writer(f); w.writerow(["node","tx_ok","tx_err","bits_ok","drops"] + qs)
             for node, v in sorted(self.per_node.items()):
-                w.writerow([node, v["tx_ok"], v["tx_err"], v["bits_ok"], v["drops"]])
+                d = self.merged_delay("succ", node).quantiles("access_delay")
+                d.update(self.merged_delay("drop", node).quantiles("drop_delay"))
+                d.update(self.merged_delay("dc_rtt", node).quantiles("dc_rtt"))
+                w.writerow([node, v["tx_ok"], v["tx_err"], v["bits_ok"], v["drops"]] + [d[q] for q in qs])
+        # (노드, CAP, 종류)별 분위수
+        with open(os.path.join(self.out_dir, "delay_by_cap.csv"), "w", newline="") as f:
+            w = csv.writer(f); w.writerow(["node","cap","kind","n","mean_us"] + [f"{name}_us" for name, _ in QUANTILES])
+            for (k, n, c), h in sorted(self.delay_hist.items(), key=lambda kv: (kv[0][1], kv[0][2], kv[0][0])):
+                w.writerow([n, c, k, h.n, round(h.mean(), 1)] + [h.quantile(q) for _, q in QUANTILES])
 
     def dump_summary_csv(self, s):
         with open(os.path.join(self.out_dir, "summary.csv"), "w", newline="") as f:
@@ -171,12 +449,21 @@ class Metrics:
             f.write("# Experiment Report\n\n")
             f.write("## Summary\n\n")
             for k in ["throughput_mbps","efficiency_eta","utilization","collision_ratio","drops","timeouts",
-                      "session_total","session_success","session_timeouts","tt_session_us"]:
+                      "session_total","session_success","session_timeouts","tt_session_us",
+                      "dc_req","dc_timeouts","deadline_miss_ratio","dc_gap_violation_ratio",
+                      "attempt_prob","collision_prob",
+                      "access_delay_p50_us","access_delay_p95_us","access_delay_p99_us","access_delay_p999_us",
+                      "drop_delay_p50_us","drop_delay_p99_us",
+                      "dc_rtt_p50_us","dc_rtt_p99_us","dc_rtt_p999_us","dc_rtt_censored_ratio",
+                      "peak_rss_mb","metrics_rows_peak","wall_s","events_per_s","trace_level","mem_downgrades","mem_downgrade_t_s",
+                      "warmup_us","steady_us","stopped_early","fingerprint"]:
                 if k in s: f.write(f"- **{k}**: {s[k]}\n")
 
     # ---- 간단 효율 시계열 PNG (옵션) ----
     def write_plots(self, sim_time_us, bins=50):
-        # 성공/충돌 에어타임으로 효율 추정
+        # 성공/충돌 에어타임으로 효율 추정 (프레임 행이 있는 FULL 레벨에서만)
+        if not self._keep_tx:
+            return
         if bins <= 0: bins = 50
         T = max(1, sim_time_us)
         edges = [int(i*T/bins) for i in range(bins+1)]
@@ -205,3 +492,11 @@ class Metrics:
         except Exception as e:
             with open(os.path.join(self.out_dir, "plot_error.log"), "a", encoding="utf-8") as f:
                 f.write(f"efficiency plot error: {e}\n")
+
+def delay_quantiles(*hist_dicts):
+    """delay_histograms() 결과들(여러 실행/버스/워커) → 병합한 전체 access/drop 지연·DC RTT 분위수."""
+    items = [(k, h) for d in hist_dicts for k, h in d.items()]
+    out = {}
+    for kind, prefix in (("succ", "access_delay"), ("drop", "drop_delay"), ("dc_rtt", "dc_rtt")):
+        out.update(merge_all(h for k, h in items if k.startswith(kind + "|")).quantiles(prefix))
+    return out
@@ -0,0 +1,196 @@
+"""
+optimizer.py
+============
+역할
+- `mac.cw_table`(CAP별)과 `mac.dc_init_per_bpc` 테이블을 자동 탐색한다.
+- 목적함수 예: N=50 DC 루프에서 DC 타임아웃 비율(DMR) 최소화, 단 eta ≥ eta_min.
+  기본은 SLAC 를 생략하고 DC 루프를 바로 시작(start_without_slac): 공유 버스에서는 SLAC 가 짧은 구간 안에
+  거의 끝나지 않아 DC_REQ 가 없으면 DMR 이 모든 후보에서 0 이 되기 때문. skip_slac=False 로 SLAC 포함.
+- 후보는 parallel.run_jobs 로 병렬 평가하고, 짧은 시뮬레이션 구간에서
+  Successive Halving 으로 성적이 나쁜 후보를 조기 탈락시킨다.
+- 평가된 모든 후보(각자 가장 긴 구간의 결과)로 eta vs DMR 파레토 프론트를 산출한다.
+  (마지막 라운드 생존자만 쓰면 스칼라 DMR 점수로 이미 걸러진 몇 점뿐이라 프론트가 되지 않음)
+
+구성
+- sample_candidates(): CW/DC 테이블 후보 생성(단조 증가 제약, 재현 가능한 rng)
+- apply_candidate(): 기본 설정 dict에 후보 테이블을 덮어쓴 사본 반환
+- score(): 제약 위반 패널티를 포함한 스칼라 점수(작을수록 좋음)
+- successive_halving(): 라운드별 구간 증가 + 상위 1/eta 생존
+- deepest_rows(): history 에서 후보별 가장 깊은(긴 구간) 라운드 행
+- pareto_front(): (eta 최대, DMR 최소) 비지배 해 집합
+- write_results(): optimizer_results.csv / pareto.csv / pareto.png 기록
+"""
+
+import os, csv, json, math, random
+
+from .parallel import run_jobs
+
+CAPS = ["CAP0", "CAP1", "CAP2", "CAP3"]
+
+# ---- 후보 생성 ----
+def _monotone_seq(rng, choices, length):
+    """choices(정렬됨)에서 길이 length의 비감소 수열을 샘플."""
+    seq = sorted(rng.choice(choices) for _ in range(length))
+    return [int(x) for x in seq]
+
+def sample_candidates(base_cfg, n, caps=("CAP0", "CAP3"), cw_min=4, cw_max=256,
+                      dc_choices=(0, 1, 2, 3, 5, 7, 15, 31), seed=0, include_base=True):
+    """
+    후보 n개 생성. 후보 = dict(cw_table={CAP: [..]}, dc_init_per_bpc=[..])
+    - caps에 포함된 CAP의 CW 테이블만 탐색하고 나머지는 기본값 유지
+    - 길이는 mac.max_bpc(기본 4) 단계
+    """
+    rng = random.Random(seed)
+    mac = base_cfg.get("mac", {})
+    stages = int(mac.get("max_bpc", 4))
+    cw_choices = [1 << e for e in range(int(math.log2(cw_min)), int(math.log2(cw_max)) + 1)]
+    base_tbl = mac.get("cw_table", {})
+    out = []
+    if include_base:
+        out.append(dict(cw_table={c: list(base_tbl.get(c, [])) for c in caps if base_tbl.get(c)},
+                        dc_init_per_bpc=list(mac.get("dc_init_per_bpc", [0, 1, 3, 15]))))
+    seen = {json.dumps(c, sort_keys=True) for c in out}
+    tries = 0
+    while len(out) < n and tries < 100 * n:
+        tries += 1
+        cand = dict(cw_table={c: _monotone_seq(rng, cw_choices, stages) for c in caps},
+                    dc_init_per_bpc=_monotone_seq(rng, sorted(dc_choices), stages))
+        key = json.dumps(cand, sort_keys=True)
+        if key not in seen:
+            seen.add(key); out.append(cand)
+    return out[:n]
+
+def apply_candidate(base_cfg, cand, nodes=None, sim_time_s=None, skip_slac=True):
+    """기본 설정 사본에 후보 테이블/노드 수/구간을 반영(skip_slac: SLAC 없이 DC 루프 시작)."""
+    cfg = json.loads(json.dumps(base_cfg))
+    mac = cfg.setdefault("mac", {})
+    tbl = mac.setdefault("cw_table", {})
+    for cap, arr in cand.get("cw_table", {}).items():
+        tbl[cap] = list(arr)
+    if cand.get("dc_init_per_bpc") is not None:
+        mac["dc_init_per_bpc"] = list(cand["dc_init_per_bpc"])
+    if nodes is not None:
+        cfg["topology"] = "shared_bus"
+        cfg["nodes"] = int(nodes)
+    if sim_time_s is not None:
+        cfg["sim_time_s"] = float(sim_time_s)
+    dc = cfg.setdefault("traffic", {}).setdefault("dc_loop", {})
+    dc["enabled"] = True
+    if skip_slac:
+        dc["start_without_slac"] = True
+    return cfg
+
+# ---- 목적함수 ----
+def score(summary, metric="deadline_miss_ratio", eta_min=0.0, penalty=10.0):
+    """작을수록 좋음: metric + penalty * max(0, eta_min - eta)."""
+    eta = float(summary.get("efficiency_eta", 0.0))
+    return float(summary.get(metric, 0.0)) + penalty * max(0.0, eta_min - eta)
+
+def _mean_summary(summaries):
+    keys = ["efficiency_eta", "collision_ratio", "deadline_miss_ratio", "dc_gap_violation_ratio",
+            "drops", "dc_req", "dc_timeouts", "session_success", "session_timeouts"]
+    return {k: sum(float(s.get(k, 0.0)) for s in summaries) / max(1, len(summaries)) for k in keys}
+
+# ---- Successive Halving ----
+def successive_halving(base_cfg, candidates, nodes=50, horizons_s=(0.5, 1.0, 2.0, 4.0), halving=2,
+                       seeds=(1,), metric="deadline_miss_ratio", eta_min=0.0, workers=None, log=print,
+                       skip_slac=True):
+    """
+    라운드 r: 생존 후보를 horizons_s[r] 구간 × seeds 로 병렬 평가 → 점수 상위 1/halving 유지.
+    반환: (history, final) — history는 모든 라운드 행, final은 마지막 라운드 행 리스트.
+    행 = dict(cand_id, round, horizon_s, score, <평균 summary>, cand)
+    """
+    alive = list(enumerate(candidates))
+    history, final = [], []
+    for r, h in enumerate(horizons_s):
+        jobs = []
+        for cid, cand in alive:
+            cfg = apply_candidate(base_cfg, cand, nodes=nodes, sim_time_s=h, skip_slac=skip_slac)
+            for sd in seeds:
+                jobs.append(dict(cfg=cfg, seed=sd, job_id=(cid, sd)))
+        results = run_jobs(jobs, workers=workers)
+        by_cand = {}
+        for res in results:
+            by_cand.setdefault(res["job_id"][0], []).append(res["summary"])
+        rows = []
+        for cid, cand in alive:
+            m = _mean_summary(by_cand.get(cid, []))
+            rows.append(dict(cand_id=cid, round=r, horizon_s=h,
+                             score=score(m, metric=metric, eta_min=eta_min), cand=cand, **m))
+        rows.sort(key=lambda x: x["score"])
+        history.extend(rows)
+        final = rows
+        if log:
+            best = rows[0]
+            log(f"[SH round {r}] horizon={h}s alive={len(rows)} best#{best['cand_id']} "
+                f"score={best['score']:.4f} eta={best['efficiency_eta']:.3f} {metric}={best.get(metric, 0):.4f}")
+        if r == len(horizons_s) - 1:
+            break
+        keep = max(1, int(math.ceil(len(rows) / float(halving))))
+        alive = [(x["cand_id"], x["cand"]) for x in rows[:keep]]
+    return history, final
+
+# ---- 파레토 ----
+def deepest_rows(history):
+    """후보마다 가장 높은 라운드(가장 긴 horizon) 행만 — 파레토 입력용."""
+    best = {}
+    for r in history:
+        if r["cand_id"] not in best or r["round"] > best[r["cand_id"]]["round"]:
+            best[r["cand_id"]] = r
+    return list(best.values())
+
+def pareto_front(rows, eta_key="efficiency_eta", dmr_key="deadline_miss_ratio"):
+    """eta 최대화·DMR 최소화 기준 비지배 행(eta 내림차순)."""
+    front = []
+    for a in rows:
+        dominated = False
+        for b in rows:
+            if b is a:
+                continue
+            if (b[eta_key] >= a[eta_key] and b[dmr_key] <= a[dmr_key]
+                    and (b[eta_key] > a[eta_key] or b[dmr_key] < a[dmr_key])):
+                dominated = True
+                break
+        if not dominated:
+            front.append(a)
+    front.sort(key=lambda x: -x[eta_key])
+    return front
+
+# ---- 기록 ----
+def _row_out(r):
+    cand = r["cand"]
+    out = {k: v for k, v in r.items() if k != "cand"}
+    for cap in CAPS:
+        if cap in cand.get("cw_table", {}):
+            out[f"cw_{cap}"] = "/".join(str(x) for x in cand["cw_table"][cap])
+    out["dc_init_per_bpc"] = "/".join(str(x) for x in cand.get("dc_init_per_bpc", []))
+    return out
+
+def write_results(out_dir, history, front, metric="deadline_miss_ratio"):
+    os.makedirs(out_dir, exist_ok=True)
+    for name, rows in (("optimizer_results.csv", history), ("pareto.csv", front)):
+        outs = [_row_out(r) for r in rows]
+        cols = []
+        for o in outs:
+            for k in o:
+                if k not in cols: cols.append(k)
+        with open(os.path.join(out_dir, name), "w", newline="") as f:
+            w = csv.DictWriter(f, fieldnames=cols); w.writeheader()
+            for o in outs: w.writerow(o)
+    with open(os.path.join(out_dir, "pareto.json"), "w") as f:
+        json.dump([dict(cand=r["cand"], efficiency_eta=r["efficiency_eta"], **{metric: r.get(metric)})
+                   for r in front], f, indent=2)
+    try:
+        import matplotlib; matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+        last = max((r["round"] for r in history), default=0)
+        pts = [r for r in history if r["round"] == last]
+        plt.figure(figsize=(6, 4))
+        plt.scatter([r["efficiency_eta"] for r in pts], [r[metric] for r in pts], s=14, color="gray", label="evaluated")
+        plt.plot([r["efficiency_eta"] for r in front], [r[metric] for r in front], marker="o", color="tab:red", label="Pareto")
+        plt.xlabel("Efficiency (eta)"); plt.ylabel(metric); plt.title("CW/DC table search: eta vs DMR")
+        plt.grid(True, lw=0.4, alpha=0.5); plt.legend(fontsize=8)
+        plt.tight_layout(); plt.savefig(os.path.join(out_dir, "pareto.png"), dpi=120); plt.close()
+    except Exception as e:
+        with open(os.path.join(out_dir, "plot_error.log"), "a", encoding="utf-8") as f:
+            f.write(f"pareto plot error: {e}\n")
@@ -0,0 +1,74 @@
+"""
+parallel.py
+===========
+역할
+- 서로 독립적인 시뮬레이션 실행(작업, job)을 여러 프로세스에 분산하는 최소 실행기.
+- 최적화기/스윕 스크립트가 공용으로 사용한다.
+
+구성
+- run_job(job): 워커 진입점. job=dict(cfg, seed, out_dir?, artifacts?, job_id?, histograms?) → dict(job_id, summary, out_dir)
+  * histograms=True 이면 결과에 직렬화된 지연 히스토그램(Metrics.delay_histograms) 포함 → metrics.delay_quantiles 로 병합
+  * 결과 resources = dict(job_wall_s=작업 전체 벽시계(산출물 포함), events, events_per_s, peak_rss_mb)
+    (summary 의 wall_s 는 빌드~요약, 산출물 제외)
+- run_jobs(jobs, workers, fn, cost_history=None, longest_first=True): 작업 목록을 병렬 실행하고 입력 순서대로 결과 반환
+  * workers<=1 이면 현재 프로세스에서 순차 실행(디버깅/단일 코어용)
+  * fn=run_job 이면 costmodel 로 비용을 예측해 긴 작업부터 제출(LPT) → 큰 N 하나가 마지막에 혼자 도는 꼬리 방지
+  * cost_history(JSONL 경로): 예측에 과거 기록 사용 + 이번 실행 기록 추가(없으면 N·sim_time 휴리스틱)
+"""
+
+import os, time, tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+from .costmodel import CostModel, features
+
+def default_workers():
+    """사용 가능한 CPU 수(최소 1)."""
+    try:
+        return max(1, len(os.sched_getaffinity(0)))
+    except Exception:
+        return max(1, os.cpu_count() or 1)
+
+def run_job(job):
+    """단일 실행. 산출물이 필요 없으면(artifacts=False) 임시 폴더를 out_dir로 사용."""
+    from .sim import build_and_run
+    out_dir = job.get("out_dir") or os.path.join(tempfile.gettempdir(), f"hpgp_job_{os.getpid()}")
+    hist = {}
+    on_finish = (lambda world: hist.update(world["metrics"].delay_histograms())) if job.get("histograms") else None
+    t0 = time.perf_counter()
+    s, out = build_and_run(job["cfg"], out_dir=out_dir, seed=int(job.get("seed", 1)),
+                           artifacts=bool(job.get("artifacts", False)), on_finish=on_finish)
+    r = dict(job_id=job.get("job_id"), summary=s, out_dir=out,
+             resources=dict(job_wall_s=round(time.perf_counter() - t0, 4), events=s.get("events"),
+                            events_per_s=s.get("events_per_s"), peak_rss_mb=s.get("peak_rss_mb")))
+    if job.get("histograms"):
+        r["histograms"] = hist
+    return r
+
+def run_jobs(jobs, workers=None, fn=run_job, cost_history=None, longest_first=True):
+    """jobs를 workers개 프로세스로 실행. fn은 피클 가능한 최상위 함수여야 한다. 결과는 입력 순서."""
+    jobs = list(jobs)
+    if not jobs:
+        return []
+    workers = default_workers() if workers is None else int(workers)
+    workers = max(1, min(workers, len(jobs)))
+    own = fn is run_job
+    model = CostModel(cost_history) if own and (cost_history or (longest_first and workers > 1)) else None
+    feats = [features(j["cfg"]) for j in jobs] if model is not None else None
+    if workers == 1:
+        res = [fn(j) for j in jobs]
+    else:
+        order = list(range(len(jobs)))
+        if longest_first and model is not None:
+            # 제출 순서 = 워커 배정 순서(FIFO) → 예측 비용 내림차순(동률은 입력 순서)
+            order.sort(key=lambda i: -model.predict(feats[i]))
+        res = [None] * len(jobs)
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            futs = [(i, ex.submit(fn, jobs[i])) for i in order]
+            for i, fu in futs:
+                res[i] = fu.result()
+    if model is not None and cost_history:
+        for f, r in zip(feats, res):
+            rs = r.get("resources") or {}
+            if rs.get("job_wall_s"):
+                model.add(f, rs["job_wall_s"], rs.get("events"), rs.get("peak_rss_mb"))
+    return res
@@ -0,0 +1,241 @@
+"""
+rare.py
+=======
+역할
+- 저부하(N 작음)에서 매우 드문 DC 주기 타임아웃 확률을 **다단계 분할(splitting)** 로 추정한다.
+  DC 주기 타임아웃 = EV의 DC Req 이후 EVSE Rsp 프레임이 deadline 안에 MAC 전송 성공하지 못함.
+  (앱의 DC_TIMEOUT 워치독과 같은 기준: Rsp 의 MAC 전달 시점으로 판정)
+- 스냅샷: Sim 상태 전체를 os.fork() 로 복제(snapshot.py 와 동일한 copy-on-write 방식).
+  중요도 함수 Φ 가 레벨 ℓ_k 를 처음 넘는 순간 궤적을 R개로 분할(고정 분할, RESTART 계열; 깊이 우선).
+- 루트(독립 시행)마다 Y_i = (목표 도달 수) / R^(m-1) 은 타임아웃 확률의 불편 추정량이며,
+  루트들 간 표본분산으로 95% CI 를 낸다.
+
+중요도 함수(태그된 DC 주기 1개 기준, 응답 미전달 동안)
+  Φ = age/D + w_queue·min(1, (EV+EVSE 큐 길이)/q_norm) + w_bpc·max(BPC)/BPC_lim + w_bad·[채널 bad]
+- age = 요청 후 경과시간, D = deadline. 타임아웃 순간 Φ ≥ 1 이므로 모든 레벨 ℓ_k=k/m (k<m)를 반드시 지난다.
+- 가중치 0 이면 경과시간만으로 분할(항상 유효). 큐/BPC/채널 항은 '위험한' 상태에서 더 일찍 분할한다.
+- 채널 bad 는 GEChannel 이 마지막으로 평가된 상태(per() 호출 시 전진)를 사용.
+
+구성
+- CycleTracker(world, node_id): DC_REQ(debug) / Rsp 전송 성공(tx) 관찰 → 주기별 완료/미스 판정
+- crude_mc(cfg, seed, sim_time_s, node): 비교용 단순 몬테카를로(모든 주기 카운트)
+- estimate(cfg, roots, levels, split, weights, ...): 워밍업 스냅샷 → 루트별 fork → 분할 → 추정/CI
+"""
+
+import os, sys, math, pickle
+
+from .sim import load_config, build
+from .snapshot import _read_all
+
+RSP_PREFIX = "DC_CUR_DEM_RSP_"
+
+class CycleTracker:
+    """노드 node_id 의 DC 주기(seq → 요청 시각)를 추적. Rsp 프레임(dst=node_id) 성공 시 완료."""
+    def __init__(self, world, node_id, deadline_us):
+        self.node = node_id
+        self.D = int(deadline_us)
+        self.pending = {}
+        self.n_req = self.n_ok = self.n_miss = 0
+        self.last_seq = None
+        m = world["metrics"]
+        m.debug_listeners.append(self._on_debug)
+        m.tx_listeners.append(self._on_tx)
+
+    def _on_debug(self, t, tag, kv):
+        if tag == "DC_REQ" and kv.get("node") == self.node:
+            seq = int(kv["seq"])
+            self.pending[seq] = t
+            self.last_seq = seq
+            self.n_req += 1
+
+    def _on_tx(self, frame, success, start_us, end_us, node):
+        if success and frame.dst == self.node and frame.kind.startswith(RSP_PREFIX):
+            seq = int(frame.kind[len(RSP_PREFIX):])
+            t_req = self.pending.pop(seq, None)
+            if t_req is not None:
+                if end_us - t_req <= self.D:
+                    self.n_ok += 1
+                else:
+                    self.n_miss += 1
+
+    def expire(self, now):
+        """deadline 이 지난 미완료 주기를 미스로 확정."""
+        late = [s for s, t in self.pending.items() if now - t > self.D]
+        for s in late:
+            self.pending.pop(s)
+            self.n_miss += 1
+
+def _world_cfg(cfg, sim_time_s=None):
+    cfg = load_config(cfg)
+    dc = cfg.setdefault("traffic", {}).setdefault("dc_loop", {})
+    dc["enabled"] = True; dc["start_without_slac"] = True
+    if sim_time_s is not None:
+        cfg["sim_time_s"] = float(sim_time_s)
+    return cfg
+
+def _count_events(world):
+    c = [0]
+    def h(sim):
+        c[0] += 1
+    world["sim"].hooks["on_tick"].append(h)
+    return c
+
+def crude_mc(cfg, seed=1, sim_time_s=10.0, node="N1", out_dir="/tmp/hpgp_rare"):
+    """단순 몬테카를로: 한 번 실행하며 node 의 모든 DC 주기를 완료/미스로 집계."""
+    cfg = _world_cfg(cfg, sim_time_s)
+    world = build(cfg, out_dir=out_dir, seed=seed)
+    D = int(cfg["traffic"]["dc_loop"].get("deadline_ms", 100)) * 1000
+    tr = CycleTracker(world, node, D)
+    ev = _count_events(world)
+    T = world["sim_time_us"]
+    world["sim"].run(until=T)
+    tr.expire(T)
+    n = tr.n_ok + tr.n_miss
+    return dict(cycles=n, misses=tr.n_miss, p=tr.n_miss / max(1, n), events=ev[0])
+
+class _SplitRun:
+    """fork 된 한 루트 안에서의 분할 궤적 상태(프로세스마다 사본)."""
+    def __init__(self, world, tracker, node, levels, split, weights, q_norm, root_seed):
+        self.world, self.tr, self.node = world, tracker, node
+        self.thr = [k / levels for k in range(1, levels)]
+        self.R = int(split)
+        self.w = weights
+        self.q_norm = max(1, int(q_norm))
+        self.seed = int(root_seed)
+        self.path = ()
+        self.next_level = 0
+        self.seq = None
+        self.t_req = None
+        self.hit = 0
+        self.done = False
+        self.out_fd = None           # 자식이면 결과를 보낼 파이프
+        self.sub_hits = 0            # 자식 서브트리 목표 도달 합
+        self.sub_events = 0
+        self.events = 0
+        macs = {m.id: m for m in world["macs"]}
+        self.ev_mac = macs[node]
+        self.evse_mac = next(a.mac for a in world["apps"] if a.role == "EVSE")
+
+    def _reseed(self):
+        self.world["sim"].rng.seed(hash((self.seed,) + self.path) & 0x7FFFFFFF)
+
+    def phi(self, now):
+        D = self.tr.D
+        f = (now - self.t_req) / D
+        w = self.w
+        if w.get("queue", 0):
+            f += w["queue"] * min(1.0, (len(self.ev_mac.tx_queue) + len(self.evse_mac.tx_queue)) / self.q_norm)
+        if w.get("bpc", 0):
+            f += w["bpc"] * max(self.ev_mac.BPC, self.evse_mac.BPC) / max(1, self.ev_mac._cap_bpc_limit())
+        if w.get("bad", 0):
+            f += w["bad"] * float(self.world["channel"].bad)
+        return f
+
+    def _fork_copies(self, copies):
+        """현재 상태를 copies 개 궤적으로: copies-1 개 자식을 깊이 우선으로 끝까지 돌리고, 자신은 마지막 사본."""
+        for c in range(copies - 1):
+            r, w = os.pipe()
+            sys.stdout.flush()
+            pid = os.fork()
+            if pid == 0:
+                os.close(r)
+                self.out_fd = w
+                self.sub_hits = self.sub_events = self.events = 0
+                self.path = self.path + (c,)
+                self._reseed()
+                return
+            os.close(w)
+            data = _read_all(r)
+            os.waitpid(pid, 0)
+            h, e = pickle.loads(data) if data else (0, 0)
+            self.sub_hits += h; self.sub_events += e
+        self.path = self.path + (copies - 1,)
+        self._reseed()
+
+    def hook(self, sim):
+        self.events += 1
+        if self.done or self.seq is None:
+            return
+        now = sim.t
+        if self.seq not in self.tr.pending:                 # Rsp 전달 완료 → 궤적 종료(미도달)
+            self.done = True; sim.stop(); return
+        # 레벨 통과(동시에 여러 레벨이면 R^j 사본)
+        f = self.phi(now)
+        j = 0
+        while self.next_level < len(self.thr) and f >= self.thr[self.next_level]:
+            self.next_level += 1; j += 1
+        if j:
+            self._fork_copies(self.R ** j)
+        if now - self.t_req > self.tr.D:                     # 목표: 타임아웃
+            self.hit = 1
+            self.done = True; sim.stop()
+
+    def run(self, decor_us):
+        sim = self.world["sim"]
+        self._reseed()
+        sim.hooks["on_tick"].append(self.hook)
+        # 1) 디코릴레이션 후 태그할 다음 요청을 기다림
+        t_tag = sim.now() + int(decor_us)
+        sim.run(until=t_tag)
+        before = self.tr.last_seq
+        while self.tr.last_seq == before:
+            sim.run(max_events=1)
+        self.seq = self.tr.last_seq
+        self.t_req = self.tr.pending[self.seq]
+        # 2) 태그 주기가 끝날 때까지(분할 포함) 진행
+        sim.run(until=self.t_req + self.tr.D + 1)
+        if not self.done:
+            self.hit = int(self.seq in self.tr.pending)
+        total = (self.hit + self.sub_hits, self.events + self.sub_events)
+        if self.out_fd is not None:                          # 분할 자식: 부모에게 서브트리 결과 전달 후 종료
+            with os.fdopen(self.out_fd, "wb") as f:
+                f.write(pickle.dumps(total))
+            os._exit(0)
+        return total
+
+def estimate(cfg, roots=100, levels=4, split=4, weights=None, q_norm=4, seed=1, warm_s=1.0,
+             decor_s=0.5, node="N1", workers=None, out_dir="/tmp/hpgp_rare"):
+    """
+    1) 워밍업(SLAC 생략 DC 루프) warm_s 실행 → 스냅샷
+    2) 루트 i 마다 fork: 재시드 → decor_s 진행 → node 의 다음 DC 주기를 태그 → Φ 레벨 분할
+    3) Y_i = hits_i / split^(levels-1); p̂ = mean(Y), 95% CI = 1.96·sd/√roots
+    반환: dict(p, ci95, rel_err, roots, hits, events, var_y, weight)
+    """
+    if not hasattr(os, "fork"):
+        raise RuntimeError("splitting requires os.fork() snapshots")
+    cfg = _world_cfg(cfg)
+    world = build(cfg, out_dir=out_dir, seed=seed)
+    D = int(cfg["traffic"]["dc_loop"].get("deadline_ms", 100)) * 1000
+    world["sim"].run(until=int(float(warm_s) * 1e6))
+    workers = max(1, int(workers or os.cpu_count() or 1))
+    weights = weights or {}
+    ys, hits, events = [], 0, 0
+    for b0 in range(0, roots, workers):
+        running = []
+        for i in range(b0, min(roots, b0 + workers)):
+            r, w = os.pipe()
+            sys.stdout.flush()
+            pid = os.fork()
+            if pid == 0:
+                os.close(r)
+                tr = CycleTracker(world, node, D)
+                run = _SplitRun(world, tr, node, levels, split, weights, q_norm, root_seed=seed * 100003 + i)
+                run.out_fd = None
+                res = run.run(int(float(decor_s) * 1e6))
+                with os.fdopen(w, "wb") as f:
+                    f.write(pickle.dumps(res))
+                os._exit(0)
+            os.close(w)
+            running.append((pid, r))
+        for pid, r in running:
+            data = _read_all(r)
+            os.waitpid(pid, 0)
+            h, e = pickle.loads(data) if data else (0, 0)
+            ys.append(h / float(split) ** (levels - 1))
+            hits += h; events += e
+    n = len(ys)
+    p = sum(ys) / max(1, n)
+    var = sum((y - p) ** 2 for y in ys) / max(1, n - 1)
+    ci = 1.96 * math.sqrt(var / max(1, n))
+    return dict(p=p, ci95=ci, rel_err=(ci / p) if p > 0 else float("inf"), roots=n, hits=hits,
+                events=events, var_y=var, weight=1.0 / float(split) ** (levels - 1))
@@ -6,12 +6,13 @@ sim.py
     * SLAC 상세 시퀀스
     * SLAC 완료 후: DC 루프(100ms 주기 Req / EVSE Res)
 - cp_point_to_point: EV <-> EVSE peers
+- depot: shared_bus M개(버스별 독립 Medium) → depot.py 에서 워커 샤딩/병합
 - 터미널 진행바(옵션), 세션 타임아웃 메트릭 전달
 - DC 진입/주기/타임아웃 CSV & PNG 생성
 - SLAC 타임라인 PNG 생성(메시지 5종 색상 간트)
 """
 
-import json, os
+import json, os, time
 from .utils import Sim
 from .medium import Medium, BeaconScheduler, PRSManager
 from .channel import GEChannel
@@ -19,6 +20,12 @@ from .mac_hpgp import HPGPMac, Priority
 from .app_15118 import App15118
 from .metrics import Metrics
 from .plot_slac import write_slac_timeline
+from .warmup import WarmupController
+from .exporter import from_config
+from .telemetry import from_config as telemetry_from_config
+from .memguard import MemoryGuard, start_tracemalloc, reset_peak_rss, peak_rss_mb
+from .fingerprint import from_config as fingerprint_from_config
+from .flame import from_config as flame_from_config, ev_group
 
 # ---- 진행바 ----
 def _install_progress(sim, total_us, label="", step_pct=1):
@@ -40,18 +47,20 @@ def _install_progress(sim, total_us, label="", step_pct=1):
     sim.at(0, tick)
 
 # ---- 리포트/아티팩트 ----
-def _write_dc_artifacts(metrics: Metrics, sim_time_us: int, out_dir: str):
+def _write_dc_artifacts(metrics: Metrics, sim_time_us: int, out_dir: str, trace_cycles: bool = True):
     """
     metrics.debug_rows에서 DC_* 이벤트를 모아 다음을 생성:
       - dc_entry_times.csv : node, dc_start_us, first_req_us, first_gap_us
-      - dc_cycles.csv      : node, seq, req_us, gap_violation(0/1), rsp_us(있으면), rsp_latency_us, timeout(0/1)
+      - dc_cycles.csv      : (trace_cycles일 때만) node, seq, req_us, gap_violation(0/1), req_dlv_us, rsp_us(있으면),
+                             rsp_latency_us(Req 생성 → Rsp MAC 전달), timeout(0/1)
+        RTT 분포 자체는 항상 Metrics 의 노드별 dc_rtt 스케치(summary dc_rtt_p*_us)에 남는다.
       - dc_timeline.png    : 파랑(DC_START), 회색(Req), 빨간 X(주기 위반), 초록 점(응답)
     """
     import csv
     # 수집
     start_by_node = {}
     reqs_by_node  = {}  # node -> list of (seq, t, gap_v)
-    rsps_by_node  = {}  # node -> dict seq->t
+    rsps_by_node  = {}  # node -> dict seq->(t, req_dlv_us)
     timeouts      = set()  # (node, seq)
     for t, tag, kv in metrics.debug_rows:
         if tag == "DC_START":
@@ -61,7 +70,7 @@ def _write_dc_artifacts(metrics: Metrics, sim_time_us: int, out_dir: str):
             reqs_by_node.setdefault(n, []).append((seq, t, gap_v))
         elif tag == "DC_RSP":
             n = kv.get("node"); seq = int(kv.get("seq"))
-            rsps_by_node.setdefault(n, {})[seq] = t
+            rsps_by_node.setdefault(n, {})[seq] = (t, kv.get("req_dlv_us"))
         elif tag == "DC_TIMEOUT":
             n = kv.get("node"); seq = int(kv.get("seq"))
             timeouts.add((n, seq))
@@ -76,15 +85,16 @@ def _write_dc_artifacts(metrics: Metrics, sim_time_us: int, out_dir: str):
                 first_req = t; first_gap = (t - st) if st is not None else None
             w.writerow([node, st, first_req, first_gap])
 
-    # dc_cycles.csv
-    with open(os.path.join(out_dir, "dc_cycles.csv"), "w", newline="") as f:
-        w = csv.writer(f); w.writerow(["node","seq","req_us","gap_violation","rsp_us","rsp_latency_us","timeout"])
-        for node, reqs in sorted(reqs_by_node.items()):
-            for seq, t, gap_v in sorted(reqs, key=lambda x:x[0]):
-                rsp_t = rsps_by_node.get(node, {}).get(seq)
-                latency = (rsp_t - t) if rsp_t is not None else None
-                to = 1 if (node, seq) in timeouts else 0
-                w.writerow([node, seq, t, gap_v, rsp_t, latency, to])
+    # dc_cycles.csv (주기별 행: 선택 트레이스)
+    if trace_cycles:
+        with open(os.path.join(out_dir, "dc_cycles.csv"), "w", newline="") as f:
+            w = csv.writer(f); w.writerow(["node","seq","req_us","gap_violation","req_dlv_us","rsp_us","rsp_latency_us","timeout"])
+            for node, reqs in sorted(reqs_by_node.items()):
+                for seq, t, gap_v in sorted(reqs, key=lambda x:x[0]):
+                    rsp_t, dlv_t = rsps_by_node.get(node, {}).get(seq, (None, None))
+                    latency = (rsp_t - t) if rsp_t is not None else None
+                    to = 1 if (node, seq) in timeouts else 0
+                    w.writerow([node, seq, t, gap_v, dlv_t, rsp_t, latency, to])
 
     # png: 타임라인
     try:
@@ -108,7 +118,7 @@ def _write_dc_artifacts(metrics: Metrics, sim_time_us: int, out_dir: str):
                 plt.scatter(xs, ys, s=30, marker="x", label="Period Violation" if n==nodes[0] else "", color="red")
         # 초록 점: 응답
         for n, m in rsps_by_node.items():
-            xs=[t/1e6 for t in m.values()]; ys=[y_of[n]]*len(m)
+            xs=[t/1e6 for t, _ in m.values()]; ys=[y_of[n]]*len(m)
             if xs:
                 plt.scatter(xs, ys, s=14, marker="o", label="DC_RSP" if n==nodes[0] else "", color="tab:green")
 
@@ -123,14 +133,15 @@ def _write_dc_artifacts(metrics: Metrics, sim_time_us: int, out_dir: str):
         with open(os.path.join(out_dir, "plot_error.log"), "a", encoding="utf-8") as f:
             f.write(f"dc_timeline plot error: {e}\n")
 
-def _write_all_reports(metrics: Metrics, sim_time_us: int, out_dir: str):
-    s = metrics.summary(sim_time_us)
+def _write_all_reports(metrics: Metrics, sim_time_us: int, out_dir: str, t0_us: int = 0, s=None, trace_cycles=True):
+    if s is None:
+        s = metrics.summary(sim_time_us, t0_us=t0_us)
     metrics.dump()
     metrics.dump_per_node(sim_time_us)
     metrics.dump_summary_csv(s)
     metrics.write_report(s)
     metrics.write_plots(sim_time_us)         # 효율 PNG (옵션)
-    _write_dc_artifacts(metrics, sim_time_us, out_dir)  # DC 관련 CSV/PNG
+    _write_dc_artifacts(metrics, sim_time_us, out_dir, trace_cycles)  # DC 관련 CSV/PNG
 
     # --- 추가: SLAC 타임라인 생성 (메시지 5종 색상 간트) ---
     try:
@@ -142,21 +153,35 @@ def _write_all_reports(metrics: Metrics, sim_time_us: int, out_dir: str):
 
     return s
 
-def _finalize_and_return(cfg, metrics, sim_time_us, out_dir):
-    s = _write_all_reports(metrics, sim_time_us, out_dir)
+def _dc_trace_cycles(cfg):
+    """traffic.dc_loop.trace_cycles (기본 true): dc_cycles.csv 주기별 트레이스 생성 여부."""
+    return bool(cfg.get("traffic", {}).get("dc_loop", {}).get("trace_cycles", True))
+
+def _finalize_and_return(cfg, metrics, sim_time_us, out_dir, s=None):
+    s = _write_all_reports(metrics, sim_time_us, out_dir, s=s, trace_cycles=_dc_trace_cycles(cfg))
     return s, os.path.abspath(out_dir)
 
-def build_and_run(cfg_path, out_dir="/mnt/data/out", seed=1, progress=False, progress_label=""):
-    # 설정 로드
-    with open(cfg_path, "r") as f:
-        cfg = json.load(f)
+def load_config(cfg_or_path):
+    """설정 경로(str) 또는 이미 로드된 dict를 받아 dict 사본을 반환."""
+    if isinstance(cfg_or_path, dict):
+        return json.loads(json.dumps(cfg_or_path))   # 호출측 dict 보호(깊은 복사)
+    with open(cfg_or_path, "r") as f:
+        return json.load(f)
 
+def build(cfg, out_dir="/mnt/data/out", seed=1):
+    """
+    설정 dict로 시뮬레이션 월드를 조립만 하고(실행 X) 구성요소를 dict로 반환.
+    반환: dict(cfg, sim, medium, channel, metrics, macs, apps, sim_time_us, nodes)
+    """
     sim = Sim(seed=seed)
     os.makedirs(out_dir, exist_ok=True)
 
     # Medium/metrics
     med = Medium(sim, topology=cfg["topology"])
     metrics = Metrics(sim, out_dir); med.metrics = metrics
+    tr = cfg.get("trace", None)     # {"level": OFF|SUMMARY|EVENTS|FULL, "tags": [...], "sample_k": k}
+    if tr:
+        metrics.set_trace(tr.get("level", "FULL"), tr.get("tags", None), tr.get("sample_k", 1))
 
     # MAC/Beacon/PRS
     timing = cfg["mac"].get("timing", {})
@@ -198,6 +223,15 @@ def build_and_run(cfg_path, out_dir="/mnt/data/out", seed=1, progress=False, pro
     dc_deadline_ms   = int(dc_loop.get("deadline_ms", 100))
     dc_rsp_delay_us  = int(dc_loop.get("rsp_delay_us", 1500))
     dc_rsp_jitter_us = int(dc_loop.get("rsp_jitter_us", 0))
+    dc_skip_slac     = bool(dc_loop.get("start_without_slac", False))  # SLAC 생략, DC 루프/post-SLAC 트래픽 즉시 시작
+
+    # SLAC 성공 후 랜덤 트래픽(traffic.post_slac; 없으면 비활성)
+    post = cfg.get("traffic", {}).get("post_slac", None)
+    post_kw = None
+    if post:
+        post_kw = dict(rate_mean_pps=post.get("rate_mean_pps", 0), bytes_min=post.get("bytes_min", 300),
+                       bytes_max=post.get("bytes_max", 1500), start_delay_us=post.get("start_delay_us", 0),
+                       cap_choices=[Priority[c] for c in post["cap_choices"]] if "cap_choices" in post else None)
 
     # Optional global override via environment variable
     try:
@@ -208,6 +242,9 @@ def build_and_run(cfg_path, out_dir="/mnt/data/out", seed=1, progress=False, pro
         pass
     sim_time_us = int(cfg["sim_time_s"] * 1e6)
 
+    world = dict(cfg=cfg, sim=sim, medium=med, channel=ch, metrics=metrics,
+                 macs=[], apps=[], sim_time_us=sim_time_us, out_dir=out_dir)
+
     # --- 토폴로지별 빌드 ---
     topo = cfg["topology"]
     if topo == "shared_bus":
@@ -221,7 +258,10 @@ def build_and_run(cfg_path, out_dir="/mnt/data/out", seed=1, progress=False, pro
             app.configure_slac_detail(N_start_atten, N_msound, gap_start_us, gap_msound_us, delay_evse_rsp_us, gap_attn_us, gap_match_us)
             app.configure_dc_loop(enabled=dc_enabled, period_ms=dc_period_ms, deadline_ms=dc_deadline_ms,
                                   rsp_delay_us=dc_rsp_delay_us, rsp_jitter_us=dc_rsp_jitter_us)
+            if post_kw:
+                app.configure_post_slac_traffic(**post_kw)
             apps.append(app)
+            world["macs"].append(mac)
 
         # EV들 peer → EVSE(N0)
         evse_app = apps[0]
@@ -231,14 +271,17 @@ def build_and_run(cfg_path, out_dir="/mnt/data/out", seed=1, progress=False, pro
         # SLAC 시작(피어 오프셋)
         peer_offset = int(cfg.get("traffic", {}).get("slac_peer_offset_us", 5000))
         for i in range(1, nodes):
-            apps[i].start_slac(start_us=(i-1)*peer_offset)
+            if dc_skip_slac:
+                apps[i].start_dc_loop(start_us=(i-1)*peer_offset)
+                apps[i].start_post_slac_traffic(start_us=(i-1)*peer_offset)
+            else:
+                apps[i].start_slac(start_us=(i-1)*peer_offset)
 
-        if progress or os.environ.get("HPGP_PROGRESS", "") == "1":
-            _install_progress(sim, sim_time_us, label=(progress_label or f"N={nodes}"))
+        world["apps"] = apps
+        world["nodes"] = nodes
 
-        sim.run(until=sim_time_us)
-        if progress or os.environ.get("HPGP_PROGRESS", "") == "1": print("")
-        return _finalize_and_return(cfg, metrics, sim_time_us, out_dir)
+    elif topo == "depot":
+        raise ValueError("depot topology is multi-bus; run it via build_and_run()/depot.run_depot()")
 
     else:
         # point-to-point
@@ -253,11 +296,104 @@ def build_and_run(cfg_path, out_dir="/mnt/data/out", seed=1, progress=False, pro
                                rsp_delay_us=dc_rsp_delay_us, rsp_jitter_us=dc_rsp_jitter_us)
         appB.configure_dc_loop(enabled=dc_enabled, period_ms=dc_period_ms, deadline_ms=dc_deadline_ms,
                                rsp_delay_us=dc_rsp_delay_us, rsp_jitter_us=dc_rsp_jitter_us)
+        if post_kw:
+            appA.configure_post_slac_traffic(**post_kw)
+            appB.configure_post_slac_traffic(**post_kw)
+
+        if dc_skip_slac:
+            appA.start_dc_loop(start_us=0)
+            appA.start_post_slac_traffic(start_us=0)
+        else:
+            appA.start_slac(start_us=0)
+        world["macs"] = [macA, macB]
+        world["apps"] = [appA, appB]
+        world["nodes"] = 2
 
-        if progress or os.environ.get("HPGP_PROGRESS", "") == "1":
-            _install_progress(sim, sim_time_us, label=(progress_label or "sim"))
+    return world
 
-        appA.start_slac(start_us=0)
+def build_and_run(cfg_path, out_dir="/mnt/data/out", seed=1, progress=False, progress_label="", artifacts=True,
+                  on_finish=None):
+    """
+    설정(경로 또는 dict)으로 빌드 후 sim_time까지 실행.
+    artifacts=False 이면 CSV/PNG 산출물 없이 summary만 계산(최적화/스윕 워커용).
+    on_finish(world): 실행 종료 직후(summary 전) 호출 — 워커에서 히스토그램 등 추가 결과 수집용(depot 제외).
+    """
+    cfg = load_config(cfg_path)
+    if cfg["topology"] == "depot":
+        # 다중 버스: 버스별 독립 Sim을 워커에 샤딩 후 병합(hpgp_sim/depot.py)
+        from .depot import run_depot, write_depot_reports
+        reset_peak_rss()
+        w0 = time.perf_counter()
+        s, records = run_depot(cfg, out_dir=out_dir, seed=seed, artifacts=False)
+        # 실행 비용 열(단일 버스와 같은 키): 버스 워커 합산 이벤트, 모든 프로세스 중 최대 RSS, 산출물 제외 벽시계
+        wall = max(1e-9, time.perf_counter() - w0)
+        ev = sum(r.get("events", 0) for r in records)
+        s.update(peak_rss_mb=max([round(peak_rss_mb(), 1)] + [r.get("peak_rss_mb", 0.0) for r in records]),
+                 wall_s=round(wall, 4), events=ev, events_per_s=round(ev / wall))
+        if artifacts:
+            write_depot_reports(records, s, out_dir)
+        return s, os.path.abspath(out_dir)
+    mem_cfg = cfg.get("memory", {})
+    reset_peak_rss()                    # peak_rss_mb 를 이 실행 기준으로(풀 워커의 이전 작업 제외)
+    own_tm = start_tracemalloc(mem_cfg)
+    w0 = time.perf_counter()
+    world = build(cfg, out_dir=out_dir, seed=seed)
+    sim, metrics, sim_time_us = world["sim"], world["metrics"], world["sim_time_us"]
+    if not artifacts and "trace" not in cfg:
+        metrics.set_trace("OFF")        # 산출물 없는 워커: 행 저장 불필요(요약 지표는 동일)
+
+    show = progress or os.environ.get("HPGP_PROGRESS", "") == "1"
+    if show:
+        default_label = f"N={world['nodes']}" if cfg["topology"] == "shared_bus" else "sim"
+        _install_progress(sim, sim_time_us, label=(progress_label or default_label))
+
+    # 워밍업 자동 탐지(MSER-5) / 정상상태 데이터 충분 시 조기 종료
+    wcfg = cfg.get("warmup", {})
+    wu = WarmupController(world, wcfg) if wcfg.get("enable", False) else None
+
+    # 라이브 지표(선택): every_s 마다 Prometheus HTTP / JSONL 스냅샷
+    live = from_config(world, cfg.get("live"), run=progress_label or os.path.basename(os.path.abspath(out_dir)))
+    # 경합 텔레메트리(선택): 슬롯 표본 → 고정 메모리 시계열(CSV/NPZ/PNG)
+    tele = telemetry_from_config(world, cfg.get("telemetry"))
+    # 메모리 회계/소프트 한도(한도 초과 시 트레이스 레벨 하향) → summary 열
+    guard = MemoryGuard(world, mem_cfg, owns_tracemalloc=own_tm).install()
+    # 결정적 지문(선택): 관측 사건 스트림 + summary 해시 → summary 의 fingerprint 열
+    fp = fingerprint_from_config(world, cfg.get("fingerprint"))
+    # 벽시계 귀속(선택): 노드 → 계층 → 콜백 스택 → collapsed-stack 파일(speedscope/flamegraph)
+    prof = flame_from_config(world, cfg.get("profile"))
+
+    r0 = time.perf_counter()
+    try:
         sim.run(until=sim_time_us)
-        if progress or os.environ.get("HPGP_PROGRESS", "") == "1": print("")
-        return _finalize_and_return(cfg, metrics, sim_time_us, out_dir)
+    finally:
+        if live is not None:
+            live.close()
+        if prof is not None:
+            prof.detach()
+    run_s = max(1e-9, time.perf_counter() - r0)
+    if prof is not None:
+        prof.write_collapsed(os.path.join(out_dir, cfg["profile"].get("file", "flame.collapsed")),
+                             node_map=ev_group if cfg["profile"].get("group_evs", False) else None)
+    if show: print("")
+    if on_finish is not None:
+        on_finish(world)
+    end_us = wu.end_us() if wu else sim_time_us
+    s = wu.summary(end_us) if wu else metrics.summary(end_us)
+    if fp is not None:
+        s["fingerprint"] = fp.finish(s)["fingerprint"]   # 자원 열(guard) 추가 전 summary 로 해시
+        fp.close()
+    mem = guard.report()
+    # 메모리 열은 "memory" 설정이 있을 때만(기계 의존 값·문자열 열 제외), peak_rss_mb 는 실행 비용 열로 항상
+    s.update(mem if "memory" in cfg else dict(peak_rss_mb=mem["peak_rss_mb"]))
+    guard.close()
+    # 실행 비용 기록(스윕 summary / parallel 비용 예측용): 빌드~요약 벽시계, 처리 이벤트 수, sim.run 기준 events/s
+    s.update(wall_s=round(time.perf_counter() - w0, 4), events=sim.events, events_per_s=round(sim.events / run_s))
+    if cfg.get("control_variate"):
+        # 제어변량 보정 eta(선택): 같은 설정의 독립 반복 + 파일럿 → eta_cv 열(편향 점검 실패 시 생략)
+        from .control_variate import summary_fields
+        s.update(summary_fields(cfg, seed=seed))
+    if not artifacts:
+        return s, os.path.abspath(out_dir)
+    if tele is not None:
+        tele.write(out_dir)
+    return _finalize_and_return(cfg, metrics, end_us, out_dir, s=s)
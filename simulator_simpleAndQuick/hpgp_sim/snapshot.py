@@ -0,0 +1,138 @@
+"""
+snapshot.py
+===========
+역할
+- SLAC 워밍업(parm/start-atten/MNBC/match/재시도)을 한 번만 시뮬레이션하고,
+  모든 EV가 DC_START를 보고한 시점의 Sim + MAC/App/Metrics 상태를 스냅샷으로 보존한다.
+  (SLAC이 재시도 없이 실패한 EV는 DC에 진입하지 않으므로 '종료됨'으로 간주해 기다리지 않는다)
+- 스냅샷에서 DC 구간 변형(시드, DC 주기, 지터, 응답 지연 등)을 여러 개 분기(fork)해 실행한다.
+- 이벤트 콜백이 클로저라 pickle이 불가능하므로 POSIX os.fork()의 copy-on-write로 상태를 복제한다.
+  fork가 없는 플랫폼에선 같은 시드로 워밍업을 재현(결정적)하여 대체한다.
+
+구성
+- warm_up(cfg, seed): 빌드 후 모든 EV가 DC_START할 때까지 실행 → world(dict) 반환
+- apply_variant(world, variant): 분기 직후 시드/DC 파라미터를 변경
+- run_variant(world, variant): (현재 프로세스에서) 변형 적용 + horizon 만큼 실행 + summary
+- fork_variants(world, variants, workers): 변형들을 fork 자식에서 병렬 실행, 결과 리스트 반환
+
+variant = dict(seed?, period_ms?, deadline_ms?, rsp_delay_us?, rsp_jitter_us?, horizon_s?, out_dir?, label?)
+"""
+
+import os, sys, pickle
+
+from .sim import load_config, build, _write_all_reports, _dc_trace_cycles
+
+def warm_up(cfg, seed=1, out_dir="/mnt/data/out", max_s=None, check_us=1000):
+    """
+    DC 루프를 켠 상태로 빌드하고, 모든 EV가 DC_START를 보고하면(또는 SLAC이 최종 종료되면) 멈춘다.
+    종료 판정은 check_us 간격으로만 수행(이벤트마다 N개 앱을 훑지 않도록).
+    world["warm_ok"] = 모든 EV가 DC에 진입했는가, world["warm_dc_nodes"] = DC 진입 EV 수.
+    """
+    cfg = load_config(cfg)
+    cfg.setdefault("traffic", {}).setdefault("dc_loop", {})["enabled"] = True
+    world = build(cfg, out_dir=out_dir, seed=seed)
+    sim, metrics = world["sim"], world["metrics"]
+    evs = [a for a in world["apps"] if a.role == "EV"]
+    state = {"next": 0}
+
+    def _all_settled(s):
+        if len(metrics.dc_started) >= len(evs):
+            s.stop(); return
+        if s.t >= state["next"]:
+            state["next"] = s.t + check_us
+            if all(a.slac_settled() for a in evs):
+                s.stop()
+    sim.hooks["on_tick"].append(_all_settled)
+    limit_us = int(float(max_s) * 1e6) if max_s is not None else world["sim_time_us"]
+    sim.run(until=limit_us)
+    sim.hooks["on_tick"].remove(_all_settled)
+
+    world["warm_t_us"] = sim.now()
+    world["warm_dc_nodes"] = len(metrics.dc_started)
+    world["warm_ok"] = len(metrics.dc_started) >= len(evs)
+    world["warm_seed"] = seed
+    return world
+
+def apply_variant(world, variant):
+    """스냅샷 직후 호출: RNG 재시드 + EV 앱의 DC 루프 파라미터 교체(다음 주기부터 반영)."""
+    sim = world["sim"]
+    if variant.get("seed") is not None:
+        sim.rng.seed(int(variant["seed"]))
+    for app in world["apps"]:
+        if "period_ms" in variant:     app.dc_period_us     = int(float(variant["period_ms"]) * 1000)
+        if "deadline_ms" in variant:   app.dc_deadline_us   = int(float(variant["deadline_ms"]) * 1000)
+        if "rsp_delay_us" in variant:  app.dc_rsp_delay_us  = int(variant["rsp_delay_us"])
+        if "rsp_jitter_us" in variant: app.dc_rsp_jitter_us = int(variant["rsp_jitter_us"])
+
+def run_variant(world, variant, reset_metrics=True, artifacts=False):
+    """변형 적용 후 스냅샷 시각부터 horizon_s(기본 cfg.sim_time_s) 동안 실행하고 summary 반환."""
+    sim, metrics = world["sim"], world["metrics"]
+    t0 = sim.now()
+    apply_variant(world, variant)
+    if reset_metrics:
+        metrics.reset_window()
+    horizon_us = int(float(variant.get("horizon_s", world["cfg"]["sim_time_s"])) * 1e6)
+    end_us = t0 + horizon_us
+    sim.run(until=end_us)
+    w0 = t0 if reset_metrics else 0
+    if artifacts:
+        out_dir = variant.get("out_dir") or world["out_dir"]
+        os.makedirs(out_dir, exist_ok=True)
+        metrics.out_dir = out_dir
+        s = _write_all_reports(metrics, end_us, out_dir, t0_us=w0, trace_cycles=_dc_trace_cycles(world["cfg"]))
+    else:
+        s = metrics.summary(end_us, t0_us=w0)
+    s = dict(s)
+    s.update(snapshot_t_us=t0, horizon_us=horizon_us)
+    return s
+
+def _read_all(fd):
+    chunks = []
+    while True:
+        b = os.read(fd, 1 << 16)
+        if not b:
+            break
+        chunks.append(b)
+    os.close(fd)
+    return b"".join(chunks)
+
+def fork_variants(world, variants, workers=None, reset_metrics=True, artifacts=False):
+    """
+    각 변형을 fork 자식에서 실행(부모의 스냅샷은 변하지 않음). workers개씩 동시 실행.
+    반환: [dict(variant, summary)] — 입력 순서 유지. 자식 실패 시 summary=None, error=메시지.
+    """
+    variants = list(variants)
+    if not hasattr(os, "fork"):
+        # 폴백: 같은 시드로 워밍업을 재현 후 변형 실행
+        out = []
+        for v in variants:
+            w = warm_up(world["cfg"], seed=world["warm_seed"], out_dir=world["out_dir"])
+            out.append(dict(variant=v, summary=run_variant(w, v, reset_metrics, artifacts)))
+        return out
+
+    workers = max(1, int(workers or os.cpu_count() or 1))
+    results = [None] * len(variants)
+    for b0 in range(0, len(variants), workers):
+        running = []
+        for i in range(b0, min(len(variants), b0 + workers)):
+            r, w = os.pipe()
+            sys.stdout.flush()
+            pid = os.fork()
+            if pid == 0:                           # 자식: 스냅샷 사본에서 변형 실행
+                os.close(r)
+                try:
+                    payload = dict(summary=run_variant(world, variants[i], reset_metrics, artifacts))
+                except Exception as e:
+                    payload = dict(summary=None, error=repr(e))
+                data = pickle.dumps(payload)
+                with os.fdopen(w, "wb") as f:
+                    f.write(data)
+                os._exit(0)
+            os.close(w)
+            running.append((i, pid, r))
+        for i, pid, r in running:
+            data = _read_all(r)
+            os.waitpid(pid, 0)
+            payload = pickle.loads(data) if data else dict(summary=None, error="child produced no result")
+            results[i] = dict(variant=variants[i], **payload)
+    return results
@@ -0,0 +1,258 @@
+"""
+surrogate.py
+============
+역할
+- (N, pps, CW 테이블) 같은 설계 공간에서 eta / DMR 을 전수 스윕 대신 **가우시안 과정(GP) 대리모델**로 근사한다.
+- 완료된 실행은 JSONL 결과 캐시(한 줄 = 한 실행: x, seed, sim_time_s, cfg_hash, summary)에 쌓이고,
+  같은 기본 설정(cfg_hash)·차원/구간의 캐시 기록은 다음 실행에서 학습 데이터로 재사용된다.
+- 능동 학습 루프: 초기 LHS 설계 → (GP 적합 → 획득함수로 다음 batch 제안 → parallel.run_jobs 실행) 반복.
+  * 새 batch 는 적합에 쓰이지 않은 상태에서 먼저 예측되므로 그 오차가 곧 hold-out 오차.
+  * hold-out RMSE 가 tol 미만이면 종료(또는 max_rounds).
+
+설계 차원(DIMENSIONS; 구간은 실행 시 덮어쓸 수 있음)
+- nodes  : 공유버스 노드 수(정수)
+- pps    : traffic.post_slac.rate_mean_pps (SLAC 성공 후 랜덤 트래픽; 기본 skip_slac=True 면 처음부터)
+  공유 버스에서는 SLAC 가 짧은 구간 안에 거의 끝나지 않으므로 기본으로 SLAC 를 생략(start_without_slac)한다.
+- cw_exp : 모든 CAP 의 mac.cw_table 을 2^cw_exp 배(정수) — CW 테이블 전체를 스칼라 1축으로 표현
+
+획득함수
+- "maxvar": 예측 표준편차 최대(불확실성 감소)
+- "ei"    : 목표값 target 으로의 기대 개선. 현재 최소 거리 d* = min|y - target| 에 대해
+            EI(x) = E[max(0, d* - |f(x) - target|)], f ~ N(μ, σ²) (닫힌 형태)
+- batch 안에서는 kriging believer(제안점의 예측 평균을 가짜 관측으로 넣고 공분산만 갱신)로 중복 제안을 피함.
+
+구성
+- GP: ARD RBF 커널 + 잡음, 입력 [0,1] 정규화, 출력 표준화, 로그 주변우도 최대화(L-BFGS-B)
+- lhs(n, d, rng), apply_point(base_cfg, x, dims, skip_slac=True)
+- cfg_hash(base_cfg, skip_slac): 기본 설정(sim_time_s 제외) + SLAC 생략 여부의 해시
+- load_results(path, dims, metric, sim_time_s, cfg_hash) / append_results(path, records)
+- ei_target(mu, sd, target, d_best)
+- active_learning(base_cfg, cache_path, ...): 루프 실행 → dict(rounds, model, X, y)
+"""
+
+import os, json, math, hashlib
+import numpy as np
+from scipy.optimize import minimize
+from scipy.stats import norm
+
+from .parallel import run_jobs
+
+DIMENSIONS = {
+    "nodes":  dict(path="nodes", lo=2, hi=50, kind="int"),
+    "pps":    dict(path="traffic.post_slac.rate_mean_pps", lo=0.0, hi=200.0, kind="float"),
+    "cw_exp": dict(path="mac.cw_table", lo=0, hi=4, kind="int"),
+}
+
+# ---- 설계 공간 ----
+def lhs(n, d, rng):
+    """[0,1]^d 라틴 하이퍼큐브 표본 n 개."""
+    u = (rng.random((n, d)) + np.arange(n)[:, None]) / n
+    for j in range(d):
+        u[:, j] = u[rng.permutation(n), j]
+    return u
+
+def _to_point(u, dims):
+    x = {}
+    for j, (name, d) in enumerate(dims.items()):
+        v = d["lo"] + u[j] * (d["hi"] - d["lo"])
+        x[name] = int(round(v)) if d["kind"] == "int" else float(v)
+    return x
+
+def _to_unit(x, dims):
+    return np.array([(x[name] - d["lo"]) / max(1e-12, d["hi"] - d["lo"]) for name, d in dims.items()])
+
+def apply_point(base_cfg, x, dims, skip_slac=True):
+    """기본 설정 사본에 설계점 x 반영(cw_exp 는 cw_table 배율, 그 외는 점 경로에 대입; skip_slac: SLAC 생략)."""
+    cfg = json.loads(json.dumps(base_cfg))
+    for name, d in dims.items():
+        if name == "cw_exp":
+            tbl = cfg.setdefault("mac", {}).setdefault("cw_table", {})
+            for cap in list(tbl):
+                tbl[cap] = [int(w) << int(x[name]) for w in tbl[cap]]
+            continue
+        keys = d["path"].split(".")
+        node = cfg
+        for k in keys[:-1]:
+            node = node.setdefault(k, {})
+        node[keys[-1]] = x[name]
+    if "nodes" in dims:
+        cfg["topology"] = "shared_bus"
+    if skip_slac:
+        cfg.setdefault("traffic", {}).setdefault("dc_loop", {})["start_without_slac"] = True
+    return cfg
+
+# ---- 결과 캐시(JSONL) ----
+def cfg_hash(base_cfg, skip_slac=True):
+    """설계점 이외의 실행 조건 식별자(sim_time_s 는 기록에 따로 있으므로 제외)."""
+    cfg = {k: v for k, v in base_cfg.items() if k != "sim_time_s"}
+    data = json.dumps([cfg, bool(skip_slac)], sort_keys=True).encode()
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+def load_results(path, dims, metric, sim_time_s, cfg_hash=None):
+    """같은 cfg_hash(주어진 경우)·차원 이름·sim_time_s 이고 구간 안에 있는 기록만 (X, y, records) 로."""
+    recs = []
+    if path and os.path.exists(path):
+        with open(path, "r") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                r = json.loads(line)
+                x = r.get("x", {})
+                if cfg_hash is not None and r.get("cfg_hash") != cfg_hash:
+                    continue
+                if set(x) != set(dims) or abs(float(r.get("sim_time_s", -1)) - float(sim_time_s)) > 1e-9:
+                    continue
+                if metric not in r.get("summary", {}):
+                    continue
+                if all(d["lo"] <= x[n] <= d["hi"] for n, d in dims.items()):
+                    recs.append(r)
+    X = np.array([_to_unit(r["x"], dims) for r in recs]).reshape(-1, len(dims))
+    y = np.array([float(r["summary"][metric]) for r in recs])
+    return X, y, recs
+
+def append_results(path, records):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "a") as f:
+        for r in records:
+            f.write(json.dumps(r) + "\n")
+
+# ---- 가우시안 과정 ----
+class GP:
+    """ARD RBF + 백색잡음. theta = [log ℓ_1..ℓ_d, log σ_f, log σ_n] (표준화된 y 기준)."""
+    def __init__(self, restarts=3, seed=0):
+        self.restarts = int(restarts)
+        self.rng = np.random.default_rng(seed)
+        self.theta = None
+
+    def _k(self, A, B, theta):
+        ls = np.exp(theta[:-2])
+        d2 = (((A[:, None, :] - B[None, :, :]) / ls) ** 2).sum(-1)
+        return np.exp(2 * theta[-2]) * np.exp(-0.5 * d2)
+
+    def _nll(self, theta, X, y):
+        K = self._k(X, X, theta) + (np.exp(2 * theta[-1]) + 1e-8) * np.eye(len(X))
+        try:
+            L = np.linalg.cholesky(K)
+        except np.linalg.LinAlgError:
+            return 1e10
+        a = np.linalg.solve(L.T, np.linalg.solve(L, y))
+        return 0.5 * y @ a + np.log(np.diag(L)).sum() + 0.5 * len(X) * math.log(2 * math.pi)
+
+    def fit(self, X, y, optimize=True):
+        X = np.asarray(X, dtype=float); y = np.asarray(y, dtype=float)
+        self.ym = float(y.mean()); self.ys = float(y.std()) or 1.0
+        z = (y - self.ym) / self.ys
+        d = X.shape[1]
+        if optimize or self.theta is None:
+            bounds = [(math.log(0.03), math.log(5.0))] * d + [(math.log(0.1), math.log(10.0)), (math.log(1e-3), math.log(1.0))]
+            starts = [np.array([math.log(0.3)] * d + [0.0, math.log(0.1)])]
+            starts += [np.array([self.rng.uniform(lo, hi) for lo, hi in bounds]) for _ in range(self.restarts)]
+            best = None
+            for t0 in starts:
+                r = minimize(self._nll, t0, args=(X, z), method="L-BFGS-B", bounds=bounds)
+                if best is None or r.fun < best.fun:
+                    best = r
+            self.theta = best.x
+        self.X, self.z = X, z
+        K = self._k(X, X, self.theta) + (np.exp(2 * self.theta[-1]) + 1e-8) * np.eye(len(X))
+        self.L = np.linalg.cholesky(K)
+        self.alpha = np.linalg.solve(self.L.T, np.linalg.solve(self.L, z))
+        return self
+
+    def predict(self, Xs):
+        """(평균, 표준편차) — 잠재함수 f 기준(관측 잡음 제외), 원 단위."""
+        Ks = self._k(np.asarray(Xs, dtype=float), self.X, self.theta)
+        mu = Ks @ self.alpha
+        v = np.linalg.solve(self.L, Ks.T)
+        var = np.maximum(np.exp(2 * self.theta[-2]) - (v * v).sum(0), 1e-12)
+        return self.ym + self.ys * mu, self.ys * np.sqrt(var)
+
+# ---- 획득함수 ----
+def ei_target(mu, sd, target, d_best):
+    """E[max(0, d* - |f - target|)], f ~ N(mu, sd²)."""
+    sd = np.maximum(sd, 1e-12)
+    a, b, t = target - d_best, target + d_best, target
+    za, zb, zt = (a - mu) / sd, (b - mu) / sd, (t - mu) / sd
+    left = (mu - a) * (norm.cdf(zt) - norm.cdf(za)) + sd * (norm.pdf(za) - norm.pdf(zt))
+    right = (b - mu) * (norm.cdf(zb) - norm.cdf(zt)) + sd * (norm.pdf(zb) - norm.pdf(zt))
+    return np.maximum(0.0, left + right)
+
+def _propose(gp, X, y, dims, batch, acq, target, rng, pool=2000):
+    """후보 풀(LHS, 정수 차원 반올림)에서 획득함수 최대점 batch 개(kriging believer)."""
+    cand = lhs(pool, len(dims), rng)
+    pts = [_to_point(u, dims) for u in cand]
+    U = np.array([_to_unit(p, dims) for p in pts])
+    seen = {tuple(np.round(r, 9)) for r in X}
+    keep = [i for i, r in enumerate(U) if tuple(np.round(r, 9)) not in seen]
+    U = U[keep]; pts = [pts[i] for i in keep]
+    Xb, yb = X.copy(), y.copy()
+    out = []
+    for _ in range(min(batch, len(pts))):
+        mu, sd = gp.predict(U)
+        if acq == "ei":
+            score = ei_target(mu, sd, target, float(np.min(np.abs(yb - target))))
+            if not np.any(score > 0):
+                score = sd
+        else:
+            score = sd
+        i = int(np.argmax(score))
+        out.append(pts[i])
+        Xb = np.vstack([Xb, U[i]]); yb = np.append(yb, mu[i])
+        gp.fit(Xb, yb, optimize=False)
+        U = np.delete(U, i, axis=0); pts.pop(i)
+    gp.fit(X, y, optimize=False)
+    return out
+
+def _evaluate(base_cfg, points, dims, seed, sim_time_s, workers, skip_slac=True):
+    jobs = []
+    for i, x in enumerate(points):
+        cfg = apply_point(base_cfg, x, dims, skip_slac)
+        cfg["sim_time_s"] = float(sim_time_s)
+        jobs.append(dict(cfg=cfg, seed=seed + i, job_id=i, artifacts=False))
+    res = run_jobs(jobs, workers=workers)
+    h = cfg_hash(base_cfg, skip_slac)
+    return [dict(x=x, seed=seed + i, sim_time_s=float(sim_time_s), cfg_hash=h, summary=r["summary"])
+            for i, (x, r) in enumerate(zip(points, res))]
+
+def active_learning(base_cfg, cache_path, dims=None, metric="efficiency_eta", n_init=8, batch=4, max_rounds=10,
+                    tol=0.02, acq="maxvar", target=0.9, sim_time_s=1.0, workers=None, seed=1, log=print,
+                    skip_slac=True):
+    """
+    능동 학습 루프. 반환 dict(rounds=[dict(round, n_train, holdout_rmse, holdout_mae, new)], model, X, y, dims).
+    hold-out 오차 = 이번 라운드에 새로 실행한 점들을 그 전 모델로 예측한 오차(첫 라운드는 없음).
+    """
+    dims = dims or DIMENSIONS
+    rng = np.random.default_rng(seed)
+    X, y, recs = load_results(cache_path, dims, metric, sim_time_s, cfg_hash(base_cfg, skip_slac))
+    log(f"cache: {len(y)} usable runs")
+    rounds = []
+    run_seed = int(seed) * 100000 + len(recs)
+    if len(y) < n_init:
+        pts = [_to_point(u, dims) for u in lhs(n_init - len(y), len(dims), rng)]
+        new = _evaluate(base_cfg, pts, dims, run_seed, sim_time_s, workers, skip_slac)
+        run_seed += len(new)
+        append_results(cache_path, new)
+        X = np.vstack([X, [_to_unit(r["x"], dims) for r in new]])
+        y = np.append(y, [float(r["summary"][metric]) for r in new])
+        rounds.append(dict(round=0, n_train=len(y), holdout_rmse=float("nan"), holdout_mae=float("nan"), new=len(new)))
+    gp = GP(seed=seed).fit(X, y)
+    for rd in range(1, max_rounds + 1):
+        pts = _propose(gp, X, y, dims, batch, acq, target, rng)
+        if not pts:
+            break
+        new = _evaluate(base_cfg, pts, dims, run_seed, sim_time_s, workers, skip_slac)
+        run_seed += len(new)
+        append_results(cache_path, new)
+        Xn = np.array([_to_unit(r["x"], dims) for r in new])
+        yn = np.array([float(r["summary"][metric]) for r in new])
+        mu, _ = gp.predict(Xn)
+        err = mu - yn
+        rmse, mae = float(np.sqrt((err ** 2).mean())), float(np.abs(err).mean())
+        X = np.vstack([X, Xn]); y = np.append(y, yn)
+        gp = GP(seed=seed + rd).fit(X, y)
+        rounds.append(dict(round=rd, n_train=len(y), holdout_rmse=rmse, holdout_mae=mae, new=len(new)))
+        log(f"round {rd}: {len(new)} new runs, n={len(y)}, hold-out RMSE={rmse:.4f} MAE={mae:.4f}")
+        if rmse < tol:
+            break
+    return dict(rounds=rounds, model=gp, X=X, y=y, dims=dims)
@@ -0,0 +1,177 @@
+"""
+telemetry.py
+============
+역할
+- N≥50 붕괴(포화) 구간 분석용 슬롯 단위 경합 텔레메트리. 매 틱을 덤프하지 않고 고정 메모리 NumPy 시계열로 누적한다.
+- 표본(stride_slots 슬롯마다 1회, on_tick 훅 → 이벤트를 추가하지 않으므로 결과 불변)
+  * ready     : 큐가 있고 BC==0 인 MAC 수(다음 유휴 슬롯의 경합 후보)
+  * backlog   : 큐가 비어 있지 않은 MAC 수,  busy: 매체 점유(전송/PRS/비콘) 중 여부
+  * bpc       : 큐가 있는 MAC 들의 BPC 단계 히스토그램
+  * queue     : 노드별 큐 길이
+- PRS 결과(PRSManager.outcome_listeners): 실행 수, 충돌(동순위 ≥2) 수, 후보 수 합
+- 고정 메모리 다운샘플링: bin 수 max_bins 고정. 시각이 끝을 넘으면 인접 bin 2개씩 병합하고 bin 폭을 2배로
+  (합/개수는 더하고 최대값은 max) → 실행 길이와 무관하게 O(max_bins·(N + BPC 단계)) 메모리.
+
+구성
+- ContentionTelemetry(world, stride_slots=1, max_bins=1024): install() / arrays() / write(out_dir)
+  * write → contention_timeseries.csv (bin별 평균/최대/비율), contention_timeseries.npz (원 배열), contention.png
+- from_config(world, tele_cfg): cfg["telemetry"] = {"enable", "stride_slots", "max_bins"} → 설치된 객체 또는 None
+"""
+
+import os, csv
+import numpy as np
+
+from .mac_hpgp import bpc_limit
+
+class ContentionTelemetry:
+    SUM_KEYS = ("n", "ready", "backlog", "busy", "prs_runs", "prs_coll", "prs_cands")
+    MAX_KEYS = ("ready_max", "queue_max")
+
+    def __init__(self, world, stride_slots=1, max_bins=1024):
+        self.world = world
+        self.sim = world["sim"]
+        self.medium = world["medium"]
+        self.macs = list(world["macs"])
+        self.nodes = [m.id for m in self.macs]
+        slot = int(world["cfg"]["mac"].get("sigma_us", 20))
+        self.step_us = max(1, int(stride_slots)) * slot
+        self.B = max(2, int(max_bins) // 2 * 2)
+        self.width_us = self.step_us            # 현재 bin 폭(병합 때마다 2배)
+        self.L = bpc_limit(world["cfg"]["mac"]) + 1
+        B, N = self.B, len(self.macs)
+        self.s = {k: np.zeros(B, dtype=np.int64) for k in self.SUM_KEYS + self.MAX_KEYS}
+        self.bpc = np.zeros((B, self.L), dtype=np.int64)
+        self.queue = np.zeros((B, N), dtype=np.int64)
+        self._next_us = self.sim.now()
+        self._t_end = 0
+        self._installed = False
+
+    def install(self):
+        if not self._installed:
+            self.sim.hooks["on_tick"].append(self._on_tick)
+            if getattr(self.medium, "prs", None) is not None:
+                self.medium.prs.outcome_listeners.append(self._on_prs)
+            self._installed = True
+        return self
+
+    # ---- bin 관리 ----
+    def _bin(self, t_us):
+        k = int(t_us) // self.width_us
+        while k >= self.B:
+            self._halve()
+            k = int(t_us) // self.width_us
+        return k
+
+    def _halve(self):
+        """인접 bin 쌍 병합 → 앞쪽 절반에 보관, bin 폭 2배."""
+        h = self.B // 2
+        for key, a in self.s.items():
+            pair = a.reshape(h, 2)
+            a[:h] = pair.max(axis=1) if key in self.MAX_KEYS else pair.sum(axis=1)
+            a[h:] = 0
+        for a in (self.bpc, self.queue):
+            a[:h] = a.reshape(h, 2, a.shape[1]).sum(axis=1)
+            a[h:] = 0
+        self.width_us *= 2
+
+    # ---- 표본 ----
+    def _on_tick(self, sim):
+        if sim.t >= self._next_us:
+            self._next_us = (sim.t // self.step_us + 1) * self.step_us
+            self._sample(sim.t)
+
+    def _sample(self, t):
+        k = self._bin(t)
+        s = self.s
+        ready = backlog = qmax = 0
+        bpc, queue = self.bpc[k], self.queue[k]
+        for i, m in enumerate(self.macs):
+            q = len(m.tx_queue)
+            if q:
+                backlog += 1
+                queue[i] += q
+                bpc[min(m.BPC, self.L - 1)] += 1
+                if m.BC == 0:
+                    ready += 1
+                if q > qmax:
+                    qmax = q
+        s["n"][k] += 1
+        s["ready"][k] += ready
+        s["backlog"][k] += backlog
+        s["busy"][k] += int(not self.medium.is_idle())
+        if ready > s["ready_max"][k]:
+            s["ready_max"][k] = ready
+        if qmax > s["queue_max"][k]:
+            s["queue_max"][k] = qmax
+        self._t_end = t
+
+    def _on_prs(self, t_us, contenders, winner, losers):
+        k = self._bin(t_us)
+        self.s["prs_runs"][k] += 1
+        self.s["prs_coll"][k] += int(winner is None)
+        self.s["prs_cands"][k] += len(contenders)
+
+    # ---- 결과 ----
+    def arrays(self):
+        """사용된 bin 까지 잘라낸 배열 dict (t_us = bin 시작 시각)."""
+        nb = min(self.B, self._t_end // self.width_us + 1)
+        out = {k: v[:nb].copy() for k, v in self.s.items()}
+        out.update(t_us=np.arange(nb, dtype=np.int64) * self.width_us, bpc=self.bpc[:nb].copy(),
+                   queue=self.queue[:nb].copy(), nodes=np.array(self.nodes), width_us=np.int64(self.width_us))
+        return out
+
+    def write(self, out_dir):
+        a = self.arrays()
+        n = np.maximum(1, a["n"])
+        bl = np.maximum(1, a["bpc"].sum(axis=1))
+        np.savez_compressed(os.path.join(out_dir, "contention_timeseries.npz"), **a)
+        path = os.path.join(out_dir, "contention_timeseries.csv")
+        with open(path, "w", newline="") as f:
+            w = csv.writer(f)
+            w.writerow(["t_s", "width_us", "samples", "ready_mean", "ready_max", "backlog_mean", "busy_frac",
+                        "queue_mean_total", "queue_max", "prs_runs", "prs_coll_ratio", "prs_cands_mean"]
+                       + [f"bpc{j}_frac" for j in range(self.L)])
+            for i in range(len(a["t_us"])):
+                w.writerow([a["t_us"][i] / 1e6, self.width_us, int(a["n"][i]),
+                            round(a["ready"][i] / n[i], 4), int(a["ready_max"][i]),
+                            round(a["backlog"][i] / n[i], 4), round(a["busy"][i] / n[i], 4),
+                            round(a["queue"][i].sum() / n[i], 3), int(a["queue_max"][i]),
+                            int(a["prs_runs"][i]), round(a["prs_coll"][i] / max(1, a["prs_runs"][i]), 4),
+                            round(a["prs_cands"][i] / max(1, a["prs_runs"][i]), 3)]
+                           + [round(x, 4) for x in (a["bpc"][i] / bl[i])])
+        self._plot(a, n, bl, os.path.join(out_dir, "contention.png"))
+        return path
+
+    def _plot(self, a, n, bl, path):
+        try:
+            import matplotlib; matplotlib.use("Agg")
+            import matplotlib.pyplot as plt
+            x = a["t_us"] / 1e6
+            fig, ax = plt.subplots(4, 1, figsize=(10, 9), sharex=True)
+            ax[0].plot(x, a["ready"] / n, label="ready (mean)")
+            ax[0].plot(x, a["ready_max"], lw=0.7, alpha=0.6, label="ready (max)")
+            ax[0].plot(x, a["backlog"] / n, label="backlogged MACs")
+            ax[0].set_ylabel("contenders"); ax[0].legend(fontsize=8, loc="upper left")
+            ax[1].stackplot(x, (a["bpc"] / bl[:, None]).T, labels=[f"BPC {j}" for j in range(self.L)])
+            ax[1].set_ylabel("BPC share"); ax[1].set_ylim(0, 1); ax[1].legend(fontsize=7, loc="upper left", ncol=self.L)
+            ax[2].plot(x, a["queue"].sum(axis=1) / n, label="total queue (mean)")
+            ax[2].plot(x, a["queue_max"], lw=0.7, alpha=0.6, label="max node queue")
+            ax[2].set_ylabel("frames"); ax[2].legend(fontsize=8, loc="upper left")
+            ax[3].plot(x, a["prs_coll"] / np.maximum(1, a["prs_runs"]), label="PRS collision ratio")
+            ax[3].plot(x, a["busy"] / n, label="medium busy")
+            ax[3].set_ylim(0, 1); ax[3].set_ylabel("ratio"); ax[3].set_xlabel("Time (s)")
+            ax[3].legend(fontsize=8, loc="upper left")
+            for g in ax:
+                g.grid(True, lw=0.4, alpha=0.5)
+            fig.suptitle(f"Contention telemetry (N={len(self.nodes)}, bin={self.width_us/1e3:.1f} ms)")
+            fig.tight_layout(); fig.savefig(path, dpi=120); plt.close(fig)
+        except Exception as e:
+            with open(os.path.join(os.path.dirname(path), "plot_error.log"), "a", encoding="utf-8") as f:
+                f.write(f"contention plot error: {e}\n")
+
+def from_config(world, tele_cfg):
+    """cfg["telemetry"] 로 ContentionTelemetry 설치(비활성화면 None)."""
+    if not tele_cfg or not tele_cfg.get("enable", False):
+        return None
+    return ContentionTelemetry(world, stride_slots=tele_cfg.get("stride_slots", 1),
+                               max_bins=tele_cfg.get("max_bins", 1024)).install()
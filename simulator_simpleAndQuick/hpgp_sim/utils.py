@@ -9,6 +9,9 @@ utils.py
 구성
 - Event: 시간 t, 우선순위 prio, 실행 함수 fn 을 담는 데이터 클래스.
 - Sim  : 이벤트 큐, 전역 시계, 난수 발생기, 이벤트 스케줄 API(at/call_later_abs/run) 제공.
+         run_iter(step_us): step_us 체크포인트마다 (t, 스냅샷)을 내는 제너레이터(일시정지/연장/재개).
+         events: 지금까지 처리한 이벤트 수(누적; 라이브 지표/벤치마크용).
+         profiler: None 이 아니면 run() 이 이벤트/훅마다 벽시계 시간을 profiler 에 귀속(flame.FlameProfiler).
 """
 
 from dataclasses import dataclass, field  # 데이터 클래스 사용
@@ -27,6 +30,9 @@ class Sim:
         self.q = []                                 # 이벤트 힙(우선순위 큐)
         self.rng = __import__("random").Random(seed) # 재현 가능한 난수 발생기
         self.hooks = {"on_tick":[]}                 # 매 틱마다 호출할 훅 목록
+        self._stop = False                          # stop() 요청 플래그
+        self.events = 0                             # 처리한 이벤트 누적 수
+        self.profiler = None                        # 벽시계 귀속기(선택; 기본 경로는 검사 1회만 추가)
 
     def at(self, dt, fn, prio=0):
         """현재 시각에서 dt(us) 뒤에 이벤트를 스케줄링."""
@@ -38,20 +44,75 @@ class Sim:
 
     def run(self, until=None, max_events=None):
         """이벤트를 시간 순서로 처리. until(us)까지 또는 max_events개 처리."""
+        prof = self.profiler
+        if prof is None:
+            return self._loop(until, max_events, None)
+        prof.begin()
+        try:
+            self._loop(until, max_events, self._fire_profiled)
+        finally:
+            prof.end()
+
+    def _loop(self, until, max_events, fire):
+        """run() 본체. fire(fn) 가 있으면 틱 훅 + 이벤트 실행을 그것으로 감싼다(프로파일러)."""
         n=0
+        self._stop = False
         while self.q:
+            if until is not None and self.q[0].t > until: # 종료조건: until을 넘으면 중단
+                break                              # (pop/push 없이 엿보기 → 나눠 실행해도 힙 배치가 동일)
             ev = heapq.heappop(self.q)             # 가장 이른/높은 우선순위 이벤트 팝
-            if until is not None and ev.t > until: # 종료조건: until을 넘으면 중단
-                heapq.heappush(self.q, ev)         # 다시 넣어 다음 실행을 위해 보존
-                break
             self.t = ev.t                          # 시계 전진
-            for h in self.hooks["on_tick"]:        # 틱 훅 호출(채널 갱신 등)
-                h(self)
-            ev.fn()                                # 이벤트 함수 실행
+            if fire is None:
+                for h in self.hooks["on_tick"]:    # 틱 훅 호출(채널 갱신 등)
+                    h(self)
+                ev.fn()                            # 이벤트 함수 실행
+            else:
+                fire(ev.fn)
             n+=1
+            self.events += 1
+            if self._stop:                         # 훅/콜백에서 stop() 요청 시 현재 이벤트 후 중단
+                break
             if max_events is not None and n>=max_events: # 이벤트 수 제한
                 break
 
+    def _fire_profiled(self, fn):
+        """틱 훅·이벤트 구간을 profiler 에 기록(enter/leave)하며 실행."""
+        prof = self.profiler
+        for h in self.hooks["on_tick"]:
+            prof.enter_event(h, hook=True)
+            h(self)
+            prof.leave()
+        prof.enter_event(fn)
+        fn()
+        prof.leave()
+
+    def run_iter(self, step_us, until=None, snapshot=None):
+        """
+        step_us 간격 체크포인트마다 제어를 돌려주는 제너레이터: (체크포인트 시각, snapshot() 또는 None).
+        - 일시정지: next() 를 부르지 않으면 그대로 멈춤(큐/시계 보존).
+        - 연장: gen.send(new_until) 로 종료 시각 변경. until 도달 시점에도 한 번 더 yield 하며,
+          그때 더 큰 until 을 send 하면 계속, 아니면 종료. 종료 후에도 run/run_iter 로 이어서 실행 가능.
+        - 체크포인트 사이 실행은 run(until=...) 과 같으므로 나눠 돌려도 결과가 동일하다.
+        """
+        step_us = max(1, int(step_us))
+        cur = self.t
+        while True:
+            nxt = cur + step_us if until is None else min(cur + step_us, int(until))
+            if nxt > cur:
+                self.run(until=nxt)
+                cur = self.t if self._stop else nxt
+            new = yield (cur, snapshot() if snapshot else None)
+            if new is not None:
+                until = int(new)
+            elif until is not None and cur >= until:
+                return
+            if self._stop:
+                return
+
+    def stop(self):
+        """현재 처리 중인 이벤트가 끝나면 run()을 중단(큐/시계는 그대로 보존되어 재개 가능)."""
+        self._stop = True
+
     def now(self): 
         """현재 시각(us) 반환."""
         return self.t
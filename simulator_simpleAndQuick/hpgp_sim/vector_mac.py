@@ -0,0 +1,319 @@
+"""
+vector_mac.py
+=============
+역할
+- 공유버스(shared_bus) 정상상태 DC 루프 구간을 **K개 복제(replication)를 동시에** 슬롯 단위로 시뮬레이션한다.
+- BC/DC/BPC/큐 길이/재시도 횟수를 K×N NumPy 배열로 두고 모든 복제를 lockstep으로 전진시킨다.
+- CW/DC 규칙은 mac_hpgp.cw_value / dc_init_value / bpc_limit 를 그대로 사용(HPGPMac과 동일 테이블).
+- 이벤트 엔진(HPGPMac._tick)의 슬롯 동작을 그대로 따른다:
+  * busy 슬롯: 큐가 있으면 DC -= 1, DC<0 이면 BPC 상승 + DC 재초기화 + BC 재샘플
+  * idle 슬롯: BC==0 이면 BC 샘플, BC>0 이면 BC -= 1, 샘플값이 0이면 송신 시도
+  * 송신 시도 시 큐가 있고 BC==0인 모든 노드가 후보(동일 CAP ≥2 → 충돌), PRS 시간만큼 제어 점유
+  * 충돌 airtime 회계와 충돌 후 헤드 재삽입(프레임 사본 증가)도 이벤트 엔진과 동일하게 재현
+  * 사본은 같은 Frame 객체이므로 헤드 요청 단위로 상태를 둔다: 사본 수(head_dups), 재시도 횟수(attempts; 사본 간
+    공유, 헤드가 바뀔 때만 0), 전달 여부(head_done; 첫 사본 성공만 EVSE 응답을 만든다 — 앱 on_success 중복 무시)
+- 검증: scripts/validate_vector_mac.py (이벤트 엔진과 통계 비교)
+- point_to_point=True: cp_point_to_point(EV/EVSE 한 쌍, PRS 없음) 규칙으로 K개의 **독립 링크**를 실행.
+  channel=dict(p_bg=[K], per_bad=[K], ...)로 복제(=링크)마다 채널 파라미터를 다르게 줄 수 있다.
+- run_pairs(cfg, channel, ...): 플릿 what-if 용 M쌍 실행 → 컬럼형 테이블(dict of np.ndarray)
+
+가정/단순화
+- 트래픽: EV(N1..)가 period_ms마다 CAP0 300B Req, Req 가 MAC 전달(성공)된 뒤 EVSE(N0)가 rsp_delay(+지터) 후 CAP0 200B Rsp
+  (traffic.dc_loop.start_without_slac=true 인 이벤트 엔진 구성과 동일한 시작 위상)
+- 채널: Gilbert–Elliott 전이확률을 슬롯 길이로 환산하여 매 슬롯 전진 + 주기성 PER 가중
+- PRS 진행 중 재시도/IFS는 모델링하지 않음(IFS=0 권장 설정 가정)
+- point_to_point: 같은 슬롯에 두 노드가 모두 송신하려 하면 EV(먼저 생성된 MAC의 틱)가 점유하고
+  EVSE는 그 슬롯을 busy로 처리(이벤트 엔진의 틱 순서와 동일), 충돌/PRS 없음
+"""
+
+import math
+import numpy as np
+
+from .mac_hpgp import Priority, cw_value, dc_init_value, bpc_limit
+
+REQ_BITS = 300 * 8
+RSP_BITS = 200 * 8
+CHANNEL_KEYS = ("p_bg", "p_bb", "per_good", "per_bad")
+
+class VectorBusMAC:
+    def __init__(self, cfg, replications, seed=1, point_to_point=False, channel=None):
+        mac = cfg["mac"]
+        if mac.get("dc_init_per_bpc", None) is None:
+            raise ValueError("vector engine requires mac.dc_init_per_bpc (DC 초기값 모드)")
+        self.cfg = cfg
+        self.K = int(replications)
+        self.p2p = bool(point_to_point)
+        self.N = 2 if self.p2p else int(cfg.get("nodes", 2))
+        self.rng = np.random.default_rng(seed)
+
+        # ---- MAC 파라미터 (HPGPMac과 동일 규칙) ----
+        self.sigma_us = int(mac.get("sigma_us", 20))
+        self.rate_bps = int(mac.get("phy_bps", 10_000_000))
+        self.lim = bpc_limit(mac)
+        stages = self.lim + 1
+        self.cw_tab = np.array([[cw_value(mac, p.name, b) for b in range(stages)] for p in Priority], dtype=np.int64)
+        self.dc_tab = np.array([dc_init_value(mac, b) for b in range(stages)], dtype=np.int64)
+        rl = mac.get("retry_limit", None)
+        self.retry_limit = None if rl is None else int(rl)
+
+        timing = mac.get("timing", {})
+        prs = timing.get("prs", {"symbols": 2, "symbol_us": 36})
+        self.prs_us = int(prs.get("symbols", 2)) * int(prs.get("symbol_us", 36))
+        bcn = timing.get("beacon", {"period_us": 100000, "duration_us": 2000})
+        self.beacon_on = bool(timing.get("beacon_enable", True))
+        self.beacon_period_us = int(bcn.get("period_us", 100000))
+        self.beacon_us = int(bcn.get("duration_us", 2000))
+
+        # ---- 노드별 프레임/우선순위 (N0=EVSE Rsp, N1..=EV Req; DC 루프는 CAP0) ----
+        self.cap = np.full(self.N, Priority.CAP0.value, dtype=np.int64)
+        bits = np.full(self.N, REQ_BITS, dtype=np.int64); bits[0] = RSP_BITS
+        self.bits = bits
+        self.air_us = np.ceil(bits / (self.rate_bps / 1e6)).astype(np.int64)
+
+        # ---- DC 루프 ----
+        dc = cfg.get("traffic", {}).get("dc_loop", {})
+        self.period_us = int(dc.get("period_ms", 100)) * 1000
+        self.rsp_delay_us = int(dc.get("rsp_delay_us", 1500))
+        self.rsp_jitter_us = int(dc.get("rsp_jitter_us", 0))
+        offset = int(cfg.get("traffic", {}).get("slac_peer_offset_us", 5000))
+        self.next_req_us = np.array([0] + [(i - 1) * offset for i in range(1, self.N)], dtype=np.int64)
+
+        # ---- 채널(GE) : 스텝 확률을 슬롯 단위로 환산 (channel 인자로 복제별 배열 지정 가능) ----
+        ch = dict(cfg["channel"])
+        for k, v in (channel or {}).items():
+            if k in CHANNEL_KEYS:
+                v = np.asarray(v, dtype=np.float64)
+                if v.ndim and v.shape != (self.K,):
+                    raise ValueError(f"channel[{k!r}] must have {self.K} entries")
+                ch[k] = v
+        r = self.sigma_us / max(1, int(ch.get("step_us", 1000)))
+        self.p_gb_slot = 1.0 - (1.0 - np.asarray(ch["p_bg"], dtype=np.float64)) ** r
+        self.p_bb_slot = np.asarray(ch["p_bb"], dtype=np.float64) ** r
+        self.per_good = np.asarray(ch["per_good"], dtype=np.float64)
+        self.per_bad = np.asarray(ch["per_bad"], dtype=np.float64)
+        self.periodic = ch.get("periodic", None) or {"freq_hz": 0, "amp": 0.0, "bias": 0.0}
+
+        self._reset_state()
+
+    # ---- 상태 ----
+    def _reset_state(self):
+        K, N = self.K, self.N
+        z = lambda: np.zeros((K, N), dtype=np.int64)
+        self.BC, self.BPC, self.qlen, self.attempts = z(), z(), z(), z()
+        self.head_dups = z()                             # 헤드 요청의 큐 안 사본 수(0 = 큐 비었음)
+        self.head_done = np.zeros((K, N), dtype=bool)    # 헤드 요청의 사본 하나가 이미 전달됨
+        self.DC = np.full((K, N), self.dc_tab[0], dtype=np.int64)
+        self.frozen_until = z()                          # 송신 중(자기 틱 없음) 노드의 해제 슬롯
+        self.busy_until = np.zeros(K, dtype=np.int64)    # 매체 점유 해제 슬롯(배타)
+        self.bad = np.zeros(K, dtype=bool)
+        # 집계
+        f = lambda: np.zeros(K, dtype=np.float64)
+        self.t_success, self.t_collision, self.t_control = f(), f(), f()
+        self.bits_ok = f()
+        self.tx_ok, self.tx_err, self.drops, self.dc_req = z(), z(), z(), f()
+        self._next_beacon_us = self.beacon_period_us
+        # EVSE 응답 도착 링버퍼(슬롯 오프셋 × K): Req 전달 슬롯(PRS + airtime 뒤) + 응답 지연까지 덮는다
+        span = (self.prs_us + int(self.air_us.max()) + self.rsp_delay_us + self.rsp_jitter_us) // self.sigma_us + 3
+        self._ring = np.zeros((span, K), dtype=np.int64)
+        self._slot = 0
+
+    def _next_head(self):
+        """헤드 요청의 사본이 모두 빠졌고 큐가 남은 위치: 다음 요청이 헤드(사본 1, 재시도/전달 상태 초기화)."""
+        nh = (self.head_dups == 0) & (self.qlen > 0)
+        if nh.any():
+            self.head_dups[nh] = 1
+            self.attempts[nh] = 0
+            self.head_done[nh] = False
+
+    def _draw_bc(self, mask):
+        """mask 위치의 BC를 [0, CW(cap, BPC)) 균등 샘플."""
+        cw = self.cw_tab[np.broadcast_to(self.cap, mask.shape)[mask], self.BPC[mask]]
+        self.BC[mask] = (self.rng.random(cw.shape) * cw).astype(np.int64)
+
+    def _deferral(self, mb):
+        """busy 로 본 슬롯: DC -= 1, DC<0 이면 BPC 상승 + DC 재초기화 + BC 재샘플."""
+        if mb.any():
+            self.DC[mb] -= 1
+            up = mb & (self.DC < 0)
+            if up.any():
+                self.BPC[up] = np.minimum(self.BPC[up] + 1, self.lim)
+                self.DC[up] = self.dc_tab[self.BPC[up]]
+                self._draw_bc(up)
+
+    # ---- 한 슬롯 ----
+    def _step(self):
+        s = self._slot
+        t = s * self.sigma_us
+        K, N, ring = self.K, self.N, self._ring
+
+        # 1) DC Req 생성(EV) + 전달된 Req 에 대한 EVSE 응답 도착(링버퍼)
+        due = np.nonzero(self.next_req_us[1:] <= t)[0] + 1
+        if due.size:
+            self.qlen[:, due] += 1
+            self.dc_req += due.size
+            self.next_req_us[due] += self.period_us
+        slot_idx = s % ring.shape[0]
+        arrived = due.size > 0
+        if ring[slot_idx].any():
+            self.qlen[:, 0] += ring[slot_idx]
+            ring[slot_idx] = 0
+            arrived = True
+        if arrived:
+            self._next_head()
+
+        # 2) 비콘: 주기 시점에 idle이면 점유, busy면 다음 주기
+        if self.beacon_on and t >= self._next_beacon_us:
+            idle = self.busy_until <= s
+            dur = -(-self.beacon_us // self.sigma_us)
+            self.busy_until[idle] = s + dur
+            self.t_control[idle] += self.beacon_us
+            self._next_beacon_us += self.beacon_period_us
+
+        # 3) 채널 상태 전진
+        u = self.rng.random(K)
+        self.bad = np.where(self.bad, u < self.p_bb_slot, u < self.p_gb_slot)
+
+        active = (self.qlen > 0) & (self.frozen_until <= s)
+        busy = (self.busy_until > s)[:, None]
+
+        # 4) busy 슬롯: DC 감소 → 단계 상승
+        self._deferral(active & busy)
+
+        # 5) idle 슬롯: BC 샘플/카운트다운, 샘플 0 이면 송신 시도
+        mi = active & ~busy
+        if not mi.any():
+            self._slot += 1
+            return
+        z = mi & (self.BC == 0)
+        if z.any():
+            self._draw_bc(z)
+        fire = z & (self.BC == 0)                       # 새로 뽑은 값이 0인 노드만 송신
+        dec = mi & (self.BC > 0)
+        self.BC[dec] -= 1
+        firing = fire.any(axis=1)
+        if not firing.any():
+            self._slot += 1
+            return
+
+        # 6) 경합 후보: 송신 시도 복제에서 큐가 있고 BC==0 인 노드
+        if self.p2p:
+            # 점대점: PRS/충돌 없음. 동시 시도 시 EV(노드 1) 선점, EVSE 는 busy 슬롯 처리
+            cand = fire.copy()
+            cand[:, 0] &= ~cand[:, 1]
+            self._deferral(fire & ~cand)
+            prs_us = 0
+        else:
+            cand = mi & (self.BC == 0) & firing[:, None]
+            prs_us = self.prs_us
+        ncand = cand.sum(axis=1)
+        air = np.where(cand, self.air_us[None, :], 0).max(axis=1)
+        rows = np.nonzero(firing)[0]
+        self.t_control[rows] += prs_us
+        end = s + -(-(prs_us + air[rows]) // self.sigma_us)
+        self.busy_until[rows] = end
+        self.frozen_until[cand] = np.broadcast_to(end[:, None], (rows.size, N))[cand[rows]]
+
+        single = firing & (ncand == 1)
+        coll = firing & (ncand >= 2)
+        # 단일 송신: 채널 PER
+        per = np.where(self.bad, self.per_bad, self.per_good)
+        f = float(self.periodic.get("freq_hz", 0.0)); amp = float(self.periodic.get("amp", 0.0))
+        if f > 0 and amp != 0.0:
+            per = per * max(0.0, 1.0 + float(self.periodic.get("bias", 0.0)) + amp * math.sin(2 * math.pi * f * t * 1e-6))
+        ok_rep = single & (self.rng.random(K) > np.clip(per, 0.0, 1.0))
+        ok = cand & ok_rep[:, None]
+        fail = cand & ~ok_rep[:, None]
+
+        if ok.any():
+            self.t_success += np.where(ok_rep, air, 0)
+            self.bits_ok += np.where(ok, self.bits[None, :], 0).sum(axis=1)
+            self.tx_ok += ok
+            first = ok & ~self.head_done                 # 그 요청의 첫 전달(앱 on_success 는 1회만)
+            self.head_done[ok] = True
+            self.qlen[ok] -= 1; self.head_dups[ok] -= 1
+            self.BPC[ok] = 0; self.DC[ok] = self.dc_tab[0]; self.BC[ok] = 0
+            self._next_head()
+            # EV Req 첫 전달 → 전달 슬롯 + rsp_delay(+지터) 뒤 EVSE 큐에 Rsp (이벤트 엔진의 on_success 경로)
+            req_rep = first[:, 1:].any(axis=1)
+            if req_rep.any():
+                end_k = np.zeros(K, dtype=np.int64); end_k[rows] = end
+                delay = np.full(K, self.rsp_delay_us, dtype=np.int64)
+                if self.rsp_jitter_us > 0:
+                    delay = np.maximum(0, delay + self.rng.integers(-self.rsp_jitter_us, self.rsp_jitter_us + 1, size=K))
+                k = np.nonzero(req_rep)[0]
+                off = -(-delay[k] // self.sigma_us)        # ceil
+                self._ring[(end_k[k] + off) % self._ring.shape[0], k] += 1
+        if fail.any():
+            # 충돌: add_collision_time(air) 1회 + 후보별 on_tx(실패) → (1+ncand)×air (이벤트 엔진 회계와 동일)
+            self.t_collision += np.where(coll, (1 + ncand) * air, 0) + np.where(single & ~ok_rep, air, 0)
+            self.tx_err += fail
+            self.BPC[fail] = np.minimum(self.BPC[fail] + 1, self.lim)
+            self.attempts[fail] += 1
+            drop = fail & (self.attempts > self.retry_limit) if self.retry_limit is not None else np.zeros_like(fail)
+            keep = fail & ~drop
+            # 큐 길이: 이벤트 엔진의 충돌 경로는 후보 프레임을 큐에 둔 채 실패 시 헤드에 다시 삽입하므로
+            # 충돌 재시도는 사본이 1개 늘고(drop이면 원본만 남음 — attempts 가 한계를 넘은 채라 다음 실패도 drop),
+            # PER 실패 경로는 pop 후 재삽입(변화 없음, drop 이면 사본 1개 제거)
+            in_coll = coll[:, None]
+            if drop.any():
+                self.drops += drop
+                gone = drop & ~in_coll
+                self.qlen[gone] -= 1; self.head_dups[gone] -= 1
+                self._next_head()
+            if keep.any():
+                self.qlen[keep & in_coll] += 1; self.head_dups[keep & in_coll] += 1
+                self.DC[keep] = self.dc_tab[self.BPC[keep]]
+                self._draw_bc(keep)
+        self._slot += 1
+
+    # ---- 실행 ----
+    def run(self, sim_time_s):
+        n_slots = int(float(sim_time_s) * 1e6) // self.sigma_us
+        for _ in range(n_slots):
+            self._step()
+        self.sim_time_us = n_slots * self.sigma_us
+        return self.summary()
+
+    def summary(self):
+        """복제별 지표 배열(dict of np.ndarray[K]); Metrics.summary()와 같은 정의."""
+        T = max(1, self.sim_time_us)
+        return dict(
+            throughput_mbps=self.bits_ok / T,
+            efficiency_eta=self.t_success / np.maximum(1, T - self.t_control),
+            utilization=(self.t_success + self.t_collision) / T,
+            collision_ratio=self.t_collision / np.maximum(1, self.t_success + self.t_collision),
+            drops=self.drops.sum(axis=1).astype(float),
+            tx_ok=self.tx_ok.sum(axis=1).astype(float),
+            tx_err=self.tx_err.sum(axis=1).astype(float),
+            dc_req=self.dc_req.copy(),
+        )
+
+def mean_ci(x, z=1.96):
+    """표본 평균과 정규근사 95% 반폭."""
+    x = np.asarray(x, dtype=float)
+    if x.size < 2:
+        return float(x.mean()) if x.size else 0.0, 0.0
+    return float(x.mean()), float(z * x.std(ddof=1) / math.sqrt(x.size))
+
+def run_pairs(cfg, channel, sim_time_s=None, seed=1):
+    """
+    M개의 독립 EV/EVSE 점대점 링크(링크별 채널 파라미터)를 한 프로세스에서 lockstep 실행.
+    channel: dict(p_bg?, p_bb?, per_good?, per_bad?) — 길이 M 배열(없는 키는 cfg.channel 값).
+    반환: 컬럼형 테이블 dict(pair=[M], <채널 파라미터>=[M], <지표>=[M])
+    """
+    M = max(len(np.atleast_1d(v)) for v in channel.values())
+    eng = VectorBusMAC(cfg, M, seed=seed, point_to_point=True, channel=channel)
+    res = eng.run(cfg["sim_time_s"] if sim_time_s is None else sim_time_s)
+    table = dict(pair=np.arange(M))
+    for k in CHANNEL_KEYS:
+        table[k] = np.broadcast_to(np.asarray(channel.get(k, cfg["channel"][k]), dtype=np.float64), (M,)).copy()
+    table.update(res)
+    return table
+
+def write_columnar_csv(table, path):
+    """컬럼형 테이블(dict of 같은 길이 배열)을 CSV로 저장."""
+    import csv
+    cols = list(table.keys())
+    with open(path, "w", newline="") as f:
+        w = csv.writer(f); w.writerow(cols)
+        w.writerows(zip(*(np.asarray(table[c]).tolist() for c in cols)))
@@ -0,0 +1,97 @@
+"""
+warmup.py
+=========
+역할
+- SLAC 과도(transient) 구간을 MSER-5 규칙으로 자동 탐지해 정상상태 구간만으로 통계를 보고한다.
+- 입력 시계열: Metrics.series 의 bin별 효율(성공 airtime / (bin - 제어시간))과 DC 미스율(DC_TIMEOUT / DC_REQ).
+- (옵션) 워밍업 이후 정상상태 데이터가 충분히 쌓이면 실행을 조기 종료한다.
+
+구성
+- mser_truncation(y, batch=5): MSER-m 절단점(원 시계열 인덱스) 반환
+- efficiency_series(metrics, t1_us) / dc_miss_series(metrics, t1_us): bin 시계열 생성
+- detect_warmup_us(metrics, t1_us, batch): 두 시계열 절단점 중 큰 값(us)
+- WarmupController(world, cfg_warmup): on_tick 훅으로 주기 점검 + 조기 종료, 최종 steady summary
+
+설정(cfg["warmup"])
+- enable(bool), bin_ms(기본 100), batch(기본 5)
+- auto_stop(bool), min_steady_s(기본 5.0), check_s(기본 1.0)
+"""
+
+def mser_truncation(y, batch=5):
+    """
+    MSER-m: y를 batch개씩 평균한 Z_1..Z_b 에 대해
+      MSER(d) = Σ_{i>d} (Z_i - mean(Z_{d+1..b}))^2 / (b-d)^2
+    를 d ∈ [0, b/2] 에서 최소화. 반환: d* × batch (원 시계열 bin 인덱스).
+    """
+    m = max(1, int(batch))
+    b = len(y) // m
+    if b < 2:
+        return 0
+    z = [sum(y[i*m:(i+1)*m]) / m for i in range(b)]
+    # 꼬리 합/제곱합을 뒤에서부터 누적(O(b))
+    suf1 = [0.0] * (b + 1); suf2 = [0.0] * (b + 1)
+    for i in range(b - 1, -1, -1):
+        suf1[i] = suf1[i + 1] + z[i]
+        suf2[i] = suf2[i + 1] + z[i] * z[i]
+    best_d, best_v = 0, None
+    for d in range(0, b // 2 + 1):
+        n = b - d
+        v = (suf2[d] - suf1[d] * suf1[d] / n) / (n * n)
+        if best_v is None or v < best_v - 1e-18:
+            best_d, best_v = d, v
+    return best_d * m
+
+def efficiency_series(metrics, t1_us):
+    ser = metrics.binned(t1_us)
+    B = metrics.bin_us
+    return [ser["succ"][i] / max(1, B - ser["ctrl"][i]) for i in range(len(ser["succ"]))]
+
+def dc_miss_series(metrics, t1_us):
+    ser = metrics.binned(t1_us)
+    return [(ser["dc_to"][i] / ser["dc_req"][i]) if ser["dc_req"][i] else 0.0 for i in range(len(ser["dc_req"]))]
+
+def detect_warmup_us(metrics, t1_us, batch=5):
+    """효율/DC 미스 시계열의 MSER 절단점 중 늦은 쪽(us). DC 요청이 없으면 효율만 사용."""
+    k = mser_truncation(efficiency_series(metrics, t1_us), batch)
+    if sum(metrics.binned(t1_us)["dc_req"]) > 0:
+        k = max(k, mser_truncation(dc_miss_series(metrics, t1_us), batch))
+    return k * metrics.bin_us
+
+class WarmupController:
+    """build() 결과(world)에 붙여 워밍업 탐지/조기 종료를 담당."""
+    def __init__(self, world, wcfg):
+        self.world = world
+        self.sim, self.metrics = world["sim"], world["metrics"]
+        self.batch = int(wcfg.get("batch", 5))
+        self.auto_stop = bool(wcfg.get("auto_stop", False))
+        self.min_steady_us = int(float(wcfg.get("min_steady_s", 5.0)) * 1e6)
+        self.check_us = int(float(wcfg.get("check_s", 1.0)) * 1e6)
+        self.metrics.set_bin_us(int(float(wcfg.get("bin_ms", 100)) * 1000))
+        self.stopped_early = False
+        self.warmup_us = 0
+        self._next_check = self.check_us
+        if self.auto_stop:
+            self.sim.hooks["on_tick"].append(self._check)
+
+    def _check(self, sim):
+        if sim.t < self._next_check:
+            return
+        self._next_check = sim.t + self.check_us
+        t1 = (sim.t // self.metrics.bin_us) * self.metrics.bin_us   # 완료된 bin 까지만
+        w = detect_warmup_us(self.metrics, t1, self.batch)
+        if t1 - w >= self.min_steady_us:
+            self.warmup_us = w
+            self.stopped_early = True
+            sim.stop()
+
+    def end_us(self):
+        """실제 측정 종료 시각(조기 종료 시 정지 시각의 완료 bin 경계)."""
+        if self.stopped_early:
+            return (self.sim.now() // self.metrics.bin_us) * self.metrics.bin_us
+        return self.world["sim_time_us"]
+
+    def summary(self, end_us):
+        self.warmup_us = detect_warmup_us(self.metrics, end_us, self.batch)
+        s = self.metrics.steady_summary(end_us, self.warmup_us)
+        s["stopped_early"] = int(self.stopped_early)
+        return s
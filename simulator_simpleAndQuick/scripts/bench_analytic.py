@@ -0,0 +1,67 @@
+# bench_analytic.py
+# =================
+# - 해석 모델(hpgp_sim.analytic) 벤치마크: N=1..max_n, CW 테이블을 배율로 키워 마지막 단계 CW 최대 1024
+# - 경로별 시간/반복수 비교
+#   * closed/secant : 닫힌 형태 π + 할선법(기본 경로), 이웃 N warm start
+#   * closed/none   : 닫힌 형태 π + 단순 반복(원 스크립트의 반복 방식)
+#   * sparse/secant : COO 조립 + 직접 희소 해(검증용; --sparse-max-cw 이하 테이블에서만)
+# - 기준(closed/secant)과의 최대 |Δtau| 출력
+# - 출력: <out>/bench_analytic.csv
+
+import os, sys, csv, json, time, argparse
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(ROOT)
+
+import numpy as np
+from hpgp_sim.analytic import analyze, clear_cache
+
+def _parse_args():
+    p = argparse.ArgumentParser(description="Benchmark the analytic Markov chain solver over N and CW size")
+    p.add_argument("--config", default=os.path.join(ROOT, "config", "defaults.json"))
+    p.add_argument("--out", default=os.path.join(ROOT, "out_bench_analytic"))
+    p.add_argument("--cap", default="CAP0")
+    p.add_argument("--max-n", type=int, default=500)
+    p.add_argument("--scales", default="1,4,16", help="cw_table multipliers (CAP0 [8..64] x16 → last stage 1024)")
+    p.add_argument("--sparse-max-cw", type=int, default=256, help="run the sparse path only up to this last-stage CW")
+    p.add_argument("--max-iter", type=int, default=200)
+    return p.parse_args()
+
+def _run(mac, Ns, cap, **kw):
+    clear_cache()
+    t0 = time.time()
+    a = analyze(mac, Ns, cap=cap, **kw)
+    return a, time.time() - t0
+
+if __name__ == "__main__":
+    args = _parse_args()
+    with open(args.config, "r") as f:
+        base = json.load(f)["mac"]
+    Ns = list(range(1, args.max_n + 1))
+    rows = []
+    for sc in [int(x) for x in args.scales.split(",") if x.strip()]:
+        mac = dict(base)
+        cw = [int(w) * sc for w in base["cw_table"][args.cap]]
+        mac["cw_table"] = {args.cap: cw}
+        ref = None
+        paths = [("closed", "secant"), ("closed", "none")]
+        if cw[-1] <= args.sparse_max_cw:
+            paths.append(("sparse", "secant"))
+        for method, accel in paths:
+            a, wall = _run(mac, Ns, args.cap, method=method, accel=accel, max_iter=args.max_iter)
+            if ref is None:
+                ref = a
+            row = dict(cw_table="/".join(map(str, cw)), method=method, accel=accel, n_count=len(Ns),
+                       wall_s=round(wall, 3), ms_per_n=round(wall / len(Ns) * 1e3, 3),
+                       mean_iters=round(float(a["iters"].mean()), 2),
+                       max_iter_hits=int((a["iters"] >= args.max_iter).sum()),
+                       max_abs_dtau=float(np.abs(a["tau"] - ref["tau"]).max()))
+            rows.append(row)
+            print(f"CW={row['cw_table']:<16} {method:>6}/{accel:<6} wall={wall:7.2f}s "
+                  f"{row['ms_per_n']:8.2f} ms/N iters={row['mean_iters']:6.1f} "
+                  f"unconverged={row['max_iter_hits']:3d} max|dtau|={row['max_abs_dtau']:.2e}")
+
+    os.makedirs(args.out, exist_ok=True)
+    path = os.path.join(args.out, "bench_analytic.csv")
+    with open(path, "w", newline="") as f:
+        wr = csv.DictWriter(f, fieldnames=list(rows[0].keys())); wr.writeheader(); wr.writerows(rows)
+    print("Wrote:", path)
@@ -0,0 +1,75 @@
+# bench_depot_crosstalk.py
+# ========================
+# - 크로스토크 결합 depot 를 workers=1(순차 기준) 과 여러 workers 값으로 실행
+# - 버스별 결과가 순차 실행과 완전히 같은지 확인(다르면 exit 1)하고 벽시계 시간/속도향상 출력
+# - CPU 수 이하의 병렬 workers 에서 속도향상이 --min-speedup 미만이면 exit 1
+#   (CPU 보다 많은 workers 는 시분할이라 속도향상 판정에서 제외)
+# - windows = 실제 배리어 왕복 수(EOT 룩어헤드), fixed_windows = 고정 L 윈도였다면의 수
+# - 출력: <out>/depot_scaling.csv (workers, wall_s, speedup, windows, identical)
+
+import os, sys, csv, json, time, argparse
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(ROOT)
+
+from hpgp_sim.depot import run_depot, lookahead_us
+
+PROCESS_KEYS = ("peak_rss_mb",)      # 버스를 돌린 프로세스에 따라 달라지는 열(결과 비교에서 제외)
+
+def _parse_args():
+    p = argparse.ArgumentParser(description="Scaling/equivalence benchmark for crosstalk-coupled depot runs")
+    p.add_argument("--config", default=os.path.join(ROOT, "config", "depot.json"))
+    p.add_argument("--out", default=os.path.join(ROOT, "out_depot_bench"))
+    p.add_argument("--buses", type=int, default=32)
+    p.add_argument("--nodes-per-bus", type=int, default=10)
+    p.add_argument("--sim-time-s", type=float, default=1.0)
+    p.add_argument("--per-add", type=float, default=0.05)
+    p.add_argument("--layout", default="line", choices=["line", "ring"])
+    p.add_argument("--workers", default="1,8,16,32", help="comma list; the first entry is the reference")
+    p.add_argument("--seed", type=int, default=1)
+    p.add_argument("--min-speedup", type=float, default=1.0,
+                   help="fail if a parallel run with workers <= cpus is slower than this vs the reference")
+    return p.parse_args()
+
+if __name__ == "__main__":
+    args = _parse_args()
+    with open(args.config, "r") as f:
+        cfg = json.load(f)
+    cfg["topology"] = "depot"; cfg["sim_time_s"] = args.sim_time_s
+    d = cfg.setdefault("depot", {})
+    d.update(buses=args.buses, nodes_per_bus=args.nodes_per_bus, bus_artifacts=False)
+    d["crosstalk"] = dict(enable=True, layout=args.layout, per_add=args.per_add)
+    dc = cfg.setdefault("traffic", {}).setdefault("dc_loop", {})
+    dc["enabled"] = True; dc["start_without_slac"] = True
+
+    L = lookahead_us(cfg)
+    cpus = os.cpu_count() or 1
+    print(f"buses={args.buses} nodes/bus={args.nodes_per_bus} lookahead={L}us "
+          f"fixed_windows={int(args.sim_time_s * 1e6) // L + 1} cpus={cpus}")
+    rows, ref, ref_wall = [], None, None
+    for w in [int(x) for x in args.workers.split(",") if x.strip()]:
+        t0 = time.time()
+        s, recs = run_depot(cfg, out_dir=args.out, seed=args.seed, artifacts=False, workers=w)
+        wall = time.time() - t0
+        key = [{k: v for k, v in r.items() if k not in PROCESS_KEYS} for r in recs]
+        if ref is None:
+            ref, ref_wall = key, wall
+        same = key == ref
+        rows.append(dict(workers=w, wall_s=round(wall, 3), speedup=round(ref_wall / wall, 2),
+                         windows=recs[0]["xtalk_windows"], identical=int(same)))
+        print(f"workers={w:<3} wall={wall:8.2f}s speedup={ref_wall/wall:5.2f} windows={recs[0]['xtalk_windows']} identical={same} "
+              f"eta={s['efficiency_eta']:.4f} xtalk_hits={sum(r['xtalk_hits'] for r in recs)}")
+
+    os.makedirs(args.out, exist_ok=True)
+    path = os.path.join(args.out, "depot_scaling.csv")
+    with open(path, "w", newline="") as f:
+        wr = csv.DictWriter(f, fieldnames=list(rows[0].keys())); wr.writeheader(); wr.writerows(rows)
+    print("Wrote:", path)
+    if not all(r["identical"] for r in rows):
+        print("MISMATCH: parallel results differ from the sequential reference")
+        sys.exit(1)
+    slow = [r for r in rows[1:] if 1 < r["workers"] <= cpus and r["speedup"] < args.min_speedup]
+    if any(r["workers"] > cpus for r in rows[1:]):
+        print(f"note: workers > cpus({cpus}) are oversubscribed and not checked against --min-speedup")
+    if slow:
+        print(f"SLOW: speedup below {args.min_speedup} for workers={[r['workers'] for r in slow]}")
+        sys.exit(1)
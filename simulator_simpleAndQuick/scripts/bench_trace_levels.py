@@ -0,0 +1,86 @@
+# bench_trace_levels.py
+# =====================
+# - Metrics 트레이스 레벨(OFF/SUMMARY/EVENTS/FULL)별 실행 시간/저장 행 수 비교 (산출물 없이 sim.run 만 측정)
+# - 모든 레벨의 summary 가 동일한지 확인(세션 추적/DC 카운터/지연 스케치는 레벨 무관)
+# - 마이크로벤치: 비집계 태그 1회당 비용 — tracing() 체크만(OFF) vs debug() 호출(FULL)
+# - 출력: <out>/bench_trace_levels.csv
+
+import os, sys, csv, time, argparse
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(ROOT)
+
+from hpgp_sim.sim import load_config, build
+from hpgp_sim.metrics import Metrics, TRACE_LEVELS
+from hpgp_sim.utils import Sim
+
+def _parse_args():
+    p = argparse.ArgumentParser(description="Benchmark Metrics trace levels")
+    p.add_argument("--config", default=os.path.join(ROOT, "config", "defaults.json"))
+    p.add_argument("--out", default=os.path.join(ROOT, "out_bench_trace"))
+    p.add_argument("--nodes", type=int, default=10)
+    p.add_argument("--sim-time-s", type=float, default=5.0)
+    p.add_argument("--dc-loop", action="store_true", help="steady DC loop (SLAC skipped) instead of the SLAC scenario")
+    p.add_argument("--repeat", type=int, default=3, help="best-of repeats per level")
+    p.add_argument("--sample-k", type=int, default=1)
+    p.add_argument("--seed", type=int, default=1)
+    return p.parse_args()
+
+def _run(cfg, level, seed, out, sample_k):
+    cfg = dict(cfg, trace=dict(level=level, sample_k=sample_k))
+    w = build(cfg, out_dir=out, seed=seed)
+    t0 = time.perf_counter()
+    w["sim"].run(until=w["sim_time_us"])
+    wall = time.perf_counter() - t0
+    m = w["metrics"]
+    return wall, w["sim"].events, len(m.debug_rows), len(m.tx_rows), m.summary(w["sim_time_us"])
+
+def _micro(n=200_000):
+    """비집계 태그 한 건: OFF 에서는 tracing() 한 번, FULL 에서는 debug(kwargs) 호출 + 행 저장."""
+    out = {}
+    for level in ("OFF", "FULL"):
+        m = Metrics(Sim(), os.path.join(ROOT, "out_bench_trace"))
+        m.set_trace(level)
+        t0 = time.perf_counter()
+        for i in range(n):
+            if m.tracing("SLAC_RX"):
+                m.debug("SLAC_RX", node="N1", kind="SLAC_PARM_CNF")
+        out[level] = (time.perf_counter() - t0) / n * 1e9
+    return out
+
+if __name__ == "__main__":
+    args = _parse_args()
+    cfg = load_config(args.config)
+    cfg["topology"] = "shared_bus"; cfg["nodes"] = args.nodes; cfg["sim_time_s"] = args.sim_time_s
+    dc = cfg.setdefault("traffic", {}).setdefault("dc_loop", {})
+    dc["enabled"] = True; dc["start_without_slac"] = bool(args.dc_loop)
+    os.makedirs(args.out, exist_ok=True)
+
+    # 레벨을 번갈아 반복(교대 순서로 캐시/클럭 편향 완화), 첫 1회는 워밍업으로 버림 → 레벨별 최솟값
+    _run(cfg, "FULL", args.seed, args.out, args.sample_k)
+    best = {}
+    for _ in range(max(1, args.repeat)):
+        for level in TRACE_LEVELS:
+            r = _run(cfg, level, args.seed, args.out, args.sample_k)
+            best[level] = r if level not in best or r[0] < best[level][0] else best[level]
+    rows, ref = [], None
+    for level in TRACE_LEVELS:
+        wall, ev, n_dbg, n_tx, s = best[level]
+        ref = s if ref is None else ref
+        same = all(s[k] == ref[k] for k in ref)
+        rows.append(dict(level=level, wall_s=round(wall, 4), events=ev, events_per_s=round(ev / wall),
+                         debug_rows=n_dbg, tx_rows=n_tx, summary_equal=int(same)))
+        print(f"{level:8s} wall={wall:7.3f}s  ev/s={ev / wall:9.0f}  debug_rows={n_dbg:7d}  tx_rows={n_tx:7d}  "
+              f"summary_equal={same}")
+    full = next(r for r in rows if r["level"] == "FULL")["wall_s"]
+    for r in rows:
+        r["speedup_vs_full"] = round(full / max(1e-9, r["wall_s"]), 3)
+    mic = _micro()
+    print(f"per non-essential debug call: OFF {mic['OFF']:.0f} ns (tracing() check) vs FULL {mic['FULL']:.0f} ns")
+
+    path = os.path.join(args.out, "bench_trace_levels.csv")
+    with open(path, "w", newline="") as f:
+        wr = csv.DictWriter(f, fieldnames=list(rows[0].keys()) + ["call_ns"])
+        wr.writeheader()
+        for r in rows:
+            wr.writerow(dict(r, call_ns=round(mic.get(r["level"], float("nan")), 1)))
+    print("Wrote:", path)
@@ -0,0 +1,114 @@
+# check_fingerprints.py
+# =====================
+# - 엔진 리팩터링 안전망: 관측 사건 스트림 + summary 지문(hpgp_sim/fingerprint.py)을 백엔드 간 / 골든 파일과 비교
+#   * 백엔드 비교: 시드마다 --backends[0] 기준으로 나머지 실행 방식의 지문 비교, 다르면 첫 분기 사건과 앞 문맥 출력
+#   * 골든: --write-golden 으로 현재 지문(체크포인트 포함) 저장 → 이후 --golden 으로 비교(커밋 간 결과 불변 확인)
+#     골든과 다르면 첫 불일치 block 을 찾아 현재 실행의 해당 구간 사건을 보여준다
+#   * --inject-fault: t=1 s 에 난수 하나를 소비하는 가짜 백엔드를 추가(하네스가 분기를 잡는지 자체 점검)
+# - 케이스: shared_bus(DC 루프, SLAC 생략) N=--nodes, shared_bus SLAC 시나리오, point-to-point
+# - 종료 코드: 불일치가 있으면 1 (CI 게이트용)
+
+import os, sys, json, argparse
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(ROOT)
+
+from hpgp_sim.sim import load_config
+from hpgp_sim import fingerprint as fpm
+
+def _parse_args():
+    p = argparse.ArgumentParser(description="Compare event-stream fingerprints across engine backends / golden file")
+    p.add_argument("--config", default=os.path.join(ROOT, "config", "defaults.json"))
+    p.add_argument("--nodes", type=int, default=10)
+    p.add_argument("--sim-time-s", type=float, default=2.0)
+    p.add_argument("--seeds", type=int, nargs="+", default=[1, 2])
+    p.add_argument("--backends", nargs="+", default=list(fpm.BACKENDS), help=f"first is the reference; {list(fpm.BACKENDS)}")
+    p.add_argument("--all-tags", action="store_true", help="hash every debug tag, not only the aggregate ones")
+    p.add_argument("--block", type=int, default=1000, help="events per checkpoint")
+    p.add_argument("--context", type=int, default=5, help="events shown before the first divergence")
+    p.add_argument("--golden", default=None, help="compare the reference backend against this golden JSON")
+    p.add_argument("--write-golden", default=None, help="write reference fingerprints to this JSON")
+    p.add_argument("--inject-fault", action="store_true", help="add a perturbed backend (self-check)")
+    return p.parse_args()
+
+def _cases(base, nodes, sim_s):
+    def mk(topo, n, dc):
+        cfg = json.loads(json.dumps(base))
+        cfg.update(topology=topo, nodes=n, sim_time_s=sim_s)
+        d = cfg.setdefault("traffic", {}).setdefault("dc_loop", {})
+        d["enabled"] = dc; d["start_without_slac"] = dc and topo == "shared_bus"
+        return cfg
+    return {f"bus_N{nodes}_dc": mk("shared_bus", nodes, True), f"bus_N{nodes}_slac": mk("shared_bus", nodes, False),
+            "p2p": mk("cp_point_to_point", 2, True)}
+
+def _faulty(world, until_us):
+    """1 s 에 sim.rng 한 번 소비 → 이후 백오프 추첨이 달라짐(하네스 자체 점검용)."""
+    world["sim"].call_later_abs(1_000_000, world["sim"].rng.random)
+    world["sim"].run(until=until_us)
+
+def _fmt(ev):
+    return "-" if ev is None else f"t={ev[0]}us {ev[1]} node={ev[2]} {ev[3]}"
+
+def _print_div(d):
+    if d.get("summary_only"):
+        print("    event streams identical; only the final summary differs")
+    elif d.get("index") is None:
+        print(f"    diverged in events [{d['block'][0]}, {d['block'][1]}) (not reproduced on rerun)")
+    else:
+        print(f"    first divergent event #{d['index']} at t={d['t_us']}us")
+        for ev in d["context"]:
+            print(f"      ctx  {_fmt(ev)}")
+        print(f"      ref  {_fmt(d['a'])}")
+        print(f"      cand {_fmt(d['b'])}")
+
+if __name__ == "__main__":
+    args = _parse_args()
+    tags = "all" if args.all_tags else fpm.ESSENTIAL_TAGS
+    if args.inject_fault:
+        fpm.BACKENDS["faulty"] = _faulty
+        args.backends = args.backends + ["faulty"]
+    cases = _cases(load_config(args.config), args.nodes, args.sim_time_s)
+    golden = {}
+    if args.golden:
+        with open(args.golden) as f:
+            golden = json.load(f)
+    new_golden, bad, missed = {}, 0, 0
+
+    for name, cfg in cases.items():
+        for seed in args.seeds:
+            key = f"{name}/seed{seed}"
+            ref = fpm.run_fingerprint(cfg, seed, args.backends[0], tags, args.block)
+            new_golden[key] = ref
+            print(f"{key:22s} {args.backends[0]:16s} {ref['fingerprint']}  events={ref['events']}")
+            for be in args.backends[1:]:
+                r = fpm.run_fingerprint(cfg, seed, be, tags, args.block)
+                ok = r["fingerprint"] == ref["fingerprint"]
+                print(f"{'':22s} {be:16s} {r['fingerprint']}  events={r['events']}  {'OK' if ok else 'MISMATCH'}")
+                if be == "faulty":
+                    missed += ok        # 자체 점검: 교란한 백엔드는 달라야 정상
+                if not ok:
+                    bad += be != "faulty"
+                    _print_div(fpm.first_divergence(cfg, seed, args.backends[0], be, ref, r, args.context,
+                                                    tags, args.block))
+            g = golden.get(key)
+            if g is not None and g["fingerprint"] != ref["fingerprint"]:
+                bad += 1
+                print(f"{'':22s} {'golden':16s} {g['fingerprint']}  events={g['events']}  MISMATCH")
+                rng = fpm.first_divergent_block(g, ref)
+                if rng is None:
+                    print("    event streams identical; only the final summary differs")
+                else:
+                    lo = max(0, rng[0] - args.context)
+                    _, f = fpm.run_fingerprint(cfg, seed, args.backends[0], tags, args.block,
+                                               capture=(lo, min(rng[1], lo + args.block + args.context)), keep=True)
+                    print(f"    first divergent block: events [{rng[0]}, {rng[1]}); current events from #{lo}:")
+                    for i, ev in f.captured[:2 * args.context + 1]:
+                        print(f"      #{i} {_fmt(ev)}")
+
+    if args.write_golden:
+        with open(args.write_golden, "w") as f:
+            json.dump(new_golden, f, indent=1)
+        print("Wrote:", args.write_golden)
+    if missed:
+        print(f"self-check: injected fault NOT detected in {missed} run(s)")
+    print(f"{bad} mismatch(es)" if bad else "all fingerprints match")
+    sys.exit(1 if bad or missed else 0)
@@ -0,0 +1,63 @@
+# cosim_peer.py
+# =============
+# - 실제 SLAC/ISO 15118 스택 대신 쓰는 로컬 대역 프로세스(run_cosim.py 의 브리지 상대)
+# - period_ms 마다 DC 요청 유사 프레임(JSON)을 보내고, 브리지의 "sent"(MAC 전송 성공) / "rx" 메시지를 수신
+# - 왕복(송신 → sent 수신) 벽시계 시간과 sim 내 MAC 지연을 집계해 종료 시 출력
+
+import os, json, time, socket, argparse, tempfile
+
+def _parse_args():
+    p = argparse.ArgumentParser(description="Stand-in peer for the co-simulation bridge")
+    p.add_argument("--addr", default="udp://127.0.0.1:9750")
+    p.add_argument("--period-ms", type=float, default=100.0)
+    p.add_argument("--duration-s", type=float, default=5.0)
+    p.add_argument("--bytes", type=int, default=300)
+    p.add_argument("--kind", default="DC_REQ")
+    p.add_argument("--dst", default=None)
+    return p.parse_args()
+
+def _pct(xs, q):
+    xs = sorted(xs)
+    return xs[min(len(xs) - 1, int(q * len(xs)))] if xs else 0.0
+
+if __name__ == "__main__":
+    args = _parse_args()
+    if args.addr.startswith("unix://"):
+        s = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        local = os.path.join(tempfile.gettempdir(), f"hpgp_peer_{os.getpid()}.sock")
+        s.bind(local)
+        dest = args.addr[len("unix://"):]
+    else:
+        s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        host, port = args.addr[len("udp://"):].rsplit(":", 1)
+        dest, local = (host, int(port)), None
+    s.settimeout(0.005)
+    sent_t, rtt, mac_delay, rx = {}, [], [], 0
+    t0 = time.monotonic(); nxt = t0; i = 0
+    while time.monotonic() - t0 < args.duration_s:
+        now = time.monotonic()
+        if now >= nxt:
+            m = dict(id=i, kind=args.kind, bytes=args.bytes)
+            if args.dst:
+                m["dst"] = args.dst
+            try:
+                s.sendto(json.dumps(m).encode(), dest)
+                sent_t[i] = now
+            except OSError:
+                pass                      # 브리지가 아직 열리지 않음
+            i += 1; nxt += args.period_ms / 1e3
+        try:
+            data, _ = s.recvfrom(65536)
+        except (socket.timeout, BlockingIOError):
+            continue
+        msg = json.loads(data.decode())
+        if msg.get("ev") == "sent" and msg.get("id") in sent_t:
+            rtt.append((time.monotonic() - sent_t.pop(msg["id"])) * 1e3)
+            mac_delay.append(msg.get("mac_delay_us", 0) / 1e3)
+        elif msg.get("ev") == "rx":
+            rx += 1
+    s.close()
+    if local:
+        os.unlink(local)
+    print(f"[peer] sent={i} acked={len(rtt)} rx={rx} | wall RTT ms p50={_pct(rtt, .5):.1f} p99={_pct(rtt, .99):.1f} "
+          f"| sim MAC delay ms p50={_pct(mac_delay, .5):.1f} p99={_pct(mac_delay, .99):.1f}")
@@ -0,0 +1,52 @@
+# optimize_tables.py
+# ==================
+# - cw_table(CAP별) / dc_init_per_bpc 후보를 병렬 평가 + Successive Halving 으로 탐색
+# - 목적: DMR(DC 타임아웃 비율) 최소화, 제약 eta >= --eta-min
+# - 출력: <out>/optimizer_results.csv, pareto.csv, pareto.json, pareto.png
+
+import os, sys, json, argparse
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(ROOT)
+
+from hpgp_sim.optimizer import sample_candidates, successive_halving, deepest_rows, pareto_front, write_results
+
+def _parse_args():
+    p = argparse.ArgumentParser(description="Search CW/DC tables per CAP (parallel + successive halving)")
+    p.add_argument("--config", default=os.path.join(ROOT, "config", "defaults.json"))
+    p.add_argument("--out", default=os.path.join(ROOT, "out_optimizer"))
+    p.add_argument("--nodes", type=int, default=50)
+    p.add_argument("--candidates", type=int, default=32)
+    p.add_argument("--caps", default="CAP0", help="comma-separated CAPs whose cw_table is searched (CAP3 only matters with --with-slac)")
+    p.add_argument("--cw-min", type=int, default=4)
+    p.add_argument("--cw-max", type=int, default=256)
+    p.add_argument("--horizons", default="0.5,1,2,4", help="simulated seconds per halving round")
+    p.add_argument("--halving", type=int, default=2, help="keep top 1/halving each round")
+    p.add_argument("--seeds", default="1", help="comma-separated seeds averaged per candidate")
+    p.add_argument("--metric", default="deadline_miss_ratio")
+    p.add_argument("--eta-min", type=float, default=0.0)
+    p.add_argument("--workers", type=int, default=None)
+    p.add_argument("--with-slac", action="store_true", help="run SLAC before the DC loop instead of starting it directly")
+    p.add_argument("--search-seed", type=int, default=0)
+    return p.parse_args()
+
+if __name__ == "__main__":
+    args = _parse_args()
+    with open(args.config, "r") as f:
+        base = json.load(f)
+    caps = [c.strip() for c in args.caps.split(",") if c.strip()]
+    cands = sample_candidates(base, args.candidates, caps=caps, cw_min=args.cw_min, cw_max=args.cw_max,
+                              seed=args.search_seed)
+    horizons = [float(x) for x in args.horizons.split(",") if x.strip()]
+    seeds = [int(x) for x in args.seeds.split(",") if x.strip()]
+
+    history, _ = successive_halving(base, cands, nodes=args.nodes, horizons_s=horizons,
+                                        halving=args.halving, seeds=seeds, metric=args.metric,
+                                        eta_min=args.eta_min, workers=args.workers, skip_slac=not args.with_slac)
+    front = pareto_front(deepest_rows(history), dmr_key=args.metric)   # 모든 후보(각자 최장 구간)
+    write_results(args.out, history, front, metric=args.metric)
+
+    print("== Pareto front (eta vs %s) ==" % args.metric)
+    for r in front:
+        print(f"[{r['horizon_s']}s] eta={r['efficiency_eta']:.3f} {args.metric}={r[args.metric]:.4f} "
+              f"cw={r['cand']['cw_table']} dc_init={r['cand']['dc_init_per_bpc']}")
+    print("Wrote:", args.out)
@@ -0,0 +1,57 @@
+# profile_flame.py
+# ================
+# - N 별로 Sim.run 벽시계를 노드 → 계층 → 콜백 스택에 귀속(hpgp_sim/flame.py)해 collapsed-stack 파일로 저장
+#   (speedscope 에 끌어다 놓거나 flamegraph.pl flame_N50.collapsed > flame_N50.svg)
+# - 계층별 self-time 비율을 N 에 따라 비교: EVSE(N0) 응답 큐, PRS 중재, 채널 전진, 엔진 루프 중 어디가 커지는가
+# - 출력: <out>/flame_N{n}.collapsed, <out>/flame_layers.csv (N, layer, ns, share)
+
+import os, sys, csv, argparse
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(ROOT)
+
+from hpgp_sim.sim import load_config, build
+from hpgp_sim.flame import FlameProfiler, ev_group
+
+def _parse_args():
+    p = argparse.ArgumentParser(description="Per-node/layer wall-time flamegraphs (collapsed stacks)")
+    p.add_argument("--config", default=os.path.join(ROOT, "config", "defaults.json"))
+    p.add_argument("--out", default=os.path.join(ROOT, "out_flame"))
+    p.add_argument("--nodes", type=int, nargs="+", default=[5, 20, 50])
+    p.add_argument("--sim-time-s", type=float, default=1.0)
+    p.add_argument("--slac", action="store_true", help="SLAC scenario instead of the steady DC loop")
+    p.add_argument("--flat", action="store_true", help="no nested frames (root event frames only)")
+    p.add_argument("--per-node", action="store_true", help="keep every EV as its own root (default groups EVs)")
+    p.add_argument("--top", type=int, default=8)
+    p.add_argument("--seed", type=int, default=1)
+    return p.parse_args()
+
+if __name__ == "__main__":
+    args = _parse_args()
+    base = load_config(args.config)
+    os.makedirs(args.out, exist_ok=True)
+    rows = []
+    for n in args.nodes:
+        cfg = load_config(base)
+        cfg.update(topology="shared_bus", nodes=n, sim_time_s=args.sim_time_s, trace=dict(level="OFF"))
+        dc = cfg.setdefault("traffic", {}).setdefault("dc_loop", {})
+        dc["enabled"] = True; dc["start_without_slac"] = not args.slac
+        w = build(cfg, out_dir=args.out, seed=args.seed)
+        prof = FlameProfiler(w, nested=not args.flat).attach()
+        try:
+            w["sim"].run(until=w["sim_time_us"])
+        finally:
+            prof.detach()
+        node_map = None if args.per_node else ev_group
+        path = prof.write_collapsed(os.path.join(args.out, f"flame_N{n}.collapsed"), node_map=node_map)
+        tot = max(1, sum(prof.acc.values()))
+        print(f"N={n}: wall {prof.wall_ns / 1e9:.3f}s, events {w['sim'].events}  -> {path}")
+        for layer, ns in prof.layer_totals().items():
+            rows.append(dict(nodes=n, layer=layer, ns=ns, share=round(ns / tot, 4)))
+            print(f"  {layer:10s} {ns / tot:6.1%}")
+        for s, ns in sorted(prof.stacks(node_map).items(), key=lambda kv: -kv[1])[:args.top]:
+            print(f"    {ns / tot:6.1%}  {s}")
+    path = os.path.join(args.out, "flame_layers.csv")
+    with open(path, "w", newline="") as f:
+        wr = csv.DictWriter(f, fieldnames=["nodes", "layer", "ns", "share"])
+        wr.writeheader(); wr.writerows(rows)
+    print("Wrote:", path)
@@ -0,0 +1,64 @@
+# run_cosim.py
+# ============
+# - hpgp_sim 월드를 벽시계 페이스(asyncio)로 실행하고 UDP/Unix 소켓 브리지로 외부 스택과 프레임 교환
+# - --spawn-peer 를 주면 scripts/cosim_peer.py(대역 프로세스)를 함께 띄워 한 번에 시험
+# - 출력: <out>/cosim_report.json (pacing lag / bridge latency 히스토그램, 실시간 미달 step 비율)
+
+import os, sys, json, time, argparse, subprocess
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(ROOT)
+
+from hpgp_sim.sim import load_config, build
+from hpgp_sim.cosim import run_paced
+
+def _parse_args():
+    p = argparse.ArgumentParser(description="Wall-clock-paced co-simulation with a datagram bridge")
+    p.add_argument("--config", default=os.path.join(ROOT, "config", "defaults.json"))
+    p.add_argument("--out", default=os.path.join(ROOT, "out_cosim"))
+    p.add_argument("--addr", default="udp://127.0.0.1:9750", help="udp://host:port or unix:///path")
+    p.add_argument("--node", default=None, help="bridged node (default: N1 on shared_bus, EV on p2p)")
+    p.add_argument("--nodes", type=int, default=None)
+    p.add_argument("--topology", default=None, choices=["shared_bus", "cp_point_to_point"])
+    p.add_argument("--dc-loop", action="store_true", help="run the simulated DC loops (SLAC skipped) as background load")
+    p.add_argument("--sim-time-s", type=float, default=5.0)
+    p.add_argument("--speed", type=float, default=1.0, help="sim seconds per wall second")
+    p.add_argument("--step-us", type=int, default=1000)
+    p.add_argument("--spawn-peer", action="store_true")
+    p.add_argument("--peer-period-ms", type=float, default=100.0)
+    p.add_argument("--seed", type=int, default=1)
+    return p.parse_args()
+
+if __name__ == "__main__":
+    args = _parse_args()
+    cfg = load_config(args.config)
+    if args.topology:
+        cfg["topology"] = args.topology
+    if args.nodes is not None:
+        cfg["nodes"] = args.nodes
+    dc = cfg.setdefault("traffic", {}).setdefault("dc_loop", {})
+    dc["enabled"] = bool(args.dc_loop); dc["start_without_slac"] = bool(args.dc_loop)
+    cfg["sim_time_s"] = args.sim_time_s
+    node = args.node or ("N1" if cfg["topology"] == "shared_bus" else "EV")
+    world = build(cfg, out_dir=args.out, seed=args.seed)
+
+    peer = None
+    if args.spawn_peer:
+        peer = subprocess.Popen([sys.executable, os.path.join(ROOT, "scripts", "cosim_peer.py"), "--addr", args.addr,
+                                 "--period-ms", str(args.peer_period_ms),
+                                 "--duration-s", str(args.sim_time_s / args.speed)])
+        time.sleep(0.3)
+    print(f"paced run: {cfg['topology']} N={world['nodes']} node={node} speed={args.speed} addr={args.addr}")
+    r = run_paced(world, args.addr, node, world["sim_time_us"], speed=args.speed, step_us=args.step_us)
+    if peer is not None:
+        peer.wait(timeout=30)
+
+    lag, lat = r["pacing_lag_us"], r["bridge_latency_us"]
+    print(f"pacing lag us: p50={lag['p50']:.0f} p99={lag['p99']:.0f} max={lag['max']:.0f} "
+          f"behind {r['behind_ratio']*100:.1f}% of {r['steps']} steps")
+    print(f"bridge: in={r['frames_in']} sent={r['frames_sent']} rx={r['frames_rx']} "
+          f"latency us p50={lat['p50']:.0f} p99={lat['p99']:.0f} max={lat['max']:.0f}")
+    os.makedirs(args.out, exist_ok=True)
+    path = os.path.join(args.out, "cosim_report.json")
+    with open(path, "w") as f:
+        json.dump(dict(r, topology=cfg["topology"], nodes=world["nodes"]), f, indent=2)
+    print("Wrote:", path)
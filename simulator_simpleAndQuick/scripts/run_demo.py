@@ -15,24 +15,28 @@ if __name__=="__main__":
     ap.add_argument("--sim-time-s", type=float, default=None, help="override sim_time_s")
     ap.add_argument("--out", default="../out")
     ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--warmup", action="store_true", help="MSER-5 warm-up detection; report steady-state window only")
+    ap.add_argument("--auto-stop", action="store_true", help="with --warmup: stop once --min-steady-s of post-warm-up data exists")
+    ap.add_argument("--min-steady-s", type=float, default=5.0)
+    ap.add_argument("--live-every-s", type=float, default=None, help="live metrics snapshot every N sim seconds (JSONL in --out)")
+    ap.add_argument("--live-port", type=int, default=None, help="with --live-every-s: serve Prometheus text on 127.0.0.1:PORT/metrics")
+    ap.add_argument("--telemetry", action="store_true", help="per-slot contention telemetry (contention_timeseries.csv/.npz, contention.png)")
     args = ap.parse_args()
 
-    # Load and optionally override sim_time_s without editing source JSON on disk
-    cfg_path = args.config
+    # 설정을 한 번 읽어 CLI 덮어쓰기를 dict 에 반영(디스크의 원본 JSON 은 수정하지 않음)
+    with open(args.config, "r") as f:
+        cfg = json.load(f)
     if args.sim_time_s is not None:
-        try:
-            with open(cfg_path, "r") as f:
-                cfg_obj = json.load(f)
-            cfg_obj["sim_time_s"] = float(args.sim_time_s)
-            tmp_cfg = os.path.join(os.path.dirname(cfg_path), 
-                                   f"tmp_demo_sim{int(float(args.sim_time_s))}.json")
-            with open(tmp_cfg, "w") as wf:
-                json.dump(cfg_obj, wf, indent=2)
-            cfg_path = tmp_cfg
-        except Exception:
-            pass
+        cfg["sim_time_s"] = float(args.sim_time_s)
+    if args.warmup:
+        cfg["warmup"] = dict(cfg.get("warmup", {}), enable=True, auto_stop=bool(args.auto_stop),
+                             min_steady_s=args.min_steady_s)
+    if args.live_every_s is not None:
+        cfg["live"] = dict(cfg.get("live", {}), enable=True, every_s=args.live_every_s, port=args.live_port)
+    if args.telemetry:
+        cfg["telemetry"] = dict(cfg.get("telemetry", {}), enable=True)
 
-    s, out_dir = build_and_run(cfg_path, out_dir=args.out, seed=args.seed)  # 실행
+    s, out_dir = build_and_run(cfg, out_dir=args.out, seed=args.seed)  # 실행
     print("=== SUMMARY ===")
     for k,v in s.items():
         print(f"{k}: {v}")                      # 요약 출력
@@ -0,0 +1,71 @@
+# run_rare_dc_timeout.py
+# ======================
+# - DC 주기 타임아웃(Rsp 가 deadline 안에 MAC 전달되지 않음) 확률을 분할(splitting)로 추정
+# - 짧은 단순 MC(pilot)로 주기당 이벤트 수를 재고, 같은 CI 를 단순 MC로 얻는 데 필요한 이벤트 수와 비교
+# - 출력: <out>/rare_dc_timeout.json
+
+import os, sys, json, time, argparse
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(ROOT)
+
+from hpgp_sim.rare import estimate, crude_mc
+
+def _parse_args():
+    p = argparse.ArgumentParser(description="Estimate rare DC-cycle timeout probability by splitting")
+    p.add_argument("--config", default=os.path.join(ROOT, "config", "defaults.json"))
+    p.add_argument("--out", default=os.path.join(ROOT, "out_rare"))
+    p.add_argument("--topology", default="cp_point_to_point", choices=["cp_point_to_point", "shared_bus"])
+    p.add_argument("--nodes", type=int, default=2)
+    p.add_argument("--node", default=None, help="tagged EV (default: EV for p2p, N1 for shared_bus)")
+    p.add_argument("--deadline-ms", type=int, default=None)
+    p.add_argument("--roots", type=int, default=100)
+    p.add_argument("--levels", type=int, default=6, help="m: split levels at age/D = 1/m .. (m-1)/m")
+    p.add_argument("--split", type=int, default=3, help="R copies per level crossing")
+    p.add_argument("--w-queue", type=float, default=0.0)
+    p.add_argument("--w-bpc", type=float, default=0.0)
+    p.add_argument("--w-bad", type=float, default=0.0)
+    p.add_argument("--warm-s", type=float, default=1.0)
+    p.add_argument("--decor-s", type=float, default=0.5)
+    p.add_argument("--pilot-s", type=float, default=10.0, help="crude MC pilot length (events per cycle)")
+    p.add_argument("--workers", type=int, default=None)
+    p.add_argument("--seed", type=int, default=1)
+    return p.parse_args()
+
+if __name__ == "__main__":
+    args = _parse_args()
+    with open(args.config, "r") as f:
+        cfg = json.load(f)
+    cfg["topology"] = args.topology
+    if args.topology == "shared_bus":
+        cfg["nodes"] = args.nodes
+    if args.deadline_ms is not None:
+        cfg.setdefault("traffic", {}).setdefault("dc_loop", {})["deadline_ms"] = args.deadline_ms
+    node = args.node or ("EV" if args.topology == "cp_point_to_point" else "N1")
+
+    t0 = time.time()
+    pilot = crude_mc(cfg, seed=args.seed + 7, sim_time_s=args.pilot_s, node=node)
+    ev_per_cycle = pilot["events"] / max(1, pilot["cycles"])
+    print(f"pilot crude MC: {pilot['cycles']} cycles, {pilot['misses']} misses, "
+          f"{ev_per_cycle:.0f} events/cycle, wall={time.time()-t0:.1f}s")
+
+    t1 = time.time()
+    weights = dict(queue=args.w_queue, bpc=args.w_bpc, bad=args.w_bad)
+    r = estimate(cfg, roots=args.roots, levels=args.levels, split=args.split, weights=weights, seed=args.seed,
+                 warm_s=args.warm_s, decor_s=args.decor_s, node=node, workers=args.workers)
+    wall = time.time() - t1
+    p, ci = r["p"], r["ci95"]
+    # 같은 95% 반폭을 단순 MC로 얻는 데 필요한 주기 수/이벤트 수
+    crude_cycles = (p * (1 - p)) / (ci / 1.96) ** 2 if ci > 0 else float("inf")
+    crude_events = crude_cycles * ev_per_cycle
+    r.update(node=node, wall_s=wall, events_per_cycle=ev_per_cycle, crude_equiv_cycles=crude_cycles,
+             crude_equiv_events=crude_events, cost_ratio=(r["events"] / crude_events) if crude_events else float("nan"),
+             pilot=pilot, levels=args.levels, split=args.split, weights=weights)
+    print(f"P(DC timeout) = {p:.3e} ± {ci:.2e} (rel {r['rel_err']:.2f}), {r['roots']} roots, {r['hits']} hits")
+    print(f"splitting: {r['events']:.3g} events, wall={wall:.1f}s | crude MC for same CI: "
+          f"{crude_cycles:.3g} cycles ≈ {crude_events:.3g} events → cost ratio {r['cost_ratio']:.3f}")
+
+    os.makedirs(args.out, exist_ok=True)
+    path = os.path.join(args.out, "rare_dc_timeout.json")
+    with open(path, "w") as f:
+        json.dump(r, f, indent=2)
+    print("Wrote:", path)
@@ -0,0 +1,76 @@
+# run_surrogate.py
+# ================
+# - (N, pps, CW 배율) 공간에서 eta/DMR 을 GP 대리모델 + 능동 학습으로 매핑
+# - 결과 캐시(JSONL)에 실행을 누적하고 재실행 시 재사용, 새 점은 parallel.run_jobs 로 병렬 실행
+# - hold-out(새 batch) RMSE < --tol 이면 종료
+# - 출력: <out>/results.jsonl (캐시), surrogate_rounds.csv, surrogate_predictions.csv (격자 예측 평균/표준편차)
+
+import os, sys, csv, json, argparse, itertools
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(ROOT)
+
+import numpy as np
+from hpgp_sim.surrogate import DIMENSIONS, active_learning, _to_unit
+
+def _parse_args():
+    p = argparse.ArgumentParser(description="GP surrogate with active learning over sweep results")
+    p.add_argument("--config", default=os.path.join(ROOT, "config", "defaults.json"))
+    p.add_argument("--out", default=os.path.join(ROOT, "out_surrogate"))
+    p.add_argument("--cache", default=None, help="JSONL result cache (default: <out>/results.jsonl)")
+    p.add_argument("--dims", default="nodes:2:30,pps:0:100,cw_exp:0:3", help="name:lo:hi,... from " + ",".join(DIMENSIONS))
+    p.add_argument("--metric", default="efficiency_eta")
+    p.add_argument("--acq", default="maxvar", choices=["maxvar", "ei"])
+    p.add_argument("--target", type=float, default=0.9, help="target metric value for --acq ei")
+    p.add_argument("--n-init", type=int, default=8)
+    p.add_argument("--batch", type=int, default=4)
+    p.add_argument("--max-rounds", type=int, default=10)
+    p.add_argument("--tol", type=float, default=0.02, help="stop when hold-out RMSE is below this")
+    p.add_argument("--sim-time-s", type=float, default=1.0)
+    p.add_argument("--grid", type=int, default=5, help="points per dimension in surrogate_predictions.csv")
+    p.add_argument("--workers", type=int, default=None)
+    p.add_argument("--seed", type=int, default=1)
+    p.add_argument("--with-slac", action="store_true", help="run SLAC first (post-SLAC traffic and DC loop start only after it succeeds)")
+    return p.parse_args()
+
+def _dims(spec):
+    out = {}
+    for tok in spec.split(","):
+        if not tok.strip():
+            continue
+        name, lo, hi = tok.strip().split(":")
+        d = dict(DIMENSIONS[name])
+        cast = int if d["kind"] == "int" else float
+        d.update(lo=cast(lo), hi=cast(hi))
+        out[name] = d
+    return out
+
+if __name__ == "__main__":
+    args = _parse_args()
+    with open(args.config, "r") as f:
+        base = json.load(f)
+    dims = _dims(args.dims)
+    os.makedirs(args.out, exist_ok=True)
+    cache = args.cache or os.path.join(args.out, "results.jsonl")
+
+    r = active_learning(base, cache, dims=dims, metric=args.metric, n_init=args.n_init, batch=args.batch,
+                        max_rounds=args.max_rounds, tol=args.tol, acq=args.acq, target=args.target,
+                        sim_time_s=args.sim_time_s, workers=args.workers, seed=args.seed, skip_slac=not args.with_slac)
+
+    path = os.path.join(args.out, "surrogate_rounds.csv")
+    with open(path, "w", newline="") as f:
+        wr = csv.DictWriter(f, fieldnames=["round", "n_train", "holdout_rmse", "holdout_mae", "new"])
+        wr.writeheader(); wr.writerows(r["rounds"])
+    print("Wrote:", path)
+
+    axes = []
+    for name, d in dims.items():
+        v = np.linspace(d["lo"], d["hi"], args.grid)
+        axes.append(sorted({int(round(x)) for x in v}) if d["kind"] == "int" else list(v))
+    pts = [dict(zip(dims, c)) for c in itertools.product(*axes)]
+    mu, sd = r["model"].predict(np.array([_to_unit(p, dims) for p in pts]))
+    path = os.path.join(args.out, "surrogate_predictions.csv")
+    with open(path, "w", newline="") as f:
+        wr = csv.writer(f); wr.writerow(list(dims) + [args.metric + "_mean", args.metric + "_sd"])
+        for p, m, s in zip(pts, mu, sd):
+            wr.writerow([p[n] for n in dims] + [round(float(m), 6), round(float(s), 6)])
+    print("Wrote:", path)
@@ -4,39 +4,77 @@
 # - 각 실험 out_sweep_N*/ 에 summary.csv / report.md / dc_entry_times.csv / dc_cycles.csv / dc_timeline.png 생성
 # - 루트에 out_sweep_summary.csv + report_sweep.md + dctiming_vs_nodes.png 생성
 # - 각 run 진행률 바 출력 + 한 줄 요약
+# - --mode analytic|sim|both : 해석 모델(hpgp_sim.analytic) 곡선만 / 시뮬레이션만 / 함께(효율 그래프 겹쳐 그림)
+# - 실행 비용 열(wall_s, events, events_per_s, peak_rss_mb)을 요약 CSV/MD 에 기록
+# - --workers K : K 프로세스 병렬(parallel.run_jobs) — 과거 비용 기록(.cost_history.jsonl)으로 긴 N 부터 배정
 
-import os, sys, json, argparse
+import os, sys, json, time, argparse
 ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 sys.path.append(ROOT)
 
 from hpgp_sim.sim import build_and_run
+from hpgp_sim.parallel import run_jobs
+from hpgp_sim.costmodel import CostModel, features
+from hpgp_sim.analytic import analyze
 
 # Headless plotting
 import matplotlib
 matplotlib.use("Agg")
 import matplotlib.pyplot as plt
 
-def _write_overall_plots(rows, out_dir):
+def _write_overall_plots(rows, out_dir, analytic=None):
     """
     rows: [ [nodes, thr, eta, util, coll, drops, sess_ok, sess_to], ... ]
+    analytic: analyze() 결과(옵션) → 해석 eta 곡선을 함께 표시
     """
-    if not rows: return
+    if not rows and analytic is None: return
     nodes = [r[0] for r in rows]
     eta   = [r[2] for r in rows]
     try:
         plt.figure(figsize=(7,3.2))
-        plt.plot(nodes, eta, marker="o", linewidth=2)
+        if rows:
+            plt.plot(nodes, eta, marker="o", linewidth=2, label="simulation")
+        if analytic is not None:
+            plt.plot(analytic["N"], analytic["eta"], linestyle="--", linewidth=2, label="analytic (saturated)")
+            plt.legend()
         plt.xlabel("Nodes"); plt.ylabel("Efficiency (eta)"); plt.ylim(0,1.0)
         plt.title("Efficiency vs Nodes"); plt.grid(True, lw=0.4, alpha=0.5)
         plt.tight_layout(); plt.savefig(os.path.join(out_dir,"efficiency_vs_nodes.png"), dpi=120); plt.close()
     except Exception as e:
         with open(os.path.join(out_dir, "plot_error.log"), "a", encoding="utf-8") as f: f.write(f"efficiency_vs_nodes plot error: {e}\n")
 
-def run_sweep(base_cfg_path, out_csv_path, nodes_list, sim_time_s: float | None = None):
+def run_analytic(base_cfg_path, out_csv_path, nodes_list, cap="CAP0"):
+    """해석 모델만: N 벡터를 한 번에 계산(캐시 사용) → CSV + 효율 그래프."""
     with open(base_cfg_path, "r") as f:
-        base = json.load(f)
-
+        cfg = json.load(f)
+    out_dir = os.path.dirname(out_csv_path) or "."
+    os.makedirs(out_dir, exist_ok=True)
+    a = analyze(cfg, nodes_list, cap=cap, cache_path=os.path.join(out_dir, ".analytic_cache.json"))
+    with open(out_csv_path, "w") as f:
+        cols = ["N", "tau", "p", "pb", "p_tr", "p_s", "eta", "iters"]
+        f.write("nodes," + ",".join(cols[1:]) + "\n")
+        for i in range(len(a["N"])):
+            f.write(",".join(str(a[c][i].item()) for c in cols) + "\n")
+    _write_overall_plots([], out_dir, analytic=a)
+    return a
+
+def _row(n, s):
+    return [n, s.get('throughput_mbps',0.0), s.get('efficiency_eta',0.0),
+            s.get('utilization',0.0), s.get('collision_ratio',0.0),
+            s.get('drops',0), s.get('session_success',0), s.get('session_timeouts',0),
+            s.get('wall_s',0.0), s.get('events',0), s.get('events_per_s',0), s.get('peak_rss_mb',0.0)]
+
+def _print_run(idx, total, n, s):
+    print(f"[{idx}/{total}] N={n} thr={s.get('throughput_mbps',0.0):.3f} Mbps  "
+          f"eta={s.get('efficiency_eta',0.0):.3f} util={s.get('utilization',0.0):.3f} "
+          f"coll={s.get('collision_ratio',0.0):.3f} drops={s.get('drops',0)} "
+          f"sess_ok={s.get('session_success',0)}/{s.get('session_total',0)} to={s.get('session_timeouts',0)}  "
+          f"wall={s.get('wall_s',0.0):.1f}s ev/s={s.get('events_per_s',0)} rss={s.get('peak_rss_mb',0.0)}MB")
+
+def run_sweep(base_cfg_path, out_csv_path, nodes_list, sim_time_s: float | None = None, analytic=None,
+              workers=1, cost_history=None):
     rows = []
+    jobs = []
     total = len(nodes_list)
     for idx, n in enumerate(nodes_list, 1):
         with open(base_cfg_path, "r") as f:
@@ -57,35 +95,42 @@ def run_sweep(base_cfg_path, out_csv_path, nodes_list, sim_time_s: float | None
         with open(tmp_cfg_path, "w") as wf: json.dump(cfg, wf, indent=2)
 
         out_dir = os.path.join(ROOT, f"out_sweep_N{n}")
+        if workers > 1:
+            jobs.append(dict(cfg=tmp_cfg_path, seed=42+n, out_dir=out_dir, artifacts=True, job_id=n))
+            continue
         label = f"N={n} ({idx}/{total})"
+        t0 = time.perf_counter()
         s, _ = build_and_run(tmp_cfg_path, out_dir=out_dir, seed=42+n, progress=True, progress_label=label)
+        if cost_history:
+            CostModel(cost_history).add(features(cfg), time.perf_counter() - t0, s.get("events"), s.get("peak_rss_mb"))
+        _print_run(idx, total, n, s)
+        rows.append(_row(n, s))
 
-        print(f"[{idx}/{total}] N={n} thr={s.get('throughput_mbps',0.0):.3f} Mbps  "
-              f"eta={s.get('efficiency_eta',0.0):.3f} util={s.get('utilization',0.0):.3f} "
-              f"coll={s.get('collision_ratio',0.0):.3f} drops={s.get('drops',0)} "
-              f"sess_ok={s.get('session_success',0)}/{s.get('session_total',0)} to={s.get('session_timeouts',0)}")
-
-        rows.append([n, s.get('throughput_mbps',0.0), s.get('efficiency_eta',0.0),
-                     s.get('utilization',0.0), s.get('collision_ratio',0.0),
-                     s.get('drops',0), s.get('session_success',0), s.get('session_timeouts',0)])
+    if jobs:
+        # 병렬: 진행바 대신 완료 후 요약 출력(결과는 N 순서), 긴 작업 먼저 제출
+        for idx, r in enumerate(run_jobs(jobs, workers=workers, cost_history=cost_history), 1):
+            _print_run(idx, total, r["job_id"], r["summary"])
+            rows.append(_row(r["job_id"], r["summary"]))
 
     # 집계 CSV
     with open(out_csv_path, "w") as f:
-        f.write("nodes,throughput_mbps,efficiency_eta,utilization,collision_ratio,drops,session_success,session_timeouts\n")
+        f.write("nodes,throughput_mbps,efficiency_eta,utilization,collision_ratio,drops,session_success,session_timeouts,"
+                "wall_s,events,events_per_s,peak_rss_mb\n")
         for r in rows: f.write(",".join(str(x) for x in r) + "\n")
 
     # 집계 PNG
     out_dir = os.path.dirname(out_csv_path)
-    _write_overall_plots(rows, out_dir)
+    _write_overall_plots(rows, out_dir, analytic=analytic)
 
     # 집계 MD
     md_path = os.path.join(out_dir, "report_sweep.md")
     with open(md_path, "w", encoding="utf-8") as f:
         f.write("# Sweep Report\n\n")
-        f.write("| nodes | thr(Mbps) | eta | util | coll | drops | sess_ok | sess_to |\n")
-        f.write("|---:|---:|---:|---:|---:|---:|---:|---:|\n")
-        for (n, thr, eta, util, coll, drops, s_ok, s_to) in rows:
-            f.write(f"| {n} | {thr:.3f} | {eta:.3f} | {util:.3f} | {coll:.3f} | {drops} | {s_ok} | {s_to} |\n")
+        f.write("| nodes | thr(Mbps) | eta | util | coll | drops | sess_ok | sess_to | wall(s) | events | ev/s | rss(MB) |\n")
+        f.write("|---:|---:|---:|---:|---:|---:|---:|---:|---:|---:|---:|---:|\n")
+        for (n, thr, eta, util, coll, drops, s_ok, s_to, wall, ev, evs, rss) in rows:
+            f.write(f"| {n} | {thr:.3f} | {eta:.3f} | {util:.3f} | {coll:.3f} | {drops} | {s_ok} | {s_to} "
+                    f"| {wall:.2f} | {ev} | {evs} | {rss} |\n")
 
     return out_csv_path, md_path
 
@@ -97,11 +142,26 @@ def _parse_args():
     p.add_argument("--max-n", type=int, default=100)
     p.add_argument("--step", type=int, default=5)
     p.add_argument("--sim-time-s", type=float, default=None, help="override sim_time_s for all runs")
+    p.add_argument("--mode", default="sim", choices=["sim", "analytic", "both"])
+    p.add_argument("--cap", default="CAP0", help="cw_table row used by the analytic model")
+    p.add_argument("--workers", type=int, default=1, help="parallel runs (longest predicted N first)")
+    p.add_argument("--cost-history", default=None,
+                   help="JSONL of past run costs for scheduling (default: .cost_history.jsonl next to --out-csv)")
     return p.parse_args()
 
 if __name__ == "__main__":
     args = _parse_args()
     nodes = list(range(max(1, args.min_n), max(args.min_n, args.max_n) + 1, max(1, args.step)))
-    csv_path, md_path = run_sweep(args.config, args.out_csv, nodes, sim_time_s=args.sim_time_s)
-    print("Wrote:", csv_path)
-    print("Wrote:", md_path)
+    a = None
+    if args.mode in ("analytic", "both"):
+        a_csv = args.out_csv if args.mode == "analytic" else os.path.splitext(args.out_csv)[0] + "_analytic.csv"
+        a = run_analytic(args.config, a_csv, nodes, cap=args.cap)
+        for n, tau, p, eta in zip(a["N"], a["tau"], a["p"], a["eta"]):
+            print(f"[analytic] N={n} tau={tau:.4f} p={p:.4f} eta={eta:.3f}")
+        print("Wrote:", a_csv)
+    if args.mode in ("sim", "both"):
+        hist = args.cost_history or os.path.join(os.path.dirname(os.path.abspath(args.out_csv)), ".cost_history.jsonl")
+        csv_path, md_path = run_sweep(args.config, args.out_csv, nodes, sim_time_s=args.sim_time_s, analytic=a,
+                                      workers=args.workers, cost_history=hist)
+        print("Wrote:", csv_path)
+        print("Wrote:", md_path)
@@ -0,0 +1,69 @@
+# validate_vector_mac.py
+# ======================
+# - 정상상태 DC 루프(SLAC 생략)를 이벤트 엔진 R회 vs 벡터 엔진 K복제로 실행(--topology 로 점대점 링크도 검증)
+# - 지표별 평균/95% CI, Welch t 통계량, 상대 오차를 표로 출력하고 둘 중 하나라도 허용치를 넘으면 exit 1
+#   (상대 오차 > --rel-tol 또는 |t| > --t-max; drops 는 복제 간 분산이 큰 소수 카운트라 t 만 검사)
+# - 벽시계 시간도 함께 출력(복제당 비용 비교: shared_bus N=10, 2 s 에서 복제당 약 25~45배 저렴 —
+#   이벤트 실행 1회 ≈ 1.4~2.6 s, 벡터 200복제 ≈ 8~18 s)
+
+import os, sys, json, time, math, argparse
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(ROOT)
+
+import numpy as np
+from hpgp_sim.parallel import run_jobs
+from hpgp_sim.vector_mac import VectorBusMAC, mean_ci
+
+METRICS = ["efficiency_eta", "utilization", "collision_ratio", "throughput_mbps", "drops"]
+REL_METRICS = ("efficiency_eta", "utilization", "collision_ratio", "throughput_mbps")
+
+def _parse_args():
+    p = argparse.ArgumentParser(description="Statistically compare vector_mac against the event-driven engine")
+    p.add_argument("--config", default=os.path.join(ROOT, "config", "defaults.json"))
+    p.add_argument("--topology", default="shared_bus", choices=["shared_bus", "cp_point_to_point"])
+    p.add_argument("--nodes", type=int, default=10)
+    p.add_argument("--sim-time-s", type=float, default=2.0)
+    p.add_argument("--event-runs", type=int, default=8)
+    p.add_argument("--replications", type=int, default=200)
+    p.add_argument("--workers", type=int, default=None)
+    p.add_argument("--rel-tol", type=float, default=0.05, help="allowed relative difference of means")
+    p.add_argument("--t-max", type=float, default=4.0, help="allowed |Welch t|")
+    return p.parse_args()
+
+def main():
+    args = _parse_args()
+    with open(args.config, "r") as f:
+        cfg = json.load(f)
+    p2p = args.topology == "cp_point_to_point"
+    cfg["topology"] = args.topology; cfg["nodes"] = 2 if p2p else args.nodes; cfg["sim_time_s"] = args.sim_time_s
+    dc = cfg.setdefault("traffic", {}).setdefault("dc_loop", {})
+    dc["enabled"] = True; dc["start_without_slac"] = True
+
+    t0 = time.time()
+    res = run_jobs([dict(cfg=cfg, seed=1000 + i) for i in range(args.event_runs)], workers=args.workers)
+    wall_ev = time.time() - t0
+    ev = {k: np.array([float(r["summary"][k]) for r in res]) for k in METRICS}
+
+    t1 = time.time()
+    vec = VectorBusMAC(cfg, args.replications, seed=7, point_to_point=p2p).run(args.sim_time_s)
+    wall_vec = time.time() - t1
+
+    print(f"event-driven: {args.event_runs} runs, {wall_ev:.2f}s wall ({wall_ev/args.event_runs:.2f}s/run)")
+    print(f"vectorized  : {args.replications} replications, {wall_vec:.2f}s wall ({wall_vec/args.replications*1e3:.2f}ms/rep)")
+    print(f"{'metric':<18}{'event mean±ci':>24}{'vector mean±ci':>24}{'rel':>8}{'t':>8}")
+    bad = []
+    for k in METRICS:
+        m1, c1 = mean_ci(ev[k]); m2, c2 = mean_ci(vec[k])
+        se = math.sqrt(np.var(ev[k], ddof=1) / ev[k].size + np.var(vec[k], ddof=1) / vec[k].size) if ev[k].size > 1 else 0.0
+        t = (m1 - m2) / se if se > 0 else 0.0
+        rel = abs(m1 - m2) / max(abs(m1), 1e-12)
+        flag = (k in REL_METRICS and rel > args.rel_tol) or abs(t) > args.t_max
+        if flag: bad.append(k)
+        print(f"{k:<18}{m1:>14.4f} ±{c1:<8.4f}{m2:>14.4f} ±{c2:<8.4f}{rel:>8.3f}{t:>8.2f}{'  !!' if flag else ''}")
+    if bad:
+        print("MISMATCH:", ", ".join(bad))
+        sys.exit(1)
+    print("OK: vector engine agrees with event-driven engine within tolerance")
+
+if __name__ == "__main__":
+    main()